@@ -0,0 +1,14 @@
+"""authentik brands signals"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authentik.brands.models import Brand
+from authentik.tenants.resolver import invalidate_resolver
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def brand_invalidate_resolver(sender, **kwargs):
+    """Invalidate cached brands"""
+    invalidate_resolver(sender)
@@ -1,18 +1,22 @@
 """Test brands"""
 
 from json import loads
+from unittest.mock import patch
 
+from django.test import RequestFactory
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
 from authentik.blueprints.tests import apply_blueprint
 from authentik.brands.models import Brand
+from authentik.brands.utils import get_brand_for_request
 from authentik.core.models import Application
 from authentik.core.tests.utils import create_test_admin_user, create_test_brand
 from authentik.lib.generators import generate_id
 from authentik.providers.oauth2.models import OAuth2Provider
 from authentik.providers.saml.models import SAMLProvider
 from authentik.tenants.flags import Flag
+from authentik.tenants.resolver import RESOLVER
 
 
 class TestBrands(APITestCase):
@@ -67,6 +71,27 @@ class TestBrands(APITestCase):
             },
         )
 
+    def test_brand_resolver_cached(self):
+        """Test brands are matched from the in-process cache, and changes are seen"""
+        parent = Brand.objects.create(domain="bar.baz", branding_title=generate_id())
+        child = Brand.objects.create(domain="foo.bar.baz", branding_title=generate_id())
+        request = RequestFactory().get("/", HTTP_HOST="a.foo.bar.baz")
+        with patch.object(RESOLVER, "_timeout", 60):
+            try:
+                RESOLVER._ready()
+                self.assertTrue(RESOLVER._listener.ready.wait(10))
+                self.assertEqual(get_brand_for_request(request), child)
+                with self.assertNumQueries(0):
+                    self.assertEqual(get_brand_for_request(request), child)
+                    self.assertEqual(
+                        get_brand_for_request(RequestFactory().get("/", HTTP_HOST="bar.baz")),
+                        parent,
+                    )
+                child.delete()
+                self.assertEqual(get_brand_for_request(request), parent)
+            finally:
+                RESOLVER.clear()
+
     def test_fallback(self):
         """Test fallback brand"""
         self.assertJSONEqual(
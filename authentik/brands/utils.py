@@ -1,9 +1,10 @@
 """Brand utilities"""
 
+from copy import copy
 from typing import Any
 
-from django.db.models import Case, F, IntegerField, Q, Value, When
-from django.db.models.functions import Concat, Length
+from django.db import connection
+from django.db.models import Q
 from django.http.request import HttpRequest
 from django.utils.html import _json_script_escapes
 from django.utils.safestring import mark_safe
@@ -12,44 +13,33 @@ from authentik import authentik_full_version
 from authentik.brands.models import Brand
 from authentik.lib.sentry import get_http_meta
 from authentik.tenants.models import Tenant
+from authentik.tenants.resolver import RESOLVER, DomainTrie
 
 _q_default = Q(default=True)
 DEFAULT_BRAND = Brand(domain="fallback")
 
 
-def get_brand_for_request(request: HttpRequest) -> Brand:
-    """Get brand object for current request"""
+def _load_brands() -> tuple[DomainTrie[Brand], Brand | None]:
+    brands = DomainTrie()
+    default = None
+    for brand in Brand.objects.order_by("pk"):
+        brands.insert(brand.domain, brand)
+        if brand.default and not default:
+            default = brand
+    return brands, default
 
-    brand = (
-        Brand.objects.annotate(
-            host_domain=Value(request.get_host()),
-            domain_length=Length("domain"),
-            match_priority=Case(
-                When(
-                    condition=Q(host_domain__iexact=F("domain"))
-                    | Q(host_domain__iendswith=Concat(Value("."), F("domain"))),
-                    then=F("domain_length"),
-                ),
-                default=Value(-1),
-                output_field=IntegerField(),
-            ),
-            is_default_fallback=Case(
-                When(
-                    condition=Q(default=True),
-                    then=Value(0),
-                ),
-                default=Value(-2),
-                output_field=IntegerField(),
-            ),
-        )
-        .filter(Q(match_priority__gt=-1) | Q(default=True))
-        .order_by("-match_priority", "-is_default_fallback")
-        .first()
-    )
 
+def get_brand_for_request(request: HttpRequest) -> Brand:
+    """Get brand object for current request"""
+    brands, default = RESOLVER.get(f"brands/{connection.schema_name}", _load_brands)
+    matches = brands.match(request.get_host())
+    brand = next((brand for brand in matches if brand.default), None)
+    if not brand:
+        brand = matches[0] if matches else default
     if brand is None:
         return DEFAULT_BRAND
-    return brand
+    # Cached instances are shared between requests
+    return copy(brand)
 
 
 def context_processor(request: HttpRequest) -> dict[str, Any]:
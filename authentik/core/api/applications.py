@@ -27,6 +27,7 @@ from authentik.core.api.users import UserSerializer
 from authentik.core.api.utils import ModelSerializer, ThemedUrlsSerializer
 from authentik.core.models import Application, User
 from authentik.events.logs import LogEventSerializer, capture_logs
+from authentik.lib.utils.cache import CacheNamespace
 from authentik.policies.api.exec import PolicyTestResultSerializer
 from authentik.policies.engine import PolicyEngine
 from authentik.policies.types import CACHE_PREFIX, PolicyResult
@@ -35,12 +36,12 @@ from authentik.rbac.filters import ObjectFilter
 LOGGER = get_logger()
 
 
+APP_ACCESS_CACHE = CacheNamespace(f"{CACHE_PREFIX}app_access/")
+
+
 def user_app_cache_key(user_pk: str, page_number: int | None = None) -> str:
     """Cache key where application list for user is saved"""
-    key = f"{CACHE_PREFIX}app_access/{user_pk}"
-    if page_number:
-        key += f"/{page_number}"
-    return key
+    return APP_ACCESS_CACHE.key(str(page_number or ""), scope=str(user_pk))
 
 
 class ApplicationSerializer(ModelSerializer):
@@ -161,9 +162,12 @@ class ApplicationViewSet(UsedByMixin, ModelViewSet):
         if user:
             request = copy(request)
             request.user = user
-        for application in paginated_apps:
-            engine = PolicyEngine(application, request.user, request)
-            engine.build()
+        paginated_apps = list(paginated_apps)
+        for application, engine in zip(
+            paginated_apps,
+            PolicyEngine.evaluate_many(paginated_apps, request.user, request),
+            strict=True,
+        ):
             if engine.passing:
                 applications.append(application)
         return applications
@@ -296,17 +300,12 @@ class ApplicationViewSet(UsedByMixin, ModelViewSet):
         if not should_cache:
             allowed_applications = self._get_allowed_applications(paginated_apps)
         if should_cache:
-            allowed_applications = cache.get(
-                user_app_cache_key(self.request.user.pk, paginator.page.number)
-            )
+            key = user_app_cache_key(self.request.user.pk, paginator.page.number)
+            allowed_applications = cache.get(key)
             if not allowed_applications:
                 LOGGER.debug("Caching allowed application list", page=paginator.page.number)
                 allowed_applications = self._get_allowed_applications(paginated_apps)
-                cache.set(
-                    user_app_cache_key(self.request.user.pk, paginator.page.number),
-                    allowed_applications,
-                    timeout=86400,
-                )
+                cache.set(key, allowed_applications, timeout=86400)
         allowed_applications = self._expand_applications(allowed_applications)
 
         if only_with_launch_url == "true":
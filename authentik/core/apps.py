@@ -1,6 +1,7 @@
 """authentik core app config"""
 
 from authentik.blueprints.apps import ManagedAppConfig
+from authentik.lib.utils.time import fqdn_rand
 from authentik.tasks.schedules.common import ScheduleSpec
 
 
@@ -28,7 +29,11 @@ class AuthentikCoreConfig(ManagedAppConfig):
 
     @property
     def tenant_schedule_specs(self) -> list[ScheduleSpec]:
-        from authentik.core.tasks import clean_expired_models, clean_temporary_users
+        from authentik.core.tasks import (
+            clean_expired_models,
+            clean_temporary_users,
+            rebuild_effective_permissions,
+        )
 
         return [
             ScheduleSpec(
@@ -39,4 +44,8 @@ class AuthentikCoreConfig(ManagedAppConfig):
                 actor=clean_temporary_users,
                 crontab="9-59/5 * * * *",
             ),
+            ScheduleSpec(
+                actor=rebuild_effective_permissions,
+                crontab=f"{fqdn_rand('rebuild_effective_permissions')} {fqdn_rand('rebuild_effective_permissions', 24)} * * *",  # noqa: E501
+            ),
         ]
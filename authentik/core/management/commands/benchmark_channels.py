@@ -0,0 +1,135 @@
+"""authentik channel layer benchmark command"""
+
+from asyncio import gather, run, wait_for
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django_channels_postgres.layer import (
+    PostgresChannelLayerLoopProxy,
+    PostgresChannelLoopLayer,
+)
+from django_channels_postgres.models import GroupChannel
+from psycopg import Notify
+
+from authentik import authentik_version
+from authentik.lib.generators import generate_id
+
+
+@dataclass
+class WorkerStats:
+    """Notifications received by a single worker"""
+
+    wakeups: int = 0
+    bytes: int = 0
+
+
+class Command(BaseCommand):
+    """Benchmark channel layer notification fan-out"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-w",
+            "--workers",
+            default=4,
+            type=int,
+            help="How many web workers should be simulated.",
+        )
+        parser.add_argument(
+            "-c",
+            "--clients",
+            default=100,
+            type=int,
+            help="How many websocket clients should be connected, spread over the workers.",
+        )
+        parser.add_argument(
+            "-s",
+            "--size",
+            default=256,
+            type=int,
+            help="Size of the message payload in bytes.",
+        )
+
+    def _instrument(self, layer: PostgresChannelLoopLayer) -> WorkerStats:
+        """Count notifications received by `layer`"""
+        stats = WorkerStats()
+        handle_notify = layer.receiver._handle_notify
+
+        async def _handle_notify(notify: Notify):
+            stats.wakeups += 1
+            stats.bytes += len(notify.payload.encode())
+            await handle_notify(notify)
+
+        layer.receiver._handle_notify = _handle_notify
+        return stats
+
+    async def _run_phase(
+        self,
+        name: str,
+        stats: list[WorkerStats],
+        clients: list[tuple[PostgresChannelLoopLayer, str, str]],
+        message: dict[str, Any],
+        group: bool,
+    ):
+        for worker in stats:
+            worker.wakeups = 0
+            worker.bytes = 0
+        start = perf_counter()
+        sender = clients[0][0]
+        for _, channel, group_name in clients:
+            if group:
+                await sender.group_send(group_name, message)
+            else:
+                await sender.send(channel, message)
+        await wait_for(
+            gather(*[layer.receive(channel) for layer, channel, _ in clients]),
+            timeout=60,
+        )
+        duration = perf_counter() - start
+        messages = len(clients)
+        wakeups = sum(worker.wakeups for worker in stats)
+        total_bytes = sum(worker.bytes for worker in stats)
+        print(f"Phase: {name}")
+        print(f"\tMessages: {messages} in {duration * 1000:.2f}ms")
+        print(f"\tWakeups per message: {wakeups / messages:.2f} (shared channel: {len(stats)})")
+        print(f"\tNotify bytes per message: {total_bytes / messages:.2f}")
+
+    async def benchmark(self, workers: int, client_count: int, size: int):
+        """Connect clients to simulated workers and send messages to each of them"""
+        proxy = PostgresChannelLayerLoopProxy()
+        layers = [PostgresChannelLoopLayer(channel_layer=proxy) for _ in range(workers)]
+        stats = [self._instrument(layer) for layer in layers]
+        prefix = f"benchmark-{generate_id(8)}"
+        clients = []
+        try:
+            for idx in range(client_count):
+                layer = layers[idx % workers]
+                channel = await layer.new_channel()
+                group_name = f"{prefix}-{idx}"
+                await layer.group_add(group_name, channel)
+                clients.append((layer, channel, group_name))
+            # Make sure all receivers are listening before measuring
+            await gather(*[layer.send(channel, {"type": "ping"}) for layer, channel, _ in clients])
+            await gather(*[layer.receive(channel) for layer, channel, _ in clients])
+
+            message = {"type": "benchmark", "data": generate_id(size)}
+            large_message = {"type": "benchmark", "data": generate_id(size + 16_000)}
+            await self._run_phase("direct", stats, clients, message, group=False)
+            await self._run_phase(
+                "direct (by reference)", stats, clients, large_message, group=False
+            )
+            await self._run_phase("group", stats, clients, message, group=True)
+            await self._run_phase("group (by reference)", stats, clients, large_message, group=True)
+        finally:
+            for layer in layers:
+                await layer.flush()
+                if layer._pool is not None:
+                    await layer._pool.close()
+            await GroupChannel.objects.filter(group_key__contains=f".group.{prefix}-").adelete()
+
+    def handle(self, *args, **options):
+        """Start benchmark"""
+        print(f"Version: {authentik_version()}")
+        print(f"Workers: {options['workers']}, clients: {options['clients']}")
+        run(self.benchmark(options["workers"], options["clients"], options["size"]))
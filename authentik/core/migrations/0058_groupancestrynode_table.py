@@ -0,0 +1,131 @@
+# Generated by Django 5.2.12 on 2026-10-18 10:12
+
+import django.db.models.deletion
+import pgtrigger.compiler
+import pgtrigger.migrations
+import psqlextra.backend.migrations.operations.delete_materialized_view_model
+from django.db import migrations, models
+
+GROUP_ANCESTRY_BUILD = """
+    INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)
+    WITH RECURSIVE accumulator AS (
+        SELECT
+        child_id AS descendant_id,
+        parent_id AS ancestor_id
+        FROM authentik_core_groupparentage
+
+        UNION
+
+        SELECT
+        accumulator.descendant_id,
+        current.parent_id AS ancestor_id
+        FROM accumulator
+        JOIN authentik_core_groupparentage current
+        ON accumulator.ancestor_id = current.child_id
+    )
+    SELECT descendant_id, ancestor_id FROM accumulator
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_core", "0057_remove_user_groups_remove_user_user_permissions_and_more"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupparentagenode",
+            name="refresh_groupancestry",
+        ),
+        psqlextra.backend.migrations.operations.delete_materialized_view_model.PostgresDeleteMaterializedViewModel(
+            name="GroupAncestryNode",
+        ),
+        migrations.CreateModel(
+            name="GroupAncestryNode",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="descendant_nodes",
+                        to="authentik_core.group",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="ancestor_nodes",
+                        to="authentik_core.group",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "authentik_core_groupancestry",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("descendant", "ancestor"), name="unique_group_ancestry"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(GROUP_ANCESTRY_BUILD, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="groupancestry_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected uuid[];",
+                    func="\n            IF current_setting('authentik.group_ancestry_deferred', true) = 'on' THEN\n                RETURN NULL;\n            END IF;\n            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (\n                SELECT changed.child_id AS group_id FROM (SELECT child_id FROM new_nodes) AS changed\n                UNION\n                SELECT ancestry.descendant_id AS group_id\n                FROM authentik_core_groupancestry AS ancestry\n                JOIN (SELECT child_id FROM new_nodes) AS changed ON ancestry.ancestor_id = changed.child_id\n            ) AS affected_groups;\n            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);\n            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n            \n    WITH RECURSIVE accumulator AS (\n        SELECT\n        child_id AS descendant_id,\n        parent_id AS ancestor_id\n        FROM authentik_core_groupparentage\n        WHERE child_id = ANY(affected)\n\n        UNION\n\n        SELECT\n        accumulator.descendant_id,\n        current.parent_id AS ancestor_id\n        FROM accumulator\n        JOIN authentik_core_groupparentage current\n        ON accumulator.ancestor_id = current.child_id\n    )\n    SELECT descendant_id, ancestor_id FROM accumulator\n;\n            RETURN NULL;\n        ",
+                    hash="aec69865df28fc0781b4f56bb930c4a62b0a12f6",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_groupancestry_insert_caeae",
+                    referencing="REFERENCING NEW TABLE AS new_nodes ",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="groupancestry_update",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected uuid[];",
+                    func="\n            IF current_setting('authentik.group_ancestry_deferred', true) = 'on' THEN\n                RETURN NULL;\n            END IF;\n            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (\n                SELECT changed.child_id AS group_id FROM (SELECT child_id FROM old_nodes UNION SELECT child_id FROM new_nodes) AS changed\n                UNION\n                SELECT ancestry.descendant_id AS group_id\n                FROM authentik_core_groupancestry AS ancestry\n                JOIN (SELECT child_id FROM old_nodes UNION SELECT child_id FROM new_nodes) AS changed ON ancestry.ancestor_id = changed.child_id\n            ) AS affected_groups;\n            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);\n            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n            \n    WITH RECURSIVE accumulator AS (\n        SELECT\n        child_id AS descendant_id,\n        parent_id AS ancestor_id\n        FROM authentik_core_groupparentage\n        WHERE child_id = ANY(affected)\n\n        UNION\n\n        SELECT\n        accumulator.descendant_id,\n        current.parent_id AS ancestor_id\n        FROM accumulator\n        JOIN authentik_core_groupparentage current\n        ON accumulator.ancestor_id = current.child_id\n    )\n    SELECT descendant_id, ancestor_id FROM accumulator\n;\n            RETURN NULL;\n        ",
+                    hash="0381866c9a5c5fa495f6c6b2e001441662a87f77",
+                    level="STATEMENT",
+                    operation="UPDATE",
+                    pgid="pgtrigger_groupancestry_update_ec6d6",
+                    referencing="REFERENCING OLD TABLE AS old_nodes  NEW TABLE AS new_nodes ",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="groupancestry_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected uuid[];",
+                    func="\n            IF current_setting('authentik.group_ancestry_deferred', true) = 'on' THEN\n                RETURN NULL;\n            END IF;\n            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (\n                SELECT changed.child_id AS group_id FROM (SELECT child_id FROM old_nodes) AS changed\n                UNION\n                SELECT ancestry.descendant_id AS group_id\n                FROM authentik_core_groupancestry AS ancestry\n                JOIN (SELECT child_id FROM old_nodes) AS changed ON ancestry.ancestor_id = changed.child_id\n            ) AS affected_groups;\n            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);\n            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n            \n    WITH RECURSIVE accumulator AS (\n        SELECT\n        child_id AS descendant_id,\n        parent_id AS ancestor_id\n        FROM authentik_core_groupparentage\n        WHERE child_id = ANY(affected)\n\n        UNION\n\n        SELECT\n        accumulator.descendant_id,\n        current.parent_id AS ancestor_id\n        FROM accumulator\n        JOIN authentik_core_groupparentage current\n        ON accumulator.ancestor_id = current.child_id\n    )\n    SELECT descendant_id, ancestor_id FROM accumulator\n;\n            RETURN NULL;\n        ",
+                    hash="215ce39d0e39ace49e79e35ab8ce30af2c978ada",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_groupancestry_delete_41414",
+                    referencing="REFERENCING OLD TABLE AS old_nodes ",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
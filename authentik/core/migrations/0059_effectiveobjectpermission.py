@@ -0,0 +1,330 @@
+# Generated by Django 5.2.12 on 2026-10-18 22:41
+
+import django.db.models.deletion
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.conf import settings
+from django.db import migrations, models
+
+EFFECTIVE_OBJECT_PERMISSIONS_BUILD = """
+    INSERT INTO authentik_core_effectiveobjectpermission
+    (user_id, content_type_id, permission_id, object_pk)
+    SELECT DISTINCT
+    user_roles.user_id,
+    permission.content_type_id,
+    permission.permission_id,
+    permission.object_pk
+    FROM (
+    SELECT membership.user_id, membership.role_id
+    FROM authentik_core_user_roles AS membership
+    UNION
+    SELECT membership.user_id, group_roles.role_id
+    FROM authentik_core_user_groups AS membership
+    JOIN authentik_core_group_roles AS group_roles
+    ON group_roles.group_id = membership.group_id
+    UNION
+    SELECT membership.user_id, group_roles.role_id
+    FROM authentik_core_user_groups AS membership
+    JOIN authentik_core_groupancestry AS ancestry
+    ON ancestry.descendant_id = membership.group_id
+    JOIN authentik_core_group_roles AS group_roles
+    ON group_roles.group_id = ancestry.ancestor_id
+    ) AS user_roles
+    JOIN guardian_roleobjectpermission AS permission
+    ON permission.role_id = user_roles.role_id
+    ON CONFLICT DO NOTHING
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("authentik_core", "0058_groupancestrynode_table"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("guardian", "0005_delete_userobjectpermission_and_groupobjectpermission"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EffectiveObjectPermission",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("object_pk", models.CharField(max_length=255)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "permission",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="auth.permission"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "default_permissions": (),
+                "indexes": [
+                    models.Index(
+                        fields=["user", "content_type", "object_pk"],
+                        name="authentik_c_user_id_866751_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "permission", "object_pk"),
+                        name="unique_effective_object_permission",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="GroupRoleMembership",
+            fields=[],
+            options={
+                "default_permissions": (),
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("authentik_core.group_roles",),
+        ),
+        migrations.CreateModel(
+            name="RoleObjectPermissionTriggers",
+            fields=[],
+            options={
+                "default_permissions": (),
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("guardian.roleobjectpermission",),
+        ),
+        migrations.CreateModel(
+            name="UserGroupMembership",
+            fields=[],
+            options={
+                "default_permissions": (),
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("authentik_core.user_groups",),
+        ),
+        migrations.CreateModel(
+            name="UserRoleMembership",
+            fields=[],
+            options={
+                "default_permissions": (),
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("authentik_core.user_roles",),
+        ),
+        migrations.RunSQL(EFFECTIVE_OBJECT_PERMISSIONS_BUILD, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupancestrynode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT membership.user_id FROM authentik_core_user_groups AS membership\n                JOIN new_nodes ON membership.group_id = new_nodes.descendant_id) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="adfc60f3d32054dd9e71fa46e632f6c13ea9d944",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_654e0",
+                    referencing="REFERENCING NEW TABLE AS new_nodes ",
+                    table="authentik_core_groupancestry",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupancestrynode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT membership.user_id FROM authentik_core_user_groups AS membership\n                JOIN old_nodes ON membership.group_id = old_nodes.descendant_id) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="8e7d21608eb602a431eed47b893f0ae739a7b28f",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_57618",
+                    referencing="REFERENCING OLD TABLE AS old_nodes ",
+                    table="authentik_core_groupancestry",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="userrolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM new_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="fd2e71c1f007fdc994704f8655300a9c1eddfd04",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_8e6f4",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="authentik_core_user_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="userrolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM old_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="98a16ee0c3a83dc7914b9a2575d65dc3362cfe1c",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_1a852",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="authentik_core_user_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="usergroupmembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM new_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="a932404497dc6bde04723cc517957dc6049d4273",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_7d0a0",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="authentik_core_user_groups",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="usergroupmembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM old_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="980907dc76b09351a3cce139241229aaaa5bad7a",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_d0958",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="authentik_core_user_groups",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="grouprolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id FROM authentik_core_user_groups AS membership\n        WHERE membership.group_id IN (\n            SELECT changed.group_id FROM (SELECT group_id FROM new_rows) AS changed\n            UNION\n            SELECT ancestry.descendant_id\n            FROM authentik_core_groupancestry AS ancestry\n            JOIN (SELECT group_id FROM new_rows) AS changed ON ancestry.ancestor_id = changed.group_id\n        )\n    ) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="39abcfaf92d7ef6cf2e520f0a00b4fe417fa52e4",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_404b9",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="authentik_core_group_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="grouprolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id FROM authentik_core_user_groups AS membership\n        WHERE membership.group_id IN (\n            SELECT changed.group_id FROM (SELECT group_id FROM old_rows) AS changed\n            UNION\n            SELECT ancestry.descendant_id\n            FROM authentik_core_groupancestry AS ancestry\n            JOIN (SELECT group_id FROM old_rows) AS changed ON ancestry.ancestor_id = changed.group_id\n        )\n    ) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="196755938cc573e3c4b357383844526e156db848",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_45da1",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="authentik_core_group_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="roleobjectpermissiontriggers",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE changed_roles uuid[]; affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles\n            FROM (SELECT role_id, permission_id, object_pk FROM new_rows) AS changed;\n            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n    ) AS user_roles;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission\n            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM new_rows) AS changed);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        WHERE (permission.permission_id, permission.object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM new_rows) AS changed)\n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="9cb1335f742c61fba4c50b8c29bd98d5f0149cd3",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_b52b0",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="guardian_roleobjectpermission",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="roleobjectpermissiontriggers",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_update",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE changed_roles uuid[]; affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles\n            FROM (SELECT role_id, permission_id, object_pk FROM old_rows UNION SELECT role_id, permission_id, object_pk FROM new_rows) AS changed;\n            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n    ) AS user_roles;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission\n            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows UNION SELECT role_id, permission_id, object_pk FROM new_rows) AS changed);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        WHERE (permission.permission_id, permission.object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows UNION SELECT role_id, permission_id, object_pk FROM new_rows) AS changed)\n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="4c4d50b08f9b5f2572bf07a8702ed351535fd593",
+                    level="STATEMENT",
+                    operation="UPDATE",
+                    pgid="pgtrigger_effectivepermissions_update_b5a1d",
+                    referencing="REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ",
+                    table="guardian_roleobjectpermission",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="roleobjectpermissiontriggers",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE changed_roles uuid[]; affected integer[];",
+                    func="\n            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles\n            FROM (SELECT role_id, permission_id, object_pk FROM old_rows) AS changed;\n            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n    ) AS user_roles;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission\n            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows) AS changed);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        WHERE (permission.permission_id, permission.object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows) AS changed)\n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="ab145a1b6202d9204f50326ee27eeb6bf1fbaf96",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_433a4",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="guardian_roleobjectpermission",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,246 @@
+# Generated by Django 5.2.12 on 2026-10-18 23:58
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_core", "0060_remove_groupparentagenode_groupancestry_insert_and_more"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupancestrynode",
+            name="effectivepermissions_insert",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupancestrynode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT membership.user_id FROM authentik_core_user_groups AS membership\n                JOIN new_nodes ON membership.group_id = new_nodes.descendant_id) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="40fcbf6538ba84d167fe1caf3eb2be541f3cd9ae",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_654e0",
+                    referencing="REFERENCING NEW TABLE AS new_nodes ",
+                    table="authentik_core_groupancestry",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupancestrynode",
+            name="effectivepermissions_delete",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupancestrynode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT membership.user_id FROM authentik_core_user_groups AS membership\n                JOIN old_nodes ON membership.group_id = old_nodes.descendant_id) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="c82ec839625d3eb28265eb2223aa81cfb9d22975",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_57618",
+                    referencing="REFERENCING OLD TABLE AS old_nodes ",
+                    table="authentik_core_groupancestry",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="userrolemembership",
+            name="effectivepermissions_insert",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="userrolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM new_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="e6de25e5b7cb116444155e0187f8c704b73cd63f",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_8e6f4",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="authentik_core_user_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="userrolemembership",
+            name="effectivepermissions_delete",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="userrolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM old_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="5054ccf17697233175eda3b199525d7c5a3877c2",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_1a852",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="authentik_core_user_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="usergroupmembership",
+            name="effectivepermissions_insert",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="usergroupmembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM new_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="fc0efc94ad2485428f92e933b0ef4695f6d353c3",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_7d0a0",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="authentik_core_user_groups",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="usergroupmembership",
+            name="effectivepermissions_delete",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="usergroupmembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (SELECT user_id FROM old_rows) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="d8b0e469d24eea46381a4e9c14de09814b5fc399",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_d0958",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="authentik_core_user_groups",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="grouprolemembership",
+            name="effectivepermissions_insert",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="grouprolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id FROM authentik_core_user_groups AS membership\n        WHERE membership.group_id IN (\n            SELECT changed.group_id FROM (SELECT group_id FROM new_rows) AS changed\n            UNION\n            SELECT ancestry.descendant_id\n            FROM authentik_core_groupancestry AS ancestry\n            JOIN (SELECT group_id FROM new_rows) AS changed ON ancestry.ancestor_id = changed.group_id\n        )\n    ) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="094f4cb949b4a43e3af2b67bc68921c439853ef4",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_404b9",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="authentik_core_group_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="grouprolemembership",
+            name="effectivepermissions_delete",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="grouprolemembership",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id FROM authentik_core_user_groups AS membership\n        WHERE membership.group_id IN (\n            SELECT changed.group_id FROM (SELECT group_id FROM old_rows) AS changed\n            UNION\n            SELECT ancestry.descendant_id\n            FROM authentik_core_groupancestry AS ancestry\n            JOIN (SELECT group_id FROM old_rows) AS changed ON ancestry.ancestor_id = changed.group_id\n        )\n    ) AS changed;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        \n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="099e139fec6ee20918f43e7b58efd0727879cd59",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_45da1",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="authentik_core_group_roles",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="roleobjectpermissiontriggers",
+            name="effectivepermissions_insert",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="roleobjectpermissiontriggers",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE changed_roles uuid[]; affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles\n            FROM (SELECT role_id, permission_id, object_pk FROM new_rows) AS changed;\n            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n    ) AS user_roles;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission\n            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM new_rows) AS changed);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        WHERE (permission.permission_id, permission.object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM new_rows) AS changed)\n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="3d80549f357cafa124c03c5dd518ee814b1f34a7",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_effectivepermissions_insert_b52b0",
+                    referencing="REFERENCING NEW TABLE AS new_rows ",
+                    table="guardian_roleobjectpermission",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="roleobjectpermissiontriggers",
+            name="effectivepermissions_update",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="roleobjectpermissiontriggers",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_update",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE changed_roles uuid[]; affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles\n            FROM (SELECT role_id, permission_id, object_pk FROM old_rows UNION SELECT role_id, permission_id, object_pk FROM new_rows) AS changed;\n            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n    ) AS user_roles;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission\n            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows UNION SELECT role_id, permission_id, object_pk FROM new_rows) AS changed);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        WHERE (permission.permission_id, permission.object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows UNION SELECT role_id, permission_id, object_pk FROM new_rows) AS changed)\n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="7bfe074d2fcb3c47c569917938694aadf56af12d",
+                    level="STATEMENT",
+                    operation="UPDATE",
+                    pgid="pgtrigger_effectivepermissions_update_b5a1d",
+                    referencing="REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ",
+                    table="guardian_roleobjectpermission",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="roleobjectpermissiontriggers",
+            name="effectivepermissions_delete",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="roleobjectpermissiontriggers",
+            trigger=pgtrigger.compiler.Trigger(
+                name="effectivepermissions_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE changed_roles uuid[]; affected integer[];",
+                    func="\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles\n            FROM (SELECT role_id, permission_id, object_pk FROM old_rows) AS changed;\n            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected\n            FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE group_roles.role_id = ANY(changed_roles)\n    ) AS user_roles;\n            IF affected IS NULL THEN\n                RETURN NULL;\n            END IF;\n            DELETE FROM authentik_core_effectiveobjectpermission\n            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows) AS changed);\n            \n        INSERT INTO authentik_core_effectiveobjectpermission\n        (user_id, content_type_id, permission_id, object_pk)\n        SELECT DISTINCT\n        user_roles.user_id,\n        permission.content_type_id,\n        permission.permission_id,\n        permission.object_pk\n        FROM (\n        SELECT membership.user_id, membership.role_id\n        FROM authentik_core_user_roles AS membership\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = membership.group_id\n        WHERE membership.user_id = ANY(affected)\n\n        UNION\n\n        SELECT membership.user_id, group_roles.role_id\n        FROM authentik_core_user_groups AS membership\n        JOIN authentik_core_groupancestry AS ancestry\n        ON ancestry.descendant_id = membership.group_id\n        JOIN authentik_core_group_roles AS group_roles\n        ON group_roles.group_id = ancestry.ancestor_id\n        WHERE membership.user_id = ANY(affected)\n    ) AS user_roles\n        JOIN guardian_roleobjectpermission AS permission\n        ON permission.role_id = user_roles.role_id\n        WHERE (permission.permission_id, permission.object_pk) IN (SELECT changed.permission_id, changed.object_pk FROM (SELECT role_id, permission_id, object_pk FROM old_rows) AS changed)\n        ON CONFLICT DO NOTHING\n    ;\n            RETURN NULL;\n        ",
+                    hash="c7d461a07e8ea923db9e05d0aae264426e956f43",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_effectivepermissions_delete_433a4",
+                    referencing="REFERENCING OLD TABLE AS old_rows ",
+                    table="guardian_roleobjectpermission",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
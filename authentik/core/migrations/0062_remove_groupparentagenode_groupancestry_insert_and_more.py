@@ -0,0 +1,78 @@
+# Generated by Django 5.2.12 on 2026-10-19 00:10
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_core", "0061_remove_groupancestrynode_effectivepermissions_insert_and_more"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupparentagenode",
+            name="groupancestry_insert",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="groupancestry_insert",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected uuid[];",
+                    func="\n            IF current_setting('authentik.group_ancestry_deferred', true) = 'on' THEN\n                RETURN NULL;\n            END IF;\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (\n                SELECT changed.child_id AS group_id FROM (SELECT child_id FROM new_nodes) AS changed\n                UNION\n                SELECT ancestry.descendant_id AS group_id\n                FROM authentik_core_groupancestry AS ancestry\n                JOIN (SELECT child_id FROM new_nodes) AS changed ON ancestry.ancestor_id = changed.child_id\n            ) AS affected_groups;\n            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);\n            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n            \n    WITH RECURSIVE accumulator AS (\n        SELECT\n        child_id AS descendant_id,\n        parent_id AS ancestor_id\n        FROM authentik_core_groupparentage\n        WHERE child_id = ANY(affected)\n\n        UNION\n\n        SELECT\n        accumulator.descendant_id,\n        current.parent_id AS ancestor_id\n        FROM accumulator\n        JOIN authentik_core_groupparentage current\n        ON accumulator.ancestor_id = current.child_id\n    )\n    SELECT descendant_id, ancestor_id FROM accumulator\n\n            ON CONFLICT DO NOTHING;\n            RETURN NULL;\n        ",
+                    hash="fbb5f8588659e95a17dbeb78fff9f53ceec5c906",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_groupancestry_insert_caeae",
+                    referencing="REFERENCING NEW TABLE AS new_nodes ",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupparentagenode",
+            name="groupancestry_update",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="groupancestry_update",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected uuid[];",
+                    func="\n            IF current_setting('authentik.group_ancestry_deferred', true) = 'on' THEN\n                RETURN NULL;\n            END IF;\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (\n                SELECT changed.child_id AS group_id FROM (SELECT child_id FROM old_nodes UNION SELECT child_id FROM new_nodes) AS changed\n                UNION\n                SELECT ancestry.descendant_id AS group_id\n                FROM authentik_core_groupancestry AS ancestry\n                JOIN (SELECT child_id FROM old_nodes UNION SELECT child_id FROM new_nodes) AS changed ON ancestry.ancestor_id = changed.child_id\n            ) AS affected_groups;\n            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);\n            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n            \n    WITH RECURSIVE accumulator AS (\n        SELECT\n        child_id AS descendant_id,\n        parent_id AS ancestor_id\n        FROM authentik_core_groupparentage\n        WHERE child_id = ANY(affected)\n\n        UNION\n\n        SELECT\n        accumulator.descendant_id,\n        current.parent_id AS ancestor_id\n        FROM accumulator\n        JOIN authentik_core_groupparentage current\n        ON accumulator.ancestor_id = current.child_id\n    )\n    SELECT descendant_id, ancestor_id FROM accumulator\n\n            ON CONFLICT DO NOTHING;\n            RETURN NULL;\n        ",
+                    hash="a8c72fd9bc7f7e854b4df43910343f8d3a53ae3d",
+                    level="STATEMENT",
+                    operation="UPDATE",
+                    pgid="pgtrigger_groupancestry_update_ec6d6",
+                    referencing="REFERENCING OLD TABLE AS old_nodes  NEW TABLE AS new_nodes ",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupparentagenode",
+            name="groupancestry_delete",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="groupancestry_delete",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE affected uuid[];",
+                    func="\n            IF current_setting('authentik.group_ancestry_deferred', true) = 'on' THEN\n                RETURN NULL;\n            END IF;\n            PERFORM pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'));\n            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (\n                SELECT changed.child_id AS group_id FROM (SELECT child_id FROM old_nodes) AS changed\n                UNION\n                SELECT ancestry.descendant_id AS group_id\n                FROM authentik_core_groupancestry AS ancestry\n                JOIN (SELECT child_id FROM old_nodes) AS changed ON ancestry.ancestor_id = changed.child_id\n            ) AS affected_groups;\n            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);\n            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n            \n    WITH RECURSIVE accumulator AS (\n        SELECT\n        child_id AS descendant_id,\n        parent_id AS ancestor_id\n        FROM authentik_core_groupparentage\n        WHERE child_id = ANY(affected)\n\n        UNION\n\n        SELECT\n        accumulator.descendant_id,\n        current.parent_id AS ancestor_id\n        FROM accumulator\n        JOIN authentik_core_groupparentage current\n        ON accumulator.ancestor_id = current.child_id\n    )\n    SELECT descendant_id, ancestor_id FROM accumulator\n\n            ON CONFLICT DO NOTHING;\n            RETURN NULL;\n        ",
+                    hash="51a69c274e109be42d448f64d1fce7a439acd1ab",
+                    level="STATEMENT",
+                    operation="DELETE",
+                    pgid="pgtrigger_groupancestry_delete_41414",
+                    referencing="REFERENCING OLD TABLE AS old_nodes ",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
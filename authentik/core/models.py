@@ -2,21 +2,25 @@
 
 import re
 import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import StrEnum
 from hashlib import sha256
 from typing import Any, Self
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pgtrigger
 from deepmerge import always_merger
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import AbstractUser, Permission
 from django.contrib.auth.models import UserManager as DjangoUserManager
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.sessions.base_session import AbstractBaseSession
+from django.core.cache import cache
 from django.core.validators import validate_slug
-from django.db import models
-from django.db.models import Q, QuerySet, options
+from django.db import connection, models, transaction
+from django.db.models import BooleanField, Q, QuerySet, UUIDField, Value, options
 from django.http import HttpRequest
 from django.utils.functional import cached_property
 from django.utils.timezone import now
@@ -24,8 +28,6 @@ from django.utils.translation import gettext_lazy as _
 from guardian.conf import settings
 from guardian.models import RoleModelPermission, RoleObjectPermission
 from model_utils.managers import InheritanceManager
-from psqlextra.indexes import UniqueIndex
-from psqlextra.models import PostgresMaterializedViewModel
 from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
 
@@ -36,6 +38,7 @@ from authentik.blueprints.models import ManagedModel
 from authentik.core.expression.exceptions import PropertyMappingExpressionException
 from authentik.core.types import UILoginButton, UserSettingSerializer
 from authentik.lib.avatars import get_avatar
+from authentik.lib.config import CONFIG
 from authentik.lib.expression.exceptions import ControlFlowException
 from authentik.lib.generators import generate_id
 from authentik.lib.merge import MERGE_LIST_UNIQUE
@@ -78,6 +81,9 @@ GROUP_RECURSION_LIMIT = 20
 MANAGED_ROLE_PREFIX_USER = "ak-managed-role--user"
 MANAGED_ROLE_PREFIX_GROUP = "ak-managed-role--group"
 
+IDENTITY_CACHE_PREFIX = "goauthentik.io/core/identity/"
+IDENTITY_CACHE_TIMEOUT = CONFIG.get_int("cache.timeout_identity", 0)
+
 
 def managed_role_name(user_or_group: models.Model):
     if isinstance(user_or_group, User):
@@ -259,6 +265,183 @@ class Group(SerializerModel, AttributesMixin):
         role.assign_perms(perms, obj)
 
 
+# Transitive closure of authentik_core_groupparentage, optionally limited to the
+# ancestry of some descendants
+# See https://en.wikipedia.org/wiki/Transitive_closure#In_graph_theory
+GROUP_ANCESTRY_QUERY = """
+    WITH RECURSIVE accumulator AS (
+        SELECT
+        child_id AS descendant_id,
+        parent_id AS ancestor_id
+        FROM authentik_core_groupparentage
+        {condition}
+
+        UNION
+
+        SELECT
+        accumulator.descendant_id,
+        current.parent_id AS ancestor_id
+        FROM accumulator
+        JOIN authentik_core_groupparentage current
+        ON accumulator.ancestor_id = current.child_id
+    )
+    SELECT descendant_id, ancestor_id FROM accumulator
+"""
+# Transaction-level advisory lock taken before group ancestry or effective object permissions
+# are updated. Each update reads memberships and rows other transactions write, so concurrent
+# updates have to be serialized.
+MEMBERSHIP_LOCK = (
+    "pg_advisory_xact_lock(hashtext(current_schema() || '/authentik_core_memberships'))"
+)
+# Setting which can be set for the current transaction to skip incremental updates
+# of the group ancestry, see `GroupAncestryNode.deferred`
+GROUP_ANCESTRY_DEFERRED_SETTING = "authentik.group_ancestry_deferred"
+
+
+def _group_ancestry_trigger(name: str, operation, referencing, changed_children: str):
+    """Statement-level trigger which recomputes the ancestry of the children of all
+    changed parentage nodes, and of all their descendants. All other groups' ancestry
+    can't be affected by the change."""
+    return pgtrigger.Trigger(
+        name=name,
+        operation=operation,
+        when=pgtrigger.After,
+        level=pgtrigger.Statement,
+        referencing=referencing,
+        declare=[("affected", "uuid[]")],
+        func=f"""
+            IF current_setting('{GROUP_ANCESTRY_DEFERRED_SETTING}', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            PERFORM {MEMBERSHIP_LOCK};
+            SELECT array_agg(DISTINCT affected_groups.group_id) INTO affected FROM (
+                SELECT changed.child_id AS group_id FROM ({changed_children}) AS changed
+                UNION
+                SELECT ancestry.descendant_id AS group_id
+                FROM authentik_core_groupancestry AS ancestry
+                JOIN ({changed_children}) AS changed ON ancestry.ancestor_id = changed.child_id
+            ) AS affected_groups;
+            DELETE FROM authentik_core_groupancestry WHERE descendant_id = ANY(affected);
+            INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)
+            {GROUP_ANCESTRY_QUERY.format(condition="WHERE child_id = ANY(affected)")}
+            ON CONFLICT DO NOTHING;
+            RETURN NULL;
+        """,
+    )
+
+
+def _user_roles_query(users: str = "", roles: str = "") -> str:
+    """Roles of users, assigned directly or to their groups or their groups' ancestors,
+    optionally limited to the users in the array `users` and the roles in the array `roles`"""
+
+    def where(role_column: str) -> str:
+        conditions = []
+        if users:
+            conditions.append(f"membership.user_id = ANY({users})")
+        if roles:
+            conditions.append(f"{role_column} = ANY({roles})")
+        return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    return f"""
+        SELECT membership.user_id, membership.role_id
+        FROM authentik_core_user_roles AS membership
+        {where("membership.role_id")}
+
+        UNION
+
+        SELECT membership.user_id, group_roles.role_id
+        FROM authentik_core_user_groups AS membership
+        JOIN authentik_core_group_roles AS group_roles
+        ON group_roles.group_id = membership.group_id
+        {where("group_roles.role_id")}
+
+        UNION
+
+        SELECT membership.user_id, group_roles.role_id
+        FROM authentik_core_user_groups AS membership
+        JOIN authentik_core_groupancestry AS ancestry
+        ON ancestry.descendant_id = membership.group_id
+        JOIN authentik_core_group_roles AS group_roles
+        ON group_roles.group_id = ancestry.ancestor_id
+        {where("group_roles.role_id")}
+    """
+
+
+def _effective_permissions_insert(users: str = "", condition: str = "") -> str:
+    """Insert the effective object permissions of users, optionally limited to the users
+    in the array `users` and to role object permissions matching `condition`"""
+    return f"""
+        INSERT INTO authentik_core_effectiveobjectpermission
+        (user_id, content_type_id, permission_id, object_pk)
+        SELECT DISTINCT
+        user_roles.user_id,
+        permission.content_type_id,
+        permission.permission_id,
+        permission.object_pk
+        FROM ({_user_roles_query(users=users)}) AS user_roles
+        JOIN guardian_roleobjectpermission AS permission
+        ON permission.role_id = user_roles.role_id
+        {condition}
+        ON CONFLICT DO NOTHING
+    """
+
+
+def _effective_permissions_trigger(name: str, operation, referencing, affected_users: str):
+    """Statement-level trigger which recomputes the effective object permissions of all
+    users whose roles might have changed"""
+    return pgtrigger.Trigger(
+        name=name,
+        operation=operation,
+        when=pgtrigger.After,
+        level=pgtrigger.Statement,
+        referencing=referencing,
+        declare=[("affected", "integer[]")],
+        func=f"""
+            PERFORM {MEMBERSHIP_LOCK};
+            SELECT array_agg(DISTINCT changed.user_id) INTO affected
+            FROM ({affected_users}) AS changed;
+            IF affected IS NULL THEN
+                RETURN NULL;
+            END IF;
+            DELETE FROM authentik_core_effectiveobjectpermission WHERE user_id = ANY(affected);
+            {_effective_permissions_insert(users="affected")};
+            RETURN NULL;
+        """,
+    )
+
+
+def _effective_role_permissions_trigger(name: str, operation, referencing, changed: str):
+    """Statement-level trigger which recomputes the changed object permissions for all
+    users of the roles they were assigned to. Other permissions of these users are kept."""
+    changed_keys = f"(SELECT changed.permission_id, changed.object_pk FROM ({changed}) AS changed)"
+    insert = _effective_permissions_insert(
+        users="affected",
+        condition=f"WHERE (permission.permission_id, permission.object_pk) IN {changed_keys}",
+    )
+    return pgtrigger.Trigger(
+        name=name,
+        operation=operation,
+        when=pgtrigger.After,
+        level=pgtrigger.Statement,
+        referencing=referencing,
+        declare=[("changed_roles", "uuid[]"), ("affected", "integer[]")],
+        func=f"""
+            PERFORM {MEMBERSHIP_LOCK};
+            SELECT array_agg(DISTINCT changed.role_id) INTO changed_roles
+            FROM ({changed}) AS changed;
+            SELECT array_agg(DISTINCT user_roles.user_id) INTO affected
+            FROM ({_user_roles_query(roles="changed_roles")}) AS user_roles;
+            IF affected IS NULL THEN
+                RETURN NULL;
+            END IF;
+            DELETE FROM authentik_core_effectiveobjectpermission
+            WHERE user_id = ANY(affected) AND (permission_id, object_pk) IN {changed_keys};
+            {insert};
+            RETURN NULL;
+        """,
+    )
+
+
 class GroupParentageNode(models.Model):
     uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)
 
@@ -272,14 +455,23 @@ class GroupParentageNode(models.Model):
         db_table = "authentik_core_groupparentage"
 
         triggers = [
-            pgtrigger.Trigger(
-                name="refresh_groupancestry",
-                operation=pgtrigger.Insert | pgtrigger.Update | pgtrigger.Delete,
-                when=pgtrigger.After,
-                func="""
-                    REFRESH MATERIALIZED VIEW CONCURRENTLY authentik_core_groupancestry;
-                    RETURN NULL;
-                """,
+            _group_ancestry_trigger(
+                "groupancestry_insert",
+                pgtrigger.Insert,
+                pgtrigger.Referencing(new="new_nodes"),
+                "SELECT child_id FROM new_nodes",
+            ),
+            _group_ancestry_trigger(
+                "groupancestry_update",
+                pgtrigger.Update,
+                pgtrigger.Referencing(old="old_nodes", new="new_nodes"),
+                "SELECT child_id FROM old_nodes UNION SELECT child_id FROM new_nodes",
+            ),
+            _group_ancestry_trigger(
+                "groupancestry_delete",
+                pgtrigger.Delete,
+                pgtrigger.Referencing(old="old_nodes"),
+                "SELECT child_id FROM old_nodes",
             ),
         ]
 
@@ -287,7 +479,10 @@ class GroupParentageNode(models.Model):
         return f"Group Parentage Node from #{self.child_id} to {self.parent_id}"
 
 
-class GroupAncestryNode(PostgresMaterializedViewModel):
+class GroupAncestryNode(models.Model):
+    """Transitive closure of group parentage, incrementally maintained by triggers
+    on GroupParentageNode"""
+
     descendant = models.ForeignKey(
         Group, related_name="ancestor_nodes", on_delete=models.DO_NOTHING
     )
@@ -296,39 +491,139 @@ class GroupAncestryNode(PostgresMaterializedViewModel):
     )
 
     class Meta:
-        # This is a transitive closure of authentik_core_groupparentage
-        # See https://en.wikipedia.org/wiki/Transitive_closure#In_graph_theory
         db_table = "authentik_core_groupancestry"
-        indexes = [
-            models.Index(fields=["descendant"]),
-            models.Index(fields=["ancestor"]),
-            UniqueIndex(fields=["id"]),
+        constraints = [
+            models.UniqueConstraint(
+                fields=["descendant", "ancestor"], name="unique_group_ancestry"
+            ),
+        ]
+        triggers = [
+            _effective_permissions_trigger(
+                "effectivepermissions_insert",
+                pgtrigger.Insert,
+                pgtrigger.Referencing(new="new_nodes"),
+                """SELECT membership.user_id FROM authentik_core_user_groups AS membership
+                JOIN new_nodes ON membership.group_id = new_nodes.descendant_id""",
+            ),
+            _effective_permissions_trigger(
+                "effectivepermissions_delete",
+                pgtrigger.Delete,
+                pgtrigger.Referencing(old="old_nodes"),
+                """SELECT membership.user_id FROM authentik_core_user_groups AS membership
+                JOIN old_nodes ON membership.group_id = old_nodes.descendant_id""",
+            ),
         ]
 
-    class ViewMeta:
-        query = """
-            WITH RECURSIVE accumulator AS (
-                SELECT
-                child_id::text || '-' || parent_id::text as id,
-                child_id AS descendant_id,
-                parent_id AS ancestor_id
-                FROM authentik_core_groupparentage
-
-                UNION
+    def __str__(self) -> str:
+        return f"Group Ancestry Node from {self.descendant_id} to {self.ancestor_id}"
 
-                SELECT
-                accumulator.descendant_id::text || '-' || current.parent_id::text as id,
-                accumulator.descendant_id,
-                current.parent_id AS ancestor_id
-                FROM accumulator
-                JOIN authentik_core_groupparentage current
-                ON accumulator.ancestor_id = current.child_id
+    @staticmethod
+    def rebuild():
+        """Fully rebuild the group ancestry from group parentage. Only nodes which changed are
+        deleted and inserted, so that only the effective permissions of affected users are
+        updated."""
+        query = GROUP_ANCESTRY_QUERY.format(condition="")
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SELECT {MEMBERSHIP_LOCK}")
+            cursor.execute(
+                "DELETE FROM authentik_core_groupancestry AS node WHERE NOT EXISTS ("
+                f"SELECT 1 FROM ({query}) AS target "
+                "WHERE target.descendant_id = node.descendant_id "
+                "AND target.ancestor_id = node.ancestor_id)"
+            )
+            cursor.execute(
+                "INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id) "
+                f"{query} ON CONFLICT DO NOTHING"
             )
-            SELECT * FROM accumulator
-        """
 
-    def __str__(self) -> str:
-        return f"Group Ancestry Node from {self.descendant_id} to {self.ancestor_id}"
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """Skip incremental ancestry updates within the block, and rebuild the ancestry
+        once at the end. Useful for bulk changes to group parentage, as a single rebuild
+        is cheaper than many incremental updates. The block is run in a transaction."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting(%s, true)", [GROUP_ANCESTRY_DEFERRED_SETTING])
+            if cursor.fetchone()[0] == "on":
+                # Already deferred by an outer block, which rebuilds the ancestry
+                yield
+                return
+            cursor.execute("SELECT set_config(%s, 'on', true)", [GROUP_ANCESTRY_DEFERRED_SETTING])
+            yield
+            cursor.execute("SELECT set_config(%s, 'off', true)", [GROUP_ANCESTRY_DEFERRED_SETTING])
+            GroupAncestryNode.rebuild()
+            # Identities cached within the block might've been resolved with the previous ancestry
+            if IDENTITY_CACHE_TIMEOUT > 0:
+                cache.delete_prefix(IDENTITY_CACHE_PREFIX)
+
+
+@dataclass(frozen=True, slots=True)
+class UserIdentity:
+    """Snapshot of a user's group memberships, roles and superuser status"""
+
+    # Groups the user is a direct member of
+    group_pks: frozenset[UUID]
+    # Groups the user is a direct member of, and all of their ancestors
+    all_group_pks: frozenset[UUID]
+    # Roles of the user and all of their groups (recursively)
+    role_pks: frozenset[UUID]
+    is_superuser: bool
+
+    @staticmethod
+    def cache_key(user_pk: int | str) -> str:
+        """Cache key for a user's identity, only used when `cache.timeout_identity` is set"""
+        return f"{IDENTITY_CACHE_PREFIX}{user_pk}"
+
+    @staticmethod
+    def for_user(user: User) -> UserIdentity:
+        """Resolve identity of `user` with a single query"""
+        columns = ("group", "superuser", "role", "direct")
+        direct = (
+            Group.objects.filter(users=user)
+            .annotate(
+                group=models.F("pk"),
+                superuser=models.F("is_superuser"),
+                role=models.F("roles"),
+                direct=Value(True, output_field=BooleanField()),
+            )
+            .values_list(*columns)
+        )
+        inherited = (
+            Group.objects.filter(descendant_nodes__descendant__users=user)
+            .annotate(
+                group=models.F("pk"),
+                superuser=models.F("is_superuser"),
+                role=models.F("roles"),
+                direct=Value(False, output_field=BooleanField()),
+            )
+            .values_list(*columns)
+        )
+        roles = (
+            Role.objects.filter(users=user)
+            .annotate(
+                group=Value(None, output_field=UUIDField()),
+                superuser=Value(False, output_field=BooleanField()),
+                role=models.F("pk"),
+                direct=Value(False, output_field=BooleanField()),
+            )
+            .values_list(*columns)
+        )
+        group_pks, all_group_pks, role_pks = set(), set(), set()
+        is_superuser = False
+        for group_pk, superuser, role_pk, is_direct in direct.union(inherited, roles, all=True):
+            if group_pk:
+                all_group_pks.add(group_pk)
+            if is_direct:
+                group_pks.add(group_pk)
+            if role_pk:
+                role_pks.add(role_pk)
+            is_superuser = is_superuser or superuser
+        return UserIdentity(
+            group_pks=frozenset(group_pks),
+            all_group_pks=frozenset(all_group_pks),
+            role_pks=frozenset(role_pks),
+            is_superuser=is_superuser,
+        )
 
 
 class UserQuerySet(models.QuerySet):
@@ -407,6 +702,27 @@ class User(SerializerModel, AttributesMixin, AbstractUser):
         """Recursively get all groups this user is a member of."""
         return self.groups.all().with_ancestors()
 
+    @cached_property
+    def identity(self) -> UserIdentity:
+        """Group memberships, roles and superuser status of this user, resolved once
+        per instance (and optionally cached across requests). Prefer this over
+        `all_groups()` and `all_roles()` when only primary keys are required."""
+        if not self.pk:
+            return UserIdentity(frozenset(), frozenset(), frozenset(), False)
+        if IDENTITY_CACHE_TIMEOUT < 1:
+            return UserIdentity.for_user(self)
+        key = UserIdentity.cache_key(self.pk)
+        identity = cache.get(key)
+        if not identity:
+            identity = UserIdentity.for_user(self)
+            cache.set(key, identity, IDENTITY_CACHE_TIMEOUT)
+        return identity
+
+    def clear_identity(self):
+        """Clear the resolved identity of this instance, see `identity`"""
+        self.__dict__.pop("identity", None)
+        self.__dict__.pop("is_superuser", None)
+
     def all_roles(self) -> QuerySet[Role]:
         """Get all roles of this user and all of its groups (recursively)."""
         return Role.objects.filter(Q(users=self) | Q(groups__in=self.all_groups())).distinct()
@@ -417,6 +733,7 @@ class User(SerializerModel, AttributesMixin, AbstractUser):
             role, created = Role.objects.get_or_create(name=name, managed=name)
             if created:
                 role.users.add(self)
+                self.clear_identity()
             return role
         else:
             return Role.objects.filter(name=managed_role_name(self)).first()
@@ -466,7 +783,7 @@ class User(SerializerModel, AttributesMixin, AbstractUser):
         final_attributes = {}
         if request and hasattr(request, "brand"):
             always_merger.merge(final_attributes, request.brand.attributes)
-        for group in self.all_groups().order_by("name"):
+        for group in Group.objects.filter(pk__in=self.identity.all_group_pks).order_by("name"):
             always_merger.merge(final_attributes, group.attributes)
         always_merger.merge(final_attributes, self.attributes)
         return final_attributes
@@ -475,7 +792,7 @@ class User(SerializerModel, AttributesMixin, AbstractUser):
         """Get all entitlements this user has for `app`."""
         if not app:
             return []
-        all_groups = self.all_groups()
+        all_groups = self.identity.all_group_pks
         qs = app.applicationentitlement_set.filter(
             Q(
                 Q(bindings__user=self) | Q(bindings__group__in=all_groups),
@@ -506,7 +823,7 @@ class User(SerializerModel, AttributesMixin, AbstractUser):
     @cached_property
     def is_superuser(self) -> bool:
         """Get supseruser status based on membership in a group with superuser status"""
-        return self.all_groups().filter(is_superuser=True).exists()
+        return self.identity.is_superuser
 
     @property
     def is_staff(self) -> bool:
@@ -611,6 +928,153 @@ class User(SerializerModel, AttributesMixin, AbstractUser):
         return get_avatar(self)
 
 
+class EffectiveObjectPermission(models.Model):
+    """Object permissions of a user through all of their roles, including the roles of their
+    groups and their groups' ancestors. Incrementally maintained by triggers on role object
+    permissions, role and group memberships and the group ancestry, so permission checks
+    don't need to resolve the roles of a user."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    permission = models.ForeignKey(Permission, on_delete=models.CASCADE)
+    object_pk = models.CharField(max_length=255)
+
+    class Meta:
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "permission", "object_pk"],
+                name="unique_effective_object_permission",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "content_type", "object_pk"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Effective Object Permission {self.permission_id} of {self.user_id}"
+
+    @staticmethod
+    def rebuild():
+        """Fully rebuild the effective object permissions of all users"""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SELECT {MEMBERSHIP_LOCK}")
+            cursor.execute("DELETE FROM authentik_core_effectiveobjectpermission")
+            cursor.execute(_effective_permissions_insert())
+
+
+class UserRoleMembership(User.roles.through):
+    """Triggers on role memberships of users, see `EffectiveObjectPermission`"""
+
+    class Meta:
+        proxy = True
+        default_permissions = ()
+        triggers = [
+            _effective_permissions_trigger(
+                "effectivepermissions_insert",
+                pgtrigger.Insert,
+                pgtrigger.Referencing(new="new_rows"),
+                "SELECT user_id FROM new_rows",
+            ),
+            _effective_permissions_trigger(
+                "effectivepermissions_delete",
+                pgtrigger.Delete,
+                pgtrigger.Referencing(old="old_rows"),
+                "SELECT user_id FROM old_rows",
+            ),
+        ]
+
+
+class UserGroupMembership(User.groups.through):
+    """Triggers on group memberships of users, see `EffectiveObjectPermission`"""
+
+    class Meta:
+        proxy = True
+        default_permissions = ()
+        triggers = [
+            _effective_permissions_trigger(
+                "effectivepermissions_insert",
+                pgtrigger.Insert,
+                pgtrigger.Referencing(new="new_rows"),
+                "SELECT user_id FROM new_rows",
+            ),
+            _effective_permissions_trigger(
+                "effectivepermissions_delete",
+                pgtrigger.Delete,
+                pgtrigger.Referencing(old="old_rows"),
+                "SELECT user_id FROM old_rows",
+            ),
+        ]
+
+
+def _group_members_query(changed_groups: str) -> str:
+    """Members of the changed groups and of all their descendants"""
+    return f"""
+        SELECT membership.user_id FROM authentik_core_user_groups AS membership
+        WHERE membership.group_id IN (
+            SELECT changed.group_id FROM ({changed_groups}) AS changed
+            UNION
+            SELECT ancestry.descendant_id
+            FROM authentik_core_groupancestry AS ancestry
+            JOIN ({changed_groups}) AS changed ON ancestry.ancestor_id = changed.group_id
+        )
+    """
+
+
+class GroupRoleMembership(Group.roles.through):
+    """Triggers on role memberships of groups, see `EffectiveObjectPermission`"""
+
+    class Meta:
+        proxy = True
+        default_permissions = ()
+        triggers = [
+            _effective_permissions_trigger(
+                "effectivepermissions_insert",
+                pgtrigger.Insert,
+                pgtrigger.Referencing(new="new_rows"),
+                _group_members_query("SELECT group_id FROM new_rows"),
+            ),
+            _effective_permissions_trigger(
+                "effectivepermissions_delete",
+                pgtrigger.Delete,
+                pgtrigger.Referencing(old="old_rows"),
+                _group_members_query("SELECT group_id FROM old_rows"),
+            ),
+        ]
+
+
+class RoleObjectPermissionTriggers(RoleObjectPermission):
+    """Triggers on object permissions of roles, see `EffectiveObjectPermission`"""
+
+    class Meta:
+        proxy = True
+        default_permissions = ()
+        triggers = [
+            _effective_role_permissions_trigger(
+                "effectivepermissions_insert",
+                pgtrigger.Insert,
+                pgtrigger.Referencing(new="new_rows"),
+                "SELECT role_id, permission_id, object_pk FROM new_rows",
+            ),
+            _effective_role_permissions_trigger(
+                "effectivepermissions_update",
+                pgtrigger.Update,
+                pgtrigger.Referencing(old="old_rows", new="new_rows"),
+                "SELECT role_id, permission_id, object_pk FROM old_rows "
+                "UNION SELECT role_id, permission_id, object_pk FROM new_rows",
+            ),
+            _effective_role_permissions_trigger(
+                "effectivepermissions_delete",
+                pgtrigger.Delete,
+                pgtrigger.Referencing(old="old_rows"),
+                "SELECT role_id, permission_id, object_pk FROM old_rows",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Role Object Permission {self.permission_id} of {self.role_id}"
+
+
 class Provider(SerializerModel):
     """Application-independent Provider instance. For example SAML2 Remote, OAuth2 Application"""
 
@@ -1102,6 +1566,11 @@ class ExpiringModel(models.Model):
     expires = models.DateTimeField(default=None, null=True)
     expiring = models.BooleanField(default=True)
 
+    # Set on models whose expiry has no side effects: no signal receivers, no related objects
+    # and no custom `expire_action`. Expired objects of these models are deleted in batches
+    # with plain DELETE statements.
+    expire_in_bulk = False
+
     class Meta:
         abstract = True
         indexes = [
@@ -1,19 +1,50 @@
 """authentik sessions engine"""
 
 import pickle  # nosec
+from collections.abc import Iterable
+from copy import deepcopy
+from datetime import timedelta
 
 from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
 from django.contrib.sessions.backends.db import SessionStore as SessionBase
 from django.core.exceptions import SuspiciousOperation
+from django.db import connection
 from django.utils import timezone
 from django.utils.functional import cached_property
 from structlog.stdlib import get_logger
 
+from authentik.lib.config import CONFIG
 from authentik.root.middleware import ClientIPMiddleware
+from authentik.tenants.resolver import RESOLVER
 
 LOGGER = get_logger()
 
 
+def session_cache_timeout() -> int:
+    """Seconds sessions are cached in-process, 0 if disabled"""
+    return CONFIG.get_int("sessions.cache_timeout", 5)
+
+
+def session_cache_prefix() -> str:
+    """Prefix of the in-process cache keys of all sessions of the current tenant"""
+    return f"sessions/{connection.schema_name}/"
+
+
+def invalidate_session_cache(session_key: str = ""):
+    """Drop a session, or all sessions of the current tenant, from the cache of all processes"""
+    if session_cache_timeout() <= 0:
+        return
+    RESOLVER.invalidate(f"{session_cache_prefix()}{session_key}")
+
+
+def invalidate_session_cache_many(session_keys: Iterable[str]):
+    """Drop multiple sessions from the cache of all processes, with a single notification"""
+    if session_cache_timeout() <= 0:
+        return
+    prefix = session_cache_prefix()
+    RESOLVER.invalidate_many(f"{prefix}{session_key}" for session_key in session_keys)
+
+
 class SessionStore(SessionBase):
     def __init__(self, session_key=None, last_ip=None, last_user_agent=""):
         super().__init__(session_key)
@@ -21,6 +52,8 @@ class SessionStore(SessionBase):
             "last_ip": last_ip or ClientIPMiddleware.default_ip,
             "last_user_agent": last_user_agent,
         }
+        # Session as loaded from the database, to detect if saving it would change anything
+        self._loaded = None
 
     @classmethod
     def get_model_class(cls):
@@ -32,7 +65,35 @@ class SessionStore(SessionBase):
     def model_fields(self):
         return [k.value for k in self.model.Keys]
 
+    @property
+    def cache_key(self) -> str:
+        return f"{session_cache_prefix()}{self.session_key}"
+
+    def _get_cached_session(self):
+        """Get a copy of the session from the in-process cache, so requests don't share state.
+        Changes made by any process are dropped from the cache, cached sessions are re-checked
+        for expiry since that doesn't send any signals. Only used for synchronous requests, where
+        the tenant of the cache key is set on the connection"""
+        if session_cache_timeout() <= 0 or not self.session_key:
+            return None
+        cached = RESOLVER.lookup(self.cache_key)
+        if cached is None or cached.expires <= timezone.now():
+            return None
+        return deepcopy(cached)
+
+    def _cache_session(self, session):
+        if session is None:
+            return
+        RESOLVER.store(self.cache_key, deepcopy(session), session_cache_timeout())
+
     def _get_session_from_db(self):
+        if (cached := self._get_cached_session()) is not None:
+            return cached
+        session = self._query_session_from_db()
+        self._cache_session(session)
+        return session
+
+    def _query_session_from_db(self):
         try:
             return self.model.objects.select_related(
                 "authenticatedsession",
@@ -76,7 +137,7 @@ class SessionStore(SessionBase):
         return {}
 
     def load(self):
-        s = self._get_session_from_db()
+        s = self._loaded = self._get_session_from_db()
         if s:
             return {
                 "authenticatedsession": getattr(s, "authenticatedsession", None),
@@ -87,7 +148,7 @@ class SessionStore(SessionBase):
             return {}
 
     async def aload(self):
-        s = await self._aget_session_from_db()
+        s = self._loaded = await self._aget_session_from_db()
         if s:
             return {
                 "authenticatedsession": getattr(s, "authenticatedsession", None),
@@ -137,6 +198,37 @@ class SessionStore(SessionBase):
         args["session_data"] = self.encode(args["session_data"])
         return self.model(**args)
 
+    def _is_unchanged(self) -> bool:
+        """Check if saving would only update `last_used` and `expires` by less than the
+        configured coalesce interval, in which case the write is skipped"""
+        interval = timedelta(seconds=CONFIG.get_int("sessions.coalesce_interval", 0))
+        if interval.total_seconds() <= 0 or self._loaded is None:
+            return False
+        if self._loaded.session_key != self.session_key:
+            return False
+        if timezone.now() - self._loaded.last_used >= interval:
+            return False
+        session = self.create_model_instance(self._get_session())
+        if abs(session.expires - self._loaded.expires) >= interval:
+            return False
+        return (
+            bytes(session.session_data) == bytes(self._loaded.session_data)
+            and session.last_ip == self._loaded.last_ip
+            and session.last_user_agent == self._loaded.last_user_agent
+        )
+
+    def save(self, must_create=False):
+        if not must_create and self._is_unchanged():
+            return
+        super().save(must_create=must_create)
+        self._loaded = None
+
+    async def asave(self, must_create=False):
+        if not must_create and self._is_unchanged():
+            return
+        await super().asave(must_create=must_create)
+        self._loaded = None
+
     @classmethod
     def clear_expired(cls):
         cls.get_model_class().objects.filter(expires__lt=timezone.now()).delete()
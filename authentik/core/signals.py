@@ -5,20 +5,29 @@ from channels.layers import get_channel_layer
 from django.contrib.auth.signals import user_logged_in
 from django.core.cache import cache
 from django.db.models import Model
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import Signal, receiver
 from django.http.request import HttpRequest
 from structlog.stdlib import get_logger
 
 from authentik.core.models import (
+    IDENTITY_CACHE_PREFIX,
+    IDENTITY_CACHE_TIMEOUT,
     Application,
     AuthenticatedSession,
     BackchannelProvider,
     ExpiringModel,
+    Group,
     Session,
     User,
+    UserIdentity,
     default_token_duration,
 )
+from authentik.core.sessions import (
+    invalidate_session_cache,
+    invalidate_session_cache_many,
+    session_cache_timeout,
+)
 from authentik.flows.apps import RefreshOtherFlowsAfterAuthentication
 from authentik.root.ws.consumer import build_device_group
 
@@ -34,14 +43,13 @@ LOGGER = get_logger()
 @receiver(post_save, sender=Application)
 def post_save_application(sender: type[Model], instance, created: bool, **_):
     """Clear user's application cache upon application creation"""
-    from authentik.core.api.applications import user_app_cache_key
+    from authentik.core.api.applications import APP_ACCESS_CACHE
 
     if not created:  # pragma: no cover
         return
 
     # Also delete user application cache
-    keys = cache.keys(user_app_cache_key("*"))
-    cache.delete_many(keys)
+    APP_ACCESS_CACHE.invalidate()
 
 
 @receiver(user_logged_in)
@@ -69,6 +77,26 @@ def authenticated_session_delete(sender: type[Model], instance: AuthenticatedSes
     Session.objects.filter(session_key=instance.pk).delete()
 
 
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+@receiver(post_save, sender=AuthenticatedSession)
+@receiver(post_delete, sender=AuthenticatedSession)
+def session_invalidate_cache(sender: type[Model], instance: Session | AuthenticatedSession, **_):
+    """Drop changed, revoked and logged out sessions from the in-process session cache"""
+    invalidate_session_cache(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_invalidate_session_cache(sender: type[Model], instance: User, **_):
+    """Drop the cached sessions of a user when they change, as the sessions include the user"""
+    if session_cache_timeout() <= 0:
+        return
+    session_keys = AuthenticatedSession.objects.filter(user=instance).values_list("pk", flat=True)
+    if session_keys := list(session_keys):
+        invalidate_session_cache_many(session_keys)
+
+
 @receiver(pre_save)
 def backchannel_provider_pre_save(sender: type[Model], instance: Model, **_):
     """Ensure backchannel providers have is_backchannel set to true"""
@@ -84,3 +112,72 @@ def expiring_model_pre_save(sender: type[Model], instance: Model, **_):
         return
     if instance.expiring and instance.expires is None:
         instance.expires = default_token_duration()
+
+
+def _clear_cached_identities(user_pks: set | None = None):
+    """Clear identities cached across requests, for all users if `user_pks` is not given"""
+    if IDENTITY_CACHE_TIMEOUT < 1:
+        return
+    if user_pks is None:
+        cache.delete_prefix(IDENTITY_CACHE_PREFIX)
+        return
+    cache.delete_many([UserIdentity.cache_key(pk) for pk in user_pks])
+
+
+def _clear_cached_group_identities(group_pks: set | None):
+    """Clear identities cached across requests of all members of `group_pks` and their
+    descendants, for all users if `group_pks` is not given"""
+    if IDENTITY_CACHE_TIMEOUT < 1:
+        return
+    if group_pks is None:
+        _clear_cached_identities()
+        return
+    groups = Group.objects.filter(pk__in=group_pks).with_descendants()
+    _clear_cached_identities(
+        set(User.objects.filter(groups__in=groups).values_list("pk", flat=True))
+    )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.roles.through)
+def user_identity_m2m_changed(
+    sender, instance: Model, action: str, reverse: bool, pk_set: set | None, **_
+):
+    """Invalidate user identity when group or role memberships change"""
+    if not reverse:
+        if action.startswith("post_"):
+            instance.clear_identity()
+            _clear_cached_identities({instance.pk})
+        return
+    # Changed from the group or role side, `pk_set` is None when clearing, in which case the
+    # members are only known before
+    if action == "pre_clear" and IDENTITY_CACHE_TIMEOUT > 0:
+        _clear_cached_identities(set(instance.users.values_list("pk", flat=True)))
+    elif action in ("post_add", "post_remove"):
+        _clear_cached_identities(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.roles.through)
+@receiver(m2m_changed, sender=Group.parents.through)
+def group_identity_m2m_changed(
+    sender, instance: Model, action: str, reverse: bool, pk_set: set | None, **_
+):
+    """Invalidate identities of affected users when groups' roles or parents change"""
+    if action in ("post_add", "post_remove"):
+        # Roles or parents of a group changed, or groups of a role or children of a group
+        _clear_cached_group_identities(pk_set if reverse else {instance.pk})
+    elif action == "pre_clear":
+        if not reverse:
+            _clear_cached_group_identities({instance.pk})
+        elif IDENTITY_CACHE_TIMEOUT > 0:
+            related = instance.groups if sender is Group.roles.through else instance.children
+            _clear_cached_group_identities(set(related.values_list("pk", flat=True)))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_identity_changed(sender, instance: Group, created: bool = False, **_):
+    """Invalidate identities of affected users when a group's superuser status might have
+    changed, or it's deleted"""
+    if not created:
+        _clear_cached_group_identities({instance.pk})
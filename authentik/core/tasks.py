@@ -1,10 +1,13 @@
 """authentik core tasks"""
 
 from datetime import datetime, timedelta
+from time import perf_counter
 
+from django.db.models import Model
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
-from django_channels_postgres.models import GroupChannel, Message
+from django_channels_postgres.models import GroupChannel, GroupMessage, Message
+from django_postgres_cache.models import CacheEntry
 from django_postgres_cache.tasks import clear_expired_cache
 from dramatiq.actor import actor
 from structlog.stdlib import get_logger
@@ -12,36 +15,56 @@ from structlog.stdlib import get_logger
 from authentik.core.models import (
     USER_ATTRIBUTE_EXPIRES,
     USER_ATTRIBUTE_GENERATED,
+    EffectiveObjectPermission,
     ExpiringModel,
     User,
 )
-from authentik.lib.utils.db import chunked_queryset
+from authentik.events.models import Event
+from authentik.events.partitioning import get_event_dropped_ranges
+from authentik.lib.utils.db import chunked_queryset, delete_batched, raw_delete_batched
 from authentik.tasks.middleware import CurrentTask
+from authentik.tasks.models import Task
 
 LOGGER = get_logger()
 
 
+def _expired(self: Task, model: type[Model], amount: int, start: float):
+    duration = perf_counter() - start
+    rate = amount / duration if duration else 0
+    LOGGER.debug("Expired models", model=model, amount=amount, duration=duration)
+    self.info(
+        f"Expired {amount} {model._meta.verbose_name_plural} in {duration:.2f}s ({rate:.0f}/s)"
+    )
+
+
 @actor(description=_("Remove expired objects."))
 def clean_expired_models():
     self = CurrentTask.get_task()
     for cls in ExpiringModel.__subclasses__():
         cls: ExpiringModel
+        start = perf_counter()
         objects = (
             cls.objects.all().exclude(expiring=False).exclude(expiring=True, expires__gt=now())
         )
-        amount = objects.count()
-        for obj in chunked_queryset(objects):
-            obj.expire_action()
-        LOGGER.debug("Expired models", model=cls, amount=amount)
-        self.info(f"Expired {amount} {cls._meta.verbose_name_plural}")
-    clear_expired_cache()
-    for cls in [Message, GroupChannel]:
-        objects = cls.objects.all().filter(expires__lt=now())
-        amount = objects.count()
-        for obj in chunked_queryset(objects):
-            obj.delete()
-        LOGGER.debug("Expired models", model=cls, amount=amount)
-        self.info(f"Expired {amount} {cls._meta.verbose_name_plural}")
+        if cls is Event:
+            # Events of partitions which can be dropped are removed with the whole partition
+            for range_start, range_end in get_event_dropped_ranges():
+                objects = objects.exclude(created__gte=range_start, created__lt=range_end)
+        if cls.expire_action is not ExpiringModel.expire_action:
+            amount = objects.count()
+            for obj in chunked_queryset(objects):
+                obj.expire_action()
+        elif cls.expire_in_bulk:
+            amount = raw_delete_batched(objects)
+        else:
+            amount = delete_batched(objects)
+        _expired(self, cls, amount, start)
+    start = perf_counter()
+    _expired(self, CacheEntry, clear_expired_cache(), start)
+    for cls in [Message, GroupMessage, GroupChannel]:
+        start = perf_counter()
+        amount = raw_delete_batched(cls.objects.all().filter(expires__lt=now()))
+        _expired(self, cls, amount, start)
 
 
 @actor(description=_("Remove temporary users created by SAML Sources."))
@@ -60,3 +83,11 @@ def clean_temporary_users():
             user.delete()
             deleted_users += 1
     self.info(f"Successfully deleted {deleted_users} users.")
+
+
+@actor(description=_("Rebuild effective object permissions of all users."))
+def rebuild_effective_permissions():
+    self = CurrentTask.get_task()
+    start = perf_counter()
+    EffectiveObjectPermission.rebuild()
+    self.info(f"Rebuilt effective object permissions in {perf_counter() - start:.2f}s")
@@ -0,0 +1,82 @@
+"""Effective object permission tests"""
+
+from django.test.testcases import TestCase
+from guardian.shortcuts import get_objects_for_user
+
+from authentik.core.models import Application, EffectiveObjectPermission, Group
+from authentik.core.tasks import rebuild_effective_permissions
+from authentik.core.tests.utils import create_test_user
+from authentik.lib.generators import generate_id
+from authentik.rbac.models import Role
+
+
+class TestEffectiveObjectPermissions(TestCase):
+    """Test effective object permissions"""
+
+    def setUp(self) -> None:
+        self.user = create_test_user()
+        self.app = Application.objects.create(name=generate_id(), slug=generate_id())
+        self.role = Role.objects.create(name=generate_id())
+        self.role.assign_perms("authentik_core.view_application", self.app)
+
+    def _effective(self) -> set[str]:
+        return set(
+            EffectiveObjectPermission.objects.filter(
+                user=self.user, object_pk=str(self.app.pk)
+            ).values_list("permission__codename", flat=True)
+        )
+
+    def test_user_role(self):
+        """Test permissions of directly assigned roles"""
+        self.assertEqual(self._effective(), set())
+        self.user.roles.add(self.role)
+        self.assertEqual(self._effective(), {"view_application"})
+        self.role.assign_perms("authentik_core.change_application", self.app)
+        self.assertEqual(self._effective(), {"view_application", "change_application"})
+        self.role.remove_perms("authentik_core.view_application", self.app)
+        self.assertEqual(self._effective(), {"change_application"})
+        self.user.roles.remove(self.role)
+        self.assertEqual(self._effective(), set())
+
+    def test_group_ancestry(self):
+        """Test permissions of roles of groups and their ancestors"""
+        parent = Group.objects.create(name=generate_id())
+        child = Group.objects.create(name=generate_id())
+        parent.roles.add(self.role)
+        child.users.add(self.user)
+        self.assertEqual(self._effective(), set())
+        child.parents.add(parent)
+        self.assertEqual(self._effective(), {"view_application"})
+        self.assertEqual(
+            list(get_objects_for_user(self.user, "authentik_core.view_application")), [self.app]
+        )
+        child.parents.remove(parent)
+        self.assertEqual(self._effective(), set())
+        self.assertEqual(
+            list(get_objects_for_user(self.user, "authentik_core.view_application")), []
+        )
+
+    def test_multiple_roles(self):
+        """Test permissions granted by multiple roles are kept until all are removed"""
+        group = Group.objects.create(name=generate_id())
+        group.roles.add(self.role)
+        group.users.add(self.user)
+        self.user.assign_perms_to_managed_role("authentik_core.view_application", self.app)
+        group.roles.remove(self.role)
+        self.assertEqual(self._effective(), {"view_application"})
+        self.user.remove_perms_from_managed_role("authentik_core.view_application", self.app)
+        self.assertEqual(self._effective(), set())
+
+    def test_rebuild(self):
+        """Test full rebuild"""
+        self.user.roles.add(self.role)
+        EffectiveObjectPermission.objects.all().delete()
+        EffectiveObjectPermission.rebuild()
+        self.assertEqual(self._effective(), {"view_application"})
+
+    def test_rebuild_task(self):
+        """Test drifted permissions are recovered by the periodic rebuild"""
+        self.user.roles.add(self.role)
+        EffectiveObjectPermission.objects.all().delete()
+        rebuild_effective_permissions.send()
+        self.assertEqual(self._effective(), {"view_application"})
@@ -1,9 +1,13 @@
 """group tests"""
 
+from unittest.mock import patch
+
+from django.core.cache import cache
 from django.test.testcases import TestCase
 
-from authentik.core.models import Group, User
+from authentik.core.models import Group, GroupAncestryNode, User, UserIdentity
 from authentik.lib.generators import generate_id
+from authentik.rbac.models import Role
 
 
 class TestGroups(TestCase):
@@ -62,6 +66,115 @@ class TestGroups(TestCase):
         self.assertTrue(group.is_member(user))
         self.assertTrue(group2.is_member(user))
 
+    def test_group_ancestry_incremental(self):
+        """Test group ancestry is updated when parents change"""
+        root = Group.objects.create(name=generate_id())
+        parent = Group.objects.create(name=generate_id())
+        child = Group.objects.create(name=generate_id())
+        other = Group.objects.create(name=generate_id())
+        child.parents.add(parent)
+        parent.parents.add(root)
+        child.parents.add(other)
+        self.assertEqual(
+            set(Group.objects.filter(pk=child.pk).with_ancestors()), {child, parent, root, other}
+        )
+        self.assertEqual(
+            set(Group.objects.filter(pk=root.pk).with_descendants()), {root, parent, child}
+        )
+        parent.parents.remove(root)
+        self.assertEqual(
+            set(Group.objects.filter(pk=child.pk).with_ancestors()), {child, parent, other}
+        )
+        self.assertEqual(set(Group.objects.filter(pk=root.pk).with_descendants()), {root})
+        parent.delete()
+        self.assertEqual(set(Group.objects.filter(pk=child.pk).with_ancestors()), {child, other})
+
+    def test_group_ancestry_deferred(self):
+        """Test deferred group ancestry rebuild"""
+        parent = Group.objects.create(name=generate_id())
+        child = Group.objects.create(name=generate_id())
+        with GroupAncestryNode.deferred():
+            child.parents.add(parent)
+            self.assertFalse(GroupAncestryNode.objects.filter(descendant=child).exists())
+            with GroupAncestryNode.deferred():
+                child.parents.add(Group.objects.create(name=generate_id()))
+            self.assertFalse(GroupAncestryNode.objects.filter(descendant=child).exists())
+        self.assertTrue(
+            GroupAncestryNode.objects.filter(descendant=child, ancestor=parent).exists()
+        )
+        self.assertEqual(GroupAncestryNode.objects.filter(descendant=child).count(), 2)
+        # Changes after the block are applied incrementally again
+        child.parents.remove(parent)
+        self.assertFalse(
+            GroupAncestryNode.objects.filter(descendant=child, ancestor=parent).exists()
+        )
+
+    def test_user_identity(self):
+        """Test user identity snapshot"""
+        user = User.objects.create(username=generate_id())
+        parent = Group.objects.create(name=generate_id(), is_superuser=True)
+        group = Group.objects.create(name=generate_id())
+        group.parents.add(parent)
+        role = Role.objects.create(name=generate_id())
+        parent.roles.add(role)
+        direct_role = Role.objects.create(name=generate_id())
+        user.roles.add(direct_role)
+        user.groups.add(group)
+        with self.assertNumQueries(1):
+            identity = user.identity
+            self.assertTrue(user.is_superuser)
+        self.assertEqual(identity.group_pks, {group.pk})
+        self.assertEqual(identity.all_group_pks, {group.pk, parent.pk})
+        self.assertEqual(identity.role_pks, {role.pk, direct_role.pk})
+        user.groups.remove(group)
+        self.assertEqual(user.identity.all_group_pks, set())
+        self.assertFalse(user.is_superuser)
+
+    @patch("authentik.core.models.IDENTITY_CACHE_TIMEOUT", 60)
+    @patch("authentik.core.signals.IDENTITY_CACHE_TIMEOUT", 60)
+    def test_user_identity_cached(self):
+        """Test cached identities are only cleared for affected users"""
+        user = User.objects.create(username=generate_id())
+        other = User.objects.create(username=generate_id())
+        parent = Group.objects.create(name=generate_id())
+        group = Group.objects.create(name=generate_id())
+        role = Role.objects.create(name=generate_id())
+        group.users.add(user)
+
+        def cached(user: User) -> bool:
+            """Resolve the identity of `user`, and check it's cached"""
+            identity = User.objects.get(pk=user.pk).identity
+            return cache.get(UserIdentity.cache_key(user.pk)) == identity
+
+        self.assertTrue(cached(user))
+        self.assertTrue(cached(other))
+        group.parents.add(parent)
+        self.assertIsNone(cache.get(UserIdentity.cache_key(user.pk)))
+        self.assertIsNotNone(cache.get(UserIdentity.cache_key(other.pk)))
+        self.assertEqual(User.objects.get(pk=user.pk).identity.all_group_pks, {group.pk, parent.pk})
+
+        self.assertTrue(cached(user))
+        role.groups.add(parent)
+        self.assertIsNone(cache.get(UserIdentity.cache_key(user.pk)))
+        self.assertIsNotNone(cache.get(UserIdentity.cache_key(other.pk)))
+        self.assertEqual(User.objects.get(pk=user.pk).identity.role_pks, {role.pk})
+
+        self.assertTrue(cached(user))
+        parent.users.add(other)
+        self.assertIsNotNone(cache.get(UserIdentity.cache_key(user.pk)))
+        self.assertIsNone(cache.get(UserIdentity.cache_key(other.pk)))
+
+        self.assertTrue(cached(other))
+        group.users.clear()
+        self.assertIsNone(cache.get(UserIdentity.cache_key(user.pk)))
+        self.assertIsNotNone(cache.get(UserIdentity.cache_key(other.pk)))
+
+        self.assertTrue(cached(other))
+        parent.is_superuser = True
+        parent.save()
+        self.assertIsNone(cache.get(UserIdentity.cache_key(other.pk)))
+        self.assertTrue(User.objects.get(pk=other.pk).is_superuser)
+
     def test_group_managed_role(self):
         """Test group managed role"""
         perm = "authentik_core.view_user"
@@ -0,0 +1,136 @@
+"""Test session store"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from authentik.core.models import AuthenticatedSession, Session
+from authentik.core.sessions import SessionStore, session_cache_prefix
+from authentik.core.tests.utils import create_test_user
+from authentik.lib.config import CONFIG
+from authentik.lib.generators import generate_id
+from authentik.tenants.resolver import RESOLVER
+
+
+class TestSessionStore(TestCase):
+    """Test session store"""
+
+    def _create_session(self) -> SessionStore:
+        store = SessionStore(last_ip="127.0.0.1")
+        store["foo"] = "bar"
+        store.create()
+        return SessionStore(store.session_key)
+
+    @CONFIG.patch("sessions.coalesce_interval", 60)
+    def test_coalesce(self):
+        """Test saving sessions that didn't change is skipped"""
+        store = self._create_session()
+        last_used = Session.objects.get(session_key=store.session_key).last_used
+        store["foo"] = "bar"
+        store.save()
+        self.assertEqual(Session.objects.get(session_key=store.session_key).last_used, last_used)
+        store["foo"] = "baz"
+        store.save()
+        session = Session.objects.get(session_key=store.session_key)
+        self.assertGreater(session.last_used, last_used)
+        self.assertEqual(SessionStore(store.session_key)["foo"], "baz")
+
+    def test_coalesce_disabled(self):
+        """Test sessions are always saved by default"""
+        store = self._create_session()
+        last_used = Session.objects.get(session_key=store.session_key).last_used
+        store["foo"] = "bar"
+        store.save()
+        self.assertGreater(Session.objects.get(session_key=store.session_key).last_used, last_used)
+
+    @CONFIG.patch("sessions.cache_timeout", 5)
+    def test_invalidate(self):
+        """Test changed and deleted sessions are dropped from the cache"""
+        store = self._create_session()
+        with patch("authentik.core.sessions.RESOLVER") as resolver:
+            store["foo"] = "baz"
+            store.save()
+            resolver.invalidate.assert_called_with(f"{session_cache_prefix()}{store.session_key}")
+            resolver.reset_mock()
+            store.delete()
+            resolver.invalidate.assert_called_with(f"{session_cache_prefix()}{store.session_key}")
+
+    @CONFIG.patch("sessions.cache_timeout", 5)
+    def test_invalidate_user(self):
+        """Test only the sessions of a changed user are dropped from the cache"""
+        user = create_test_user()
+        store = self._create_session()
+        AuthenticatedSession.objects.create(
+            session=Session.objects.get(session_key=store.session_key), user=user
+        )
+        with patch("authentik.core.sessions.RESOLVER") as resolver:
+            user.save()
+            resolver.invalidate_many.assert_called_once()
+            self.assertEqual(
+                list(resolver.invalidate_many.call_args.args[0]),
+                [f"{session_cache_prefix()}{store.session_key}"],
+            )
+            resolver.reset_mock()
+            create_test_user().save()
+            resolver.invalidate_many.assert_not_called()
+
+
+class TestSessionStoreCache(TestCase):
+    """Test sessions are cached in-process"""
+
+    def setUp(self):
+        # Entries are only cached once this process listens for invalidations
+        RESOLVER._ready()
+        self.assertTrue(RESOLVER._listener.ready.wait(10))
+
+    def tearDown(self):
+        RESOLVER.clear()
+
+    def _create_session(self) -> str:
+        store = SessionStore(last_ip="127.0.0.1")
+        store["foo"] = "bar"
+        store.create()
+        return store.session_key
+
+    @CONFIG.patch("sessions.cache_timeout", 5)
+    def test_cached(self):
+        """Test sessions are only loaded from the database once"""
+        session_key = self._create_session()
+        self.assertEqual(SessionStore(session_key)["foo"], "bar")
+        self.assertIsNotNone(RESOLVER.lookup(f"{session_cache_prefix()}{session_key}"))
+        with self.assertNumQueries(0):
+            store = SessionStore(session_key)
+            self.assertEqual(store["foo"], "bar")
+        # Changes to the loaded session aren't shared with other requests
+        store["foo"] = "baz"
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session_key)["foo"], "bar")
+
+    @CONFIG.patch("sessions.cache_timeout", 5)
+    def test_cached_expired(self):
+        """Test cached sessions are checked for expiry"""
+        session_key = self._create_session()
+        self.assertEqual(SessionStore(session_key)["foo"], "bar")
+        expires = Session.objects.get(session_key=session_key).expires
+        with patch(
+            "authentik.core.sessions.timezone.now", return_value=expires + timedelta(seconds=1)
+        ):
+            store = SessionStore(session_key)
+            self.assertNotIn("foo", store)
+            self.assertIsNone(store.session_key)
+
+    @CONFIG.patch("sessions.cache_timeout", 5)
+    def test_cached_user(self):
+        """Test cached sessions are dropped when their user changes"""
+        user = create_test_user()
+        session_key = self._create_session()
+        AuthenticatedSession.objects.create(
+            session=Session.objects.get(session_key=session_key), user=user
+        )
+        store = SessionStore(session_key)
+        self.assertEqual(store["authenticatedsession"].user.name, user.name)
+        user.name = generate_id()
+        user.save()
+        self.assertIsNone(RESOLVER.lookup(f"{session_cache_prefix()}{session_key}"))
+        self.assertEqual(SessionStore(session_key)["authenticatedsession"].user.name, user.name)
@@ -1,5 +1,6 @@
 """Test tasks"""
 
+from datetime import timedelta
 from time import mktime
 
 from django.utils.timezone import now
@@ -18,7 +19,11 @@ from authentik.core.tasks import (
     clean_temporary_users,
 )
 from authentik.core.tests.utils import create_test_admin_user
+from authentik.events.models import Event, EventAction
+from authentik.events.partitioning import get_event_partitions, month_start
 from authentik.lib.generators import generate_id
+from authentik.lib.utils.db import delete_batched, raw_delete_batched
+from authentik.policies.reputation.models import Reputation
 
 
 class TestTasks(APITestCase):
@@ -40,6 +45,47 @@ class TestTasks(APITestCase):
         token.refresh_from_db()
         self.assertNotEqual(key, token.key)
 
+    def test_expire_events(self):
+        """Test expired events are deleted while monthly partitions exist"""
+        self.assertTrue(
+            any(part.start and part.end for part in get_event_partitions()),
+        )
+        expired = Event.new(EventAction.CUSTOM_PREFIX)
+        expired.save()
+        kept = Event.new(EventAction.CUSTOM_PREFIX)
+        kept.save()
+        # Both events are in a partition which can't be dropped yet
+        Event.objects.filter(pk__in=[expired.pk, kept.pk]).update(created=month_start(now(), 1))
+        Event.objects.filter(pk=expired.pk).update(expires=now() - timedelta(hours=1))
+        clean_expired_models.send()
+        self.assertFalse(Event.objects.filter(pk=expired.pk).exists())
+        self.assertTrue(Event.objects.filter(pk=kept.pk).exists())
+
+    def test_expire_in_bulk(self):
+        """Test expiry of models that are deleted in bulk"""
+        identifier = generate_id()
+        Reputation.objects.create(
+            identifier=identifier, ip="127.0.0.1", expires=now() - timedelta(hours=1)
+        )
+        Reputation.objects.create(
+            identifier=identifier, ip="127.0.0.2", expires=now() + timedelta(hours=1)
+        )
+        clean_expired_models.send()
+        self.assertEqual(
+            list(Reputation.objects.filter(identifier=identifier).values_list("ip", flat=True)),
+            ["127.0.0.2"],
+        )
+
+    def test_delete_batched(self):
+        """Test batched deletes"""
+        identifier = generate_id()
+        for idx in range(5):
+            Reputation.objects.create(identifier=identifier, ip=f"127.0.0.{idx}")
+        queryset = Reputation.objects.filter(identifier=identifier)
+        self.assertEqual(delete_batched(queryset.filter(ip__in=["127.0.0.0", "127.0.0.1"]), 1), 2)
+        self.assertEqual(raw_delete_batched(queryset, 2), 3)
+        self.assertFalse(queryset.exists())
+
     def test_clean_temporary_users(self):
         """Test clean_temporary_users task"""
         username = generate_id
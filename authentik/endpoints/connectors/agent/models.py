@@ -150,6 +150,8 @@ class EnrollmentToken(ExpiringModel, SerializerModel):
 
 class DeviceAuthenticationToken(InternallyManagedMixin, ExpiringModel):
 
+    expire_in_bulk = True
+
     identifier = models.UUIDField(default=uuid4, primary_key=True)
     device = models.ForeignKey(Device, on_delete=models.CASCADE)
     device_token = models.ForeignKey(DeviceToken, on_delete=models.CASCADE)
@@ -166,6 +168,8 @@ class DeviceAuthenticationToken(InternallyManagedMixin, ExpiringModel):
 
 
 class AppleNonce(InternallyManagedMixin, ExpiringModel):
+    expire_in_bulk = True
+
     nonce = models.TextField()
     device_token = models.ForeignKey(DeviceToken, on_delete=models.CASCADE)
 
@@ -1,19 +1,16 @@
 """Enterprise audit middleware"""
 
 from copy import deepcopy
-from functools import partial
 from typing import Any
 
 from django.apps.registry import apps
 from django.core.files import File
-from django.db import connection
 from django.db.models import ManyToManyRel, Model
 from django.db.models.expressions import BaseExpression, Combinable
-from django.db.models.signals import post_init
 from django.http import HttpRequest
 
 from authentik.enterprise.audit.apps import AuditIncludeExpandedDiff
-from authentik.events.middleware import AuditMiddleware, should_log_model
+from authentik.events.middleware import _CTX_IGNORE, AuditMiddleware, should_log_model
 from authentik.events.utils import cleanse_dict, sanitize_item
 
 
@@ -25,26 +22,6 @@ class EnterpriseAuditMiddleware(AuditMiddleware):
         """Check if audit logging is enabled"""
         return apps.get_app_config("authentik_enterprise").enabled()
 
-    def connect(self, request: HttpRequest):
-        super().connect(request)
-        if not self.enabled:
-            return
-        if not hasattr(request, "request_id"):
-            return
-        post_init.connect(
-            partial(self.post_init_handler, request=request),
-            dispatch_uid=request.request_id,
-            weak=False,
-        )
-
-    def disconnect(self, request: HttpRequest):
-        super().disconnect(request)
-        if not self.enabled:
-            return
-        if not hasattr(request, "request_id"):
-            return
-        post_init.disconnect(dispatch_uid=request.request_id)
-
     def serialize_simple(self, model: Model) -> dict:
         """Serialize a model in a very simple way. No ForeignKeys or other relationships are
         resolved"""
@@ -81,17 +58,39 @@ class EnterpriseAuditMiddleware(AuditMiddleware):
                 diff[key] = {"previous_value": before.get(key), "new_value": value}
         return sanitize_item(diff)
 
-    def post_init_handler(self, request: HttpRequest, sender, instance: Model, **_):
-        """post_init django model handler"""
-        if not should_log_model(instance):
+    def pre_save_handler(
+        self,
+        request: HttpRequest,
+        sender,
+        instance: Model,
+        raw: bool = False,
+        update_fields: frozenset[str] | None = None,
+        **_,
+    ):
+        """Snapshot the stored state of models which are about to be updated"""
+        if not self.enabled or raw:
+            return
+        if instance._state.adding or not should_log_model(instance):
             return
-        if hasattr(instance, "_previous_state"):
+        if _CTX_IGNORE.get():
             return
-        before = len(connection.queries)
-        instance._previous_state = self.serialize_simple(instance)
-        after = len(connection.queries)
-        if after > before:
-            raise AssertionError("More queries generated by serialize_simple")
+        deferred_fields = instance.get_deferred_fields()
+        fields = [
+            field.name
+            for field in instance._meta.concrete_fields
+            if field.attname not in deferred_fields
+            and (not update_fields or field.name in update_fields or field.attname in update_fields)
+        ]
+        if not fields:
+            return
+        previous = (
+            sender._base_manager.using(instance._state.db)
+            .filter(pk=instance.pk)
+            .only(*fields)
+            .first()
+        )
+        if previous is not None:
+            instance._previous_state = self.serialize_simple(previous)
 
     def post_save_handler(
         self,
@@ -109,7 +108,7 @@ class EnterpriseAuditMiddleware(AuditMiddleware):
             return None
         thread_kwargs = {}
         if hasattr(instance, "_previous_state") or created:
-            prev_state = getattr(instance, "_previous_state", {})
+            prev_state = instance.__dict__.pop("_previous_state", {})
             if created:
                 prev_state = {}
             # Get current state
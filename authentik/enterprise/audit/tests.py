@@ -130,6 +130,20 @@ class TestEnterpriseAudit(APITestCase):
             },
         )
 
+    @patch(
+        "authentik.enterprise.audit.middleware.EnterpriseAuditMiddleware.enabled",
+        PropertyMock(return_value=True),
+    )
+    def test_read(self):
+        """Test that reading models does not snapshot them"""
+        self.client.force_login(self.user)
+        with patch(
+            "authentik.enterprise.audit.middleware.EnterpriseAuditMiddleware.serialize_simple"
+        ) as serialize_simple:
+            response = self.client.get(reverse("authentik_api:user-list"))
+        self.assertEqual(response.status_code, 200)
+        serialize_simple.assert_not_called()
+
     @patch(
         "authentik.enterprise.audit.middleware.EnterpriseAuditMiddleware.enabled",
         PropertyMock(return_value=True),
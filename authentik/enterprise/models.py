@@ -84,6 +84,8 @@ class LicenseUsageStatus(models.TextChoices):
 class LicenseUsage(InternallyManagedMixin, ExpiringModel):
     """a single license usage record"""
 
+    expire_in_bulk = True
+
     expires = models.DateTimeField(default=usage_expiry)
 
     usage_uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)
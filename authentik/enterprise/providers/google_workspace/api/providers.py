@@ -39,6 +39,7 @@ class GoogleWorkspaceProviderSerializer(EnterpriseRequiredMixin, ProviderSeriali
             "default_group_email_domain",
             "sync_page_size",
             "sync_page_timeout",
+            "sync_page_concurrency",
             "dry_run",
         ]
         extra_kwargs = {}
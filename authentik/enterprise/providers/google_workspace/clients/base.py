@@ -1,13 +1,20 @@
+from threading import local
+
 from django.db.models import Model
 from django.http import HttpResponseBadRequest, HttpResponseNotFound
 from google.auth.exceptions import GoogleAuthError, TransportError
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import Error, HttpError
-from googleapiclient.http import HttpRequest
-from httplib2 import HttpLib2Error, HttpLib2ErrorWithResponse
+from googleapiclient.http import HttpRequest, build_http
+from httplib2 import Http, HttpLib2Error, HttpLib2ErrorWithResponse
 
 from authentik.enterprise.providers.google_workspace.models import GoogleWorkspaceProvider
-from authentik.lib.sync.outgoing import HTTP_CONFLICT
+from authentik.lib.sync.outgoing import (
+    HTTP_CONFLICT,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
@@ -15,6 +22,7 @@ from authentik.lib.sync.outgoing.exceptions import (
     NotFoundSyncException,
     ObjectExistsSyncException,
     StopSync,
+    ThrottledSyncException,
     TransientSyncException,
 )
 
@@ -28,12 +36,15 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
 
     def __init__(self, provider: GoogleWorkspaceProvider) -> None:
         super().__init__(provider)
+        credentials = provider.google_credentials()
         self.directory_service = build(
             "admin",
             "directory_v1",
             cache_discovery=False,
-            **provider.google_credentials(),
+            **credentials,
         )
+        self._credentials = credentials.get("credentials")
+        self._local = local()
         self.__prefetch_domains()
 
     def __prefetch_domains(self):
@@ -46,8 +57,17 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
     def _request(self, request: HttpRequest):
         if self.provider.dry_run and request.method.upper() not in SAFE_METHODS:
             raise DryRunRejected(request.uri, request.method, request.body)
+
+        def send():
+            try:
+                return request.execute(http=self._http())
+            except HttpError as exc:
+                if exc.status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+                    raise ThrottledSyncException(exc, exc.resp.get("retry-after")) from exc
+                raise
+
         try:
-            response = request.execute()
+            response = self.limiter.send(send)
         except GoogleAuthError as exc:
             if isinstance(exc, TransportError):
                 raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
@@ -63,6 +83,17 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
             raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
         return response
 
+    def _http(self) -> Http | None:
+        """HTTP client for the current thread when objects are synced concurrently, as
+        httplib2 clients can't be shared between threads. Each thread keeps its connection
+        alive for its following requests."""
+        if self.provider.sync_page_concurrency == 1 or not self._credentials:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self._credentials, http=build_http())
+        return http
+
     def _response_handle_status_code(self, request: dict, status_code: int, root_exc: Exception):
         if status_code == HttpResponseNotFound.status_code:
             raise NotFoundSyncException("Object not found") from root_exc
@@ -10,7 +10,7 @@ from authentik.enterprise.providers.google_workspace.models import (
     GoogleWorkspaceProviderUser,
 )
 from authentik.lib.sync.mapper import PropertyMappingManager
-from authentik.lib.sync.outgoing.base import Direction
+from authentik.lib.sync.outgoing.base import Direction, WriteResult
 from authentik.lib.sync.outgoing.exceptions import (
     NotFoundSyncException,
     ObjectExistsSyncException,
@@ -52,9 +52,9 @@ class GoogleWorkspaceGroupClient(
         if self.provider.group_delete_action == OutgoingSyncDeleteAction.DELETE:
             return self._request(self.directory_service.groups().delete(groupKey=identifier))
 
-    def create(self, group: Group):
+    def create(self, group: Group, schema: dict | None = None):
         """Create group from scratch and create a connection object"""
-        google_group = self.to_schema(group, None)
+        google_group = schema or self.to_schema(group, None)
         self.check_email_valid(google_group["email"])
         with transaction.atomic():
             try:
@@ -80,9 +80,11 @@ class GoogleWorkspaceGroupClient(
                     attributes=response,
                 )
 
-    def update(self, group: Group, connection: GoogleWorkspaceProviderGroup):
+    def update(
+        self, group: Group, connection: GoogleWorkspaceProviderGroup, schema: dict | None = None
+    ):
         """Update existing group"""
-        google_group = self.to_schema(group, connection)
+        google_group = schema or self.to_schema(group, connection)
         self.check_email_valid(google_group["email"])
         try:
             response = self._request(
@@ -97,10 +99,19 @@ class GoogleWorkspaceGroupClient(
             # Resource missing is handled by self.write, which will re-create the group
             raise
 
-    def write(self, obj: Group):
-        google_group, created = super().write(obj)
-        self.create_sync_members(obj, google_group)
-        return google_group, created
+    def write(self, obj: Group, force: bool = False):
+        google_group, result = super().write(obj, force=force)
+        # Members are part of the schema hash, so skipped groups have no membership changes
+        if result in (WriteResult.created, WriteResult.updated):
+            self.create_sync_members(obj, google_group)
+        return google_group, result
+
+    def schema_hash(self, obj: Group, schema: dict) -> str:
+        # Members are synced separately, include them so that membership changes aren't skipped
+        members = GoogleWorkspaceProviderUser.objects.filter(
+            provider=self.provider, user__pk__in=obj.users.values("pk")
+        ).values_list("google_id", flat=True)
+        return super().schema_hash(obj, {**schema, "members": sorted(members)})
 
     def create_sync_members(self, obj: Group, google_group: GoogleWorkspaceProviderGroup):
         """Sync all members after a group was created"""
@@ -47,9 +47,9 @@ class GoogleWorkspaceUserClient(GoogleWorkspaceSyncClient[User, GoogleWorkspaceP
                 self.directory_service.users().update(userKey=identifier, body={"suspended": True})
             )
 
-    def create(self, user: User):
+    def create(self, user: User, schema: dict | None = None):
         """Create user from scratch and create a connection object"""
-        google_user = self.to_schema(user, None)
+        google_user = schema or self.to_schema(user, None)
         self.check_email_valid(
             google_user["primaryEmail"], *[x["address"] for x in google_user.get("emails", [])]
         )
@@ -71,9 +71,11 @@ class GoogleWorkspaceUserClient(GoogleWorkspaceSyncClient[User, GoogleWorkspaceP
                     attributes=response,
                 )
 
-    def update(self, user: User, connection: GoogleWorkspaceProviderUser):
+    def update(
+        self, user: User, connection: GoogleWorkspaceProviderUser, schema: dict | None = None
+    ):
         """Update existing user"""
-        google_user = self.to_schema(user, connection)
+        google_user = schema or self.to_schema(user, connection)
         self.check_email_valid(
             google_user["primaryEmail"], *[x["address"] for x in google_user.get("emails", [])]
         )
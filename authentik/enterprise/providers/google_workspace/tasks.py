@@ -17,7 +17,7 @@ def google_workspace_sync_objects(*args, **kwargs):
 @actor(description=_("Full sync for Google Workspace provider."))
 def google_workspace_sync(provider_pk: int, *args, **kwargs):
     """Run full sync for Google Workspace provider"""
-    return sync_tasks.sync(provider_pk, google_workspace_sync_objects)
+    return sync_tasks.sync(provider_pk, google_workspace_sync_objects, **kwargs)
 
 
 @actor(description=_("Sync a direct object (user, group) for Google Workspace provider."))
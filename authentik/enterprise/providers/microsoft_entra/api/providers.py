@@ -38,6 +38,7 @@ class MicrosoftEntraProviderSerializer(EnterpriseRequiredMixin, ProviderSerializ
             "group_delete_action",
             "sync_page_size",
             "sync_page_timeout",
+            "sync_page_concurrency",
             "dry_run",
         ]
         extra_kwargs = {}
@@ -27,7 +27,11 @@ from opentelemetry import trace
 
 from authentik.enterprise.providers.microsoft_entra.models import MicrosoftEntraProvider
 from authentik.events.utils import sanitize_item
-from authentik.lib.sync.outgoing import HTTP_CONFLICT
+from authentik.lib.sync.outgoing import (
+    HTTP_CONFLICT,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
@@ -35,6 +39,7 @@ from authentik.lib.sync.outgoing.exceptions import (
     NotFoundSyncException,
     ObjectExistsSyncException,
     StopSync,
+    ThrottledSyncException,
     TransientSyncException,
 )
 
@@ -95,7 +100,12 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
 
     def _request[T](self, request: Coroutine[Any, Any, T]) -> T:
         try:
-            return run(request)
+            # Coroutines can't be awaited again, throttled requests are already retried by
+            # the retry handler of the graph client
+            with self.limiter.slot():
+                response = run(request)
+            self.limiter.succeeded()
+            return response
         except ClientAuthenticationError as exc:
             raise StopSync(exc, None, None) from exc
         except ODataError as exc:
@@ -109,6 +119,12 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
                 raise BadRequestSyncException("Bad request", exc.response_headers) from exc
             if exc.response_status_code == HTTP_CONFLICT:
                 raise ObjectExistsSyncException("Object exists", exc.response_headers) from exc
+            if exc.response_status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+                headers = {
+                    key.lower(): value for key, value in (exc.response_headers or {}).items()
+                }
+                self.limiter.throttled(headers.get("retry-after"))
+                raise ThrottledSyncException(exc.response_headers) from exc
             raise exc
 
     def __prefetch_domains(self):
@@ -128,6 +144,11 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
             if not any(email.endswith(f"@{domain_name}") for domain_name in self.domains):
                 raise BadRequestSyncException(f"Invalid email domain: {email}")
 
+    def schema_hash(self, obj: TModel, schema: Entity | dict) -> str:
+        if not isinstance(schema, dict):
+            schema = self.entity_as_dict(schema)
+        return super().schema_hash(obj, schema)
+
     def entity_as_dict(self, entity: Entity) -> dict:
         """Create a dictionary of a model instance, making sure to remove (known) things
         we can't JSON serialize"""
@@ -13,7 +13,7 @@ from authentik.enterprise.providers.microsoft_entra.models import (
     MicrosoftEntraProviderUser,
 )
 from authentik.lib.sync.mapper import PropertyMappingManager
-from authentik.lib.sync.outgoing.base import Direction
+from authentik.lib.sync.outgoing.base import Direction, WriteResult
 from authentik.lib.sync.outgoing.exceptions import (
     NotFoundSyncException,
     ObjectExistsSyncException,
@@ -56,9 +56,9 @@ class MicrosoftEntraGroupClient(
         if self.provider.group_delete_action == OutgoingSyncDeleteAction.DELETE:
             return self._request(self.client.groups.by_group_id(identifier).delete())
 
-    def create(self, group: Group):
+    def create(self, group: Group, schema: MSGroup | None = None):
         """Create group from scratch and create a connection object"""
-        microsoft_group = self.to_schema(group, None)
+        microsoft_group = schema or self.to_schema(group, None)
         with transaction.atomic():
             try:
                 response = self._request(self.client.groups.post(microsoft_group))
@@ -95,9 +95,11 @@ class MicrosoftEntraGroupClient(
                     attributes=self.entity_as_dict(response),
                 )
 
-    def update(self, group: Group, connection: MicrosoftEntraProviderGroup):
+    def update(
+        self, group: Group, connection: MicrosoftEntraProviderGroup, schema: MSGroup | None = None
+    ):
         """Update existing group"""
-        microsoft_group = self.to_schema(group, connection)
+        microsoft_group = schema or self.to_schema(group, connection)
         microsoft_group.id = connection.microsoft_id
         try:
             response = self._request(
@@ -110,10 +112,19 @@ class MicrosoftEntraGroupClient(
             # Resource missing is handled by self.write, which will re-create the group
             raise
 
-    def write(self, obj: Group):
-        microsoft_group, created = super().write(obj)
-        self.create_sync_members(obj, microsoft_group)
-        return microsoft_group, created
+    def write(self, obj: Group, force: bool = False):
+        microsoft_group, result = super().write(obj, force=force)
+        # Members are part of the schema hash, so skipped groups have no membership changes
+        if result in (WriteResult.created, WriteResult.updated):
+            self.create_sync_members(obj, microsoft_group)
+        return microsoft_group, result
+
+    def schema_hash(self, obj: Group, schema: MSGroup) -> str:
+        # Members are synced separately, include them so that membership changes aren't skipped
+        members = MicrosoftEntraProviderUser.objects.filter(
+            provider=self.provider, user__pk__in=obj.users.values("pk")
+        ).values_list("microsoft_id", flat=True)
+        return super().schema_hash(obj, {**self.entity_as_dict(schema), "members": sorted(members)})
 
     def create_sync_members(self, obj: Group, microsoft_group: MicrosoftEntraProviderGroup):
         """Sync all members after a group was created"""
@@ -75,9 +75,9 @@ class MicrosoftEntraUserClient(MicrosoftEntraSyncClient[User, MicrosoftEntraProv
             "onPremisesImmutableId",
         ]
 
-    def create(self, user: User):
+    def create(self, user: User, schema: MSUser | None = None):
         """Create user from scratch and create a connection object"""
-        microsoft_user = self.to_schema(user, None)
+        microsoft_user = schema or self.to_schema(user, None)
         if microsoft_user.user_principal_name:
             self.check_email_valid(microsoft_user.user_principal_name)
         with transaction.atomic():
@@ -116,9 +116,11 @@ class MicrosoftEntraUserClient(MicrosoftEntraSyncClient[User, MicrosoftEntraProv
                     attributes=self.entity_as_dict(response),
                 )
 
-    def update(self, user: User, connection: MicrosoftEntraProviderUser):
+    def update(
+        self, user: User, connection: MicrosoftEntraProviderUser, schema: MSUser | None = None
+    ):
         """Update existing user"""
-        microsoft_user = self.to_schema(user, connection)
+        microsoft_user = schema or self.to_schema(user, connection)
         if microsoft_user.user_principal_name:
             self.check_email_valid(microsoft_user.user_principal_name)
         response = self._request(
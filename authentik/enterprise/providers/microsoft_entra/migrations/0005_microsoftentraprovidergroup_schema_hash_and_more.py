@@ -0,0 +1,26 @@
+# Generated by Django 5.2.12 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "authentik_providers_microsoft_entra",
+            "0004_microsoftentraprovider_sync_page_size_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="microsoftentraprovidergroup",
+            name="schema_hash",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="microsoftentraprovideruser",
+            name="schema_hash",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
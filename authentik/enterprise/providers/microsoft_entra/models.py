@@ -31,6 +31,7 @@ class MicrosoftEntraProviderUser(InternallyManagedMixin, SerializerModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     provider = models.ForeignKey("MicrosoftEntraProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    schema_hash = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
@@ -57,6 +58,7 @@ class MicrosoftEntraProviderGroup(InternallyManagedMixin, SerializerModel):
     group = models.ForeignKey(Group, on_delete=models.CASCADE)
     provider = models.ForeignKey("MicrosoftEntraProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    schema_hash = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
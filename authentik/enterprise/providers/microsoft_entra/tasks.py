@@ -17,7 +17,7 @@ def microsoft_entra_sync_objects(*args, **kwargs):
 @actor(description=_("Full sync for Microsoft Entra provider."))
 def microsoft_entra_sync(provider_pk: int, *args, **kwargs):
     """Run full sync for Microsoft Entra provider"""
-    return sync_tasks.sync(provider_pk, microsoft_entra_sync_objects)
+    return sync_tasks.sync(provider_pk, microsoft_entra_sync_objects, **kwargs)
 
 
 @actor(description=_("Sync a direct object (user, group) for Microsoft Entra provider."))
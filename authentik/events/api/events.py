@@ -1,10 +1,12 @@
 """Events API Views"""
 
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from datetime import timedelta
+from json import loads
 
 import django_filters
-from django.db.models import Count, ExpressionWrapper, F, QuerySet
+from django.db import connection
+from django.db.models import Count, ExpressionWrapper, F, QuerySet, Sum, Value
 from django.db.models import DateTimeField as DjangoDateTimeField
 from django.db.models.fields.json import KeyTextTransform, KeyTransform
 from django.db.models.functions import TruncHour
@@ -21,9 +23,13 @@ from rest_framework.viewsets import ModelViewSet
 
 from authentik.core.api.object_types import TypeCreateSerializer
 from authentik.core.api.utils import ModelSerializer, PassiveSerializer
-from authentik.events.models import Event, EventAction
+from authentik.events.models import Event, EventAction, EventRollup
+from authentik.events.rollups import ROLLUP_HISTORY_DAYS, get_rollup_watermark
 from authentik.lib.utils.reflection import ConditionalInheritance
 
+# Filters of the volume endpoint that can be answered from rollups
+VOLUME_ROLLUP_QUERY_PARAMS = {"history_days", "action", "actions", "context_authorized_app"}
+
 
 class EventVolumeSerializer(PassiveSerializer):
     """Count of events of action created on day"""
@@ -185,6 +191,38 @@ class EventViewSet(
             DateTimeField(Event, "created", suggest_options=True),
         ]
 
+    def _top_per_user_merged(self, rollups: QuerySet, tail: QuerySet, top_n: int) -> list[dict]:
+        """Aggregate rollups and events newer than the rollups in a single query, as unique
+        users can't be summed up per source"""
+        rollups_sql, rollups_params = rollups.query.sql_with_params()
+        tail_sql, tail_params = tail.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    application,
+                    SUM("count")::bigint AS counted_events,
+                    COUNT(DISTINCT user_pk) AS unique_users
+                FROM (
+                    SELECT application, user_pk, "count" FROM ({rollups_sql}) AS rollups
+                    UNION ALL
+                    SELECT application, user_pk, "count" FROM ({tail_sql}) AS tail
+                ) AS events
+                GROUP BY application
+                ORDER BY counted_events DESC
+                LIMIT %s
+                """,  # nosec
+                [*rollups_params, *tail_params, top_n],
+            )
+            return [
+                {
+                    "application": loads(application),
+                    "counted_events": counted_events,
+                    "unique_users": unique_users,
+                }
+                for application, counted_events, unique_users in cursor.fetchall()
+            ]
+
     @extend_schema(
         methods=["GET"],
         responses={200: EventTopPerUserSerializer(many=True)},
@@ -202,6 +240,13 @@ class EventViewSet(
                 location=OpenApiParameter.QUERY,
                 required=False,
             ),
+            OpenApiParameter(
+                "history_days",
+                type=OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                default=30,
+            ),
         ],
     )
     @action(detail=False, methods=["GET"], pagination_class=None)
@@ -209,13 +254,38 @@ class EventViewSet(
         """Get the top_n events grouped by user count"""
         filtered_action = request.query_params.get("action", EventAction.LOGIN)
         top_n = int(request.query_params.get("top_n", "15"))
+        delta = timedelta(
+            days=min(int(request.query_params.get("history_days", 30)), ROLLUP_HISTORY_DAYS)
+        )
+        since = now() - delta
         events = (
             get_objects_for_user(request.user, "authentik_events.view_event")
-            .filter(action=filtered_action)
+            # Only scan the partitions of the requested timeframe
+            .filter(action=filtered_action, created__gte=since)
             .exclude(context__authorized_application=None)
             .annotate(application=KeyTransform("authorized_application", "context"))
             .annotate(user_pk=KeyTextTransform("pk", "user"))
-            .values("application")
+        )
+        watermark = get_rollup_watermark()
+        if watermark and request.user.has_perm("authentik_events.view_event"):
+            rollups = EventRollup.objects.filter(
+                action=filtered_action,
+                bucket__gte=since,
+                bucket__lt=watermark,
+                application__isnull=False,
+            ).values("application", "user_pk", "count")
+            tail = (
+                events.filter(created__gte=watermark)
+                .annotate(count=Value(1))
+                .values("application", "user_pk", "count")
+            )
+            return Response(
+                EventTopPerUserSerializer(
+                    instance=self._top_per_user_merged(rollups, tail, top_n), many=True
+                ).data
+            )
+        events = (
+            events.values("application")
             .annotate(counted_events=Count("application"))
             .annotate(unique_users=Count("user_pk", distinct=True))
             .values("unique_users", "application", "counted_events")
@@ -223,6 +293,37 @@ class EventViewSet(
         )
         return Response(EventTopPerUserSerializer(instance=events, many=True).data)
 
+    def _volume(self, queryset: QuerySet, count: Count | Sum) -> QuerySet:
+        """Count per 6 hours and action, `queryset` must be annotated with `hour`"""
+        return (
+            queryset.annotate(
+                time=ExpressionWrapper(
+                    F("hour") - (F("hour__hour") % 6) * timedelta(hours=1),
+                    output_field=DjangoDateTimeField(),
+                )
+            )
+            .values("time", "action")
+            .annotate(count=count)
+            .order_by("time", "action")
+        )
+
+    def _get_volume_rollups(self, request: Request) -> QuerySet[EventRollup] | None:
+        """Get rollups matching the filters of `request`, if the filters can be answered
+        from rollups"""
+        if set(request.query_params.keys()) - VOLUME_ROLLUP_QUERY_PARAMS:
+            return None
+        # Rollups aren't filtered by object permissions
+        if not request.user.has_perm("authentik_events.view_event"):
+            return None
+        rollups = EventRollup.objects.all()
+        if action_filter := request.query_params.get("action"):
+            rollups = rollups.filter(action__icontains=action_filter)
+        if actions := request.query_params.getlist("actions"):
+            rollups = rollups.filter(action__in=actions)
+        if application := request.query_params.get("context_authorized_app"):
+            rollups = rollups.filter(application__pk=application)
+        return rollups
+
     @extend_schema(
         responses={200: EventVolumeSerializer(many=True)},
         parameters=[
@@ -242,19 +343,33 @@ class EventViewSet(
         delta = timedelta(days=7)
         time_delta = request.query_params.get("history_days", 7)
         if time_delta:
-            delta = timedelta(days=min(int(time_delta), 60))
-        return Response(
-            queryset.filter(created__gte=now() - delta)
-            .annotate(hour=TruncHour("created"))
-            .annotate(
-                time=ExpressionWrapper(
-                    F("hour") - (F("hour__hour") % 6) * timedelta(hours=1),
-                    output_field=DjangoDateTimeField(),
+            delta = timedelta(days=min(int(time_delta), ROLLUP_HISTORY_DAYS))
+        since = now() - delta
+        rollups = self._get_volume_rollups(request)
+        watermark = get_rollup_watermark() if rollups is not None else None
+        if not watermark:
+            return Response(
+                self._volume(
+                    queryset.filter(created__gte=since).annotate(hour=TruncHour("created")),
+                    Count("pk"),
                 )
             )
-            .values("time", "action")
-            .annotate(count=Count("pk"))
-            .order_by("time", "action")
+        counts = Counter()
+        for row in self._volume(
+            rollups.filter(bucket__gte=since, bucket__lt=watermark).annotate(hour=F("bucket")),
+            Sum("count"),
+        ):
+            counts[row["time"], row["action"]] += row["count"]
+        for row in self._volume(
+            queryset.filter(created__gte=max(since, watermark)).annotate(hour=TruncHour("created")),
+            Count("pk"),
+        ):
+            counts[row["time"], row["action"]] += row["count"]
+        return Response(
+            [
+                {"time": time, "action": action, "count": count}
+                for (time, action), count in sorted(counts.items())
+            ]
         )
 
     @extend_schema(responses={200: TypeCreateSerializer(many=True)})
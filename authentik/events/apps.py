@@ -36,13 +36,26 @@ class AuthentikEventsConfig(ManagedAppConfig):
 
     @property
     def tenant_schedule_specs(self) -> list[ScheduleSpec]:
-        from authentik.events.tasks import notification_cleanup
+        from authentik.events.tasks import (
+            event_partitions_maintenance,
+            event_rollups_update,
+            notification_cleanup,
+        )
 
         return [
             ScheduleSpec(
                 actor=notification_cleanup,
                 crontab=f"{fqdn_rand('notification_cleanup')} */8 * * *",
             ),
+            ScheduleSpec(
+                actor=event_partitions_maintenance,
+                crontab=f"{fqdn_rand('event_partitions_maintenance')} * * * *",
+                send_on_startup=True,
+            ),
+            ScheduleSpec(
+                actor=event_rollups_update,
+                crontab="*/10 * * * *",
+            ),
         ]
 
     @ManagedAppConfig.reconcile_global
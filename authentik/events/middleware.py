@@ -3,7 +3,6 @@
 from collections.abc import Callable
 from contextlib import contextmanager
 from contextvars import ContextVar
-from functools import partial
 from threading import Thread
 from typing import Any
 
@@ -11,7 +10,8 @@ from django.conf import settings
 from django.contrib.sessions.models import Session
 from django.core.exceptions import SuspiciousOperation
 from django.db.models import Model
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
 from django.http import HttpRequest, HttpResponse
 from structlog.stdlib import BoundLogger, get_logger
 
@@ -37,6 +37,9 @@ IGNORED_MODELS = tuple(
 _CTX_OVERWRITE_USER = ContextVar[User | None]("authentik_events_log_overwrite_user", default=None)
 _CTX_IGNORE = ContextVar[bool]("authentik_events_log_ignore", default=False)
 _CTX_REQUEST = ContextVar[HttpRequest | None]("authentik_events_log_request", default=None)
+_CTX_MIDDLEWARE = ContextVar["AuditMiddleware | None"](
+    "authentik_events_log_middleware", default=None
+)
 
 
 def should_log_model(model: Model) -> bool:
@@ -93,8 +96,10 @@ class EventNewThread(Thread):
 
 
 class AuditMiddleware:
-    """Register handlers for duration of request-response that log creation/update/deletion
-    of models"""
+    """Log creation/update/deletion of models during the request-response cycle
+
+    The signal receivers are connected once, and look up the active middleware and request
+    from context variables."""
 
     get_response: Callable[[HttpRequest], HttpResponse]
     anonymous_user: User = None
@@ -122,47 +127,20 @@ class AuditMiddleware:
             return self.anonymous_user
         return user
 
-    def connect(self, request: HttpRequest):
-        """Connect signal for automatic logging"""
-        if not hasattr(request, "request_id"):
-            return
-        post_save.connect(
-            partial(self.post_save_handler, request=request),
-            dispatch_uid=request.request_id,
-            weak=False,
-        )
-        pre_delete.connect(
-            partial(self.pre_delete_handler, request=request),
-            dispatch_uid=request.request_id,
-            weak=False,
-        )
-        m2m_changed.connect(
-            partial(self.m2m_changed_handler, request=request),
-            dispatch_uid=request.request_id,
-            weak=False,
-        )
-
-    def disconnect(self, request: HttpRequest):
-        """Disconnect signals"""
-        if not hasattr(request, "request_id"):
-            return
-        post_save.disconnect(dispatch_uid=request.request_id)
-        pre_delete.disconnect(dispatch_uid=request.request_id)
-        m2m_changed.disconnect(dispatch_uid=request.request_id)
-
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        _CTX_REQUEST.set(request)
-        self.connect(request)
-
-        response = self.get_response(request)
-
-        self.disconnect(request)
-        _CTX_REQUEST.set(None)
-        return response
+        if not hasattr(request, "request_id"):
+            return self.get_response(request)
+        request_token = _CTX_REQUEST.set(request)
+        middleware_token = _CTX_MIDDLEWARE.set(self)
+        try:
+            return self.get_response(request)
+        finally:
+            _CTX_MIDDLEWARE.reset(middleware_token)
+            _CTX_REQUEST.reset(request_token)
 
     def process_exception(self, request: HttpRequest, exception: Exception):
-        """Disconnect handlers in case of exception"""
-        self.disconnect(request)
+        """Stop logging model operations in case of exception"""
+        _CTX_MIDDLEWARE.set(None)
 
         if settings.DEBUG:
             return
@@ -184,6 +162,9 @@ class AuditMiddleware:
             )
             thread.run()
 
+    def pre_save_handler(self, request: HttpRequest, sender, instance: Model, **_):
+        """Signal handler for all object's pre_save"""
+
     def post_save_handler(
         self,
         request: HttpRequest,
@@ -198,9 +179,6 @@ class AuditMiddleware:
             return
         if _CTX_IGNORE.get():
             return
-        current_request = _CTX_REQUEST.get()
-        if current_request is None or request.request_id != current_request.request_id:
-            return
         user = self.get_user(request)
 
         action = EventAction.MODEL_CREATED if created else EventAction.MODEL_UPDATED
@@ -214,9 +192,6 @@ class AuditMiddleware:
             return
         if _CTX_IGNORE.get():
             return
-        current_request = _CTX_REQUEST.get()
-        if current_request is None or request.request_id != current_request.request_id:
-            return
         user = self.get_user(request)
 
         EventNewThread(
@@ -242,9 +217,6 @@ class AuditMiddleware:
             return
         if _CTX_IGNORE.get():
             return
-        current_request = _CTX_REQUEST.get()
-        if current_request is None or request.request_id != current_request.request_id:
-            return
         user = self.get_user(request)
 
         EventNewThread(
@@ -254,3 +226,31 @@ class AuditMiddleware:
             model=model_to_dict(instance),
             **thread_kwargs,
         ).run()
+
+
+@receiver(pre_save, dispatch_uid="authentik_events_audit_pre_save")
+def _audit_pre_save(sender, **kwargs):
+    if (middleware := _CTX_MIDDLEWARE.get()) is None:
+        return
+    middleware.pre_save_handler(_CTX_REQUEST.get(), sender, **kwargs)
+
+
+@receiver(post_save, dispatch_uid="authentik_events_audit_post_save")
+def _audit_post_save(sender, **kwargs):
+    if (middleware := _CTX_MIDDLEWARE.get()) is None:
+        return
+    middleware.post_save_handler(_CTX_REQUEST.get(), sender, **kwargs)
+
+
+@receiver(pre_delete, dispatch_uid="authentik_events_audit_pre_delete")
+def _audit_pre_delete(sender, **kwargs):
+    if (middleware := _CTX_MIDDLEWARE.get()) is None:
+        return
+    middleware.pre_delete_handler(_CTX_REQUEST.get(), sender, **kwargs)
+
+
+@receiver(m2m_changed, dispatch_uid="authentik_events_audit_m2m_changed")
+def _audit_m2m_changed(sender, **kwargs):
+    if (middleware := _CTX_MIDDLEWARE.get()) is None:
+        return
+    middleware.m2m_changed_handler(_CTX_REQUEST.get(), sender, **kwargs)
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.12 on 2026-10-18 12:00
+
+from datetime import UTC, datetime
+
+import django.db.models.deletion
+import psqlextra.manager.manager
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+# Months of partitions created ahead, the maintenance task takes over after this
+PARTITIONS_AHEAD = 3
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    month = value.month - 1 + offset
+    return datetime(value.year + month // 12, month % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_events(apps: Apps, schema_editor: BaseDatabaseSchemaEditor):
+    """Convert the event table into a table range-partitioned on `created`.
+
+    The existing table is attached as-is as the partition for all events created before the
+    start of next month, newer events go into monthly partitions."""
+    Event = apps.get_model("authentik_events", "event")
+    table = Event._meta.db_table
+    legacy = f"{table}_legacy"
+    qn = schema_editor.quote_name
+    cutoff = _month_start(datetime.now(UTC), 1)
+
+    schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+    # Free up the index names for the partitioned table
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT index.relname FROM pg_index "
+            "JOIN pg_class index ON index.oid = pg_index.indexrelid "
+            "WHERE pg_index.indrelid = %s::regclass",
+            [legacy],
+        )
+        for (index,) in cursor.fetchall():
+            schema_editor.execute(f"ALTER INDEX {qn(index)} RENAME TO {qn(index[:56] + '_legacy')}")
+
+    schema_editor.execute(
+        f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created)"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f'{table}_pkey')} "
+        "PRIMARY KEY (event_uuid, created)"
+    )
+    for index in Event._meta.indexes:
+        schema_editor.add_index(Event, index)
+
+    # With a matching check constraint, attaching doesn't need to scan the table again
+    check = qn(f"{legacy}_created_check")
+    schema_editor.execute(
+        f"ALTER TABLE {qn(legacy)} ADD CONSTRAINT {check} "
+        "CHECK (created IS NOT NULL AND created < %s) NOT VALID",
+        [cutoff],
+    )
+    schema_editor.execute(f"ALTER TABLE {qn(legacy)} VALIDATE CONSTRAINT {check}")
+    schema_editor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(legacy)} "
+        "FOR VALUES FROM (MINVALUE) TO (%s)",
+        [cutoff],
+    )
+    schema_editor.execute(f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {check}")
+
+    for offset in range(PARTITIONS_AHEAD):
+        start = _month_start(cutoff, offset)
+        schema_editor.execute(
+            f"CREATE TABLE {qn(f'{table}_{start:%Y_%m}')} PARTITION OF {qn(table)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [start, _month_start(start, 1)],
+        )
+    schema_editor.execute(f"CREATE TABLE {qn(f'{table}_default')} PARTITION OF {qn(table)} DEFAULT")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_events", "0017_notificationtransport_webhook_ca"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="event",
+            managers=[
+                ("objects", psqlextra.manager.manager.PostgresManager()),
+            ],
+        ),
+        # The primary key of the partitioned table includes `created`
+        migrations.AlterField(
+            model_name="notification",
+            name="event",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="authentik_events.event",
+            ),
+        ),
+        migrations.RunPython(partition_events),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.12 on 2026-10-18 12:00
+
+import uuid
+
+from django.db import migrations, models
+
+import authentik.lib.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_events", "0018_event_partitioning"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventRollup",
+            fields=[
+                ("expires", models.DateTimeField(default=None, null=True)),
+                ("expiring", models.BooleanField(default=True)),
+                (
+                    "rollup_uuid",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                (
+                    "action",
+                    models.TextField(
+                        choices=[
+                            ("login", "Login"),
+                            ("login_failed", "Login Failed"),
+                            ("logout", "Logout"),
+                            ("user_write", "User Write"),
+                            ("suspicious_request", "Suspicious Request"),
+                            ("password_set", "Password Set"),
+                            ("secret_view", "Secret View"),
+                            ("secret_rotate", "Secret Rotate"),
+                            ("invitation_used", "Invite Used"),
+                            ("authorize_application", "Authorize Application"),
+                            ("source_linked", "Source Linked"),
+                            ("impersonation_started", "Impersonation Started"),
+                            ("impersonation_ended", "Impersonation Ended"),
+                            ("flow_execution", "Flow Execution"),
+                            ("policy_execution", "Policy Execution"),
+                            ("policy_exception", "Policy Exception"),
+                            ("property_mapping_exception", "Property Mapping Exception"),
+                            ("system_task_execution", "System Task Execution"),
+                            ("system_task_exception", "System Task Exception"),
+                            ("system_exception", "System Exception"),
+                            ("configuration_error", "Configuration Error"),
+                            ("configuration_warning", "Configuration Warning"),
+                            ("model_created", "Model Created"),
+                            ("model_updated", "Model Updated"),
+                            ("model_deleted", "Model Deleted"),
+                            ("email_sent", "Email Sent"),
+                            ("update_available", "Update Available"),
+                            ("export_ready", "Export Ready"),
+                            ("review_initiated", "Review Initiated"),
+                            ("review_overdue", "Review Overdue"),
+                            ("review_attested", "Review Attested"),
+                            ("review_completed", "Review Completed"),
+                            ("custom_", "Custom Prefix"),
+                        ]
+                    ),
+                ),
+                ("application", models.JSONField(null=True)),
+                ("user_pk", models.TextField(null=True)),
+                ("count", models.BigIntegerField()),
+            ],
+            options={
+                "verbose_name": "Event Rollup",
+                "verbose_name_plural": "Event Rollups",
+                "indexes": [
+                    models.Index(fields=["expires"], name="authentik_e_expires_4c5935_idx"),
+                    models.Index(fields=["expiring"], name="authentik_e_expirin_51b8f1_idx"),
+                    models.Index(
+                        fields=["expiring", "expires"], name="authentik_e_expirin_ff354b_idx"
+                    ),
+                    models.Index(fields=["bucket", "action"], name="authentik_e_bucket_d10d5c_idx"),
+                ],
+            },
+            bases=(authentik.lib.models.InternallyManagedMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.12 on 2026-10-18 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_events", "0019_eventrollup"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="eventrollup",
+            constraint=models.UniqueConstraint(
+                fields=("bucket", "action", "application", "user_pk"),
+                name="unique_event_rollup",
+                nulls_distinct=False,
+            ),
+        ),
+    ]
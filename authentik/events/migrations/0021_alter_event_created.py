@@ -0,0 +1,19 @@
+# Generated by Django 5.2.12 on 2026-10-19 00:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_events", "0020_eventrollup_unique_event_rollup"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="event",
+            name="created",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -16,6 +16,8 @@ from django.http import HttpRequest
 from django.http.request import QueryDict
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
+from psqlextra.models import PostgresPartitionedModel
+from psqlextra.types import PostgresPartitioningMethod
 from requests import RequestException
 from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
@@ -37,7 +39,8 @@ from authentik.events.utils import (
     sanitize_dict,
     sanitize_item,
 )
-from authentik.lib.models import DomainlessURLValidator, SerializerModel
+from authentik.events.writer import get_event_writer
+from authentik.lib.models import DomainlessURLValidator, InternallyManagedMixin, SerializerModel
 from authentik.lib.sentry import SentryIgnoredException
 from authentik.lib.utils.errors import exception_to_dict
 from authentik.lib.utils.http import get_http_session
@@ -78,6 +81,17 @@ def django_app_names() -> list[str]:
     return [x.name for x in apps.app_configs.values()]
 
 
+@lru_cache(maxsize=1024)
+def django_app_for_module(module: str) -> str:
+    """Match a module to the django app it belongs to, if we can't find a match,
+    return the module name"""
+    django_apps: list[str] = get_close_matches(module, django_app_names(), n=1)
+    # Also ensure that closest django app has the correct prefix
+    if len(django_apps) > 0 and django_apps[0].startswith(module):
+        return django_apps[0]
+    return module
+
+
 class NotificationTransportError(SentryIgnoredException):
     """Error raised when a notification fails to be delivered"""
 
@@ -133,8 +147,10 @@ class EventAction(models.TextChoices):
     CUSTOM_PREFIX = "custom_"
 
 
-class Event(SerializerModel, ExpiringModel):
-    """An individual Audit/Metrics/Notification/Error Event"""
+class Event(SerializerModel, ExpiringModel, PostgresPartitionedModel):
+    """An individual Audit/Metrics/Notification/Error Event.
+
+    The table is range-partitioned by month on `created`, see `authentik.events.partitioning`."""
 
     event_uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)
     user = models.JSONField(default=dict)
@@ -142,7 +158,9 @@ class Event(SerializerModel, ExpiringModel):
     app = models.TextField()
     context = models.JSONField(default=dict, blank=True)
     client_ip = models.GenericIPAddressField(null=True)
-    created = models.DateTimeField(auto_now_add=True)
+    # Not `auto_now_add`, as that would overwrite the creation time of buffered events when
+    # they're written, see `authentik.events.writer`
+    created = models.DateTimeField(default=now, editable=False)
     brand = models.JSONField(default=default_brand, blank=True)
 
     # Shadow the expires attribute from ExpiringModel to override the default duration
@@ -166,13 +184,7 @@ class Event(SerializerModel, ExpiringModel):
         if not app:
             current = currentframe()
             parent = current.f_back
-            app = parent.f_globals["__name__"]
-            # Attempt to match the calling module to the django app it belongs to
-            # if we can't find a match, keep the module name
-            django_apps: list[str] = get_close_matches(app, django_app_names(), n=1)
-            # Also ensure that closest django app has the correct prefix
-            if len(django_apps) > 0 and django_apps[0].startswith(app):
-                app = django_apps[0]
+            app = django_app_for_module(parent.f_globals["__name__"])
         cleaned_kwargs = cleanse_dict(sanitize_dict(kwargs))
         event = Event(action=action, app=app, context=cleaned_kwargs)
         return event
@@ -247,18 +259,22 @@ class Event(SerializerModel, ExpiringModel):
         # If there's no app set, we get it from the requests too
         if not self.app:
             self.app = Event._get_app_from_request(request)
-        self.save()
+        get_event_writer().write(self)
         return self
 
+    def log_created(self):
+        """Log the creation of this event"""
+        LOGGER.info(
+            "Created Event",
+            action=self.action,
+            context=self.context,
+            client_ip=self.client_ip,
+            user=self.user,
+        )
+
     def save(self, *args, **kwargs):
         if self._state.adding:
-            LOGGER.info(
-                "Created Event",
-                action=self.action,
-                context=self.context,
-                client_ip=self.client_ip,
-                user=self.user,
-            )
+            self.log_created()
         super().save(*args, **kwargs)
 
     @property
@@ -300,6 +316,42 @@ class Event(SerializerModel, ExpiringModel):
             ),
         ]
 
+    class PartitioningMeta:
+        method = PostgresPartitioningMethod.RANGE
+        key = ["created"]
+
+
+class EventRollup(InternallyManagedMixin, ExpiringModel):
+    """Hourly count of events per action, authorized application and user,
+    maintained from the event table by `authentik.events.rollups`"""
+
+    expire_in_bulk = True
+
+    rollup_uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+
+    bucket = models.DateTimeField()
+    action = models.TextField(choices=EventAction.choices)
+    application = models.JSONField(null=True)
+    user_pk = models.TextField(null=True)
+    count = models.BigIntegerField()
+
+    def __str__(self) -> str:
+        return f"Event rollup {self.bucket} action={self.action} count={self.count}"
+
+    class Meta:
+        verbose_name = _("Event Rollup")
+        verbose_name_plural = _("Event Rollups")
+        indexes = ExpiringModel.Meta.indexes + [
+            models.Index(fields=["bucket", "action"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "action", "application", "user_pk"],
+                name="unique_event_rollup",
+                nulls_distinct=False,
+            ),
+        ]
+
 
 class TransportMode(models.TextChoices):
     """Modes that a notification transport can send a notification"""
@@ -588,7 +640,10 @@ class Notification(SerializerModel):
     hyperlink = models.TextField(blank=True, null=True, max_length=4096)
     hyperlink_label = models.TextField(blank=True, null=True)
     created = models.DateTimeField(auto_now_add=True)
-    event = models.ForeignKey(Event, on_delete=models.SET_NULL, null=True, blank=True)
+    # Partitioned tables can't be referenced by a foreign key constraint on `event_uuid` alone
+    event = models.ForeignKey(
+        Event, on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False
+    )
     seen = models.BooleanField(default=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
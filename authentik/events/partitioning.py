@@ -0,0 +1,157 @@
+"""Event table partitioning"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db import DatabaseError, connection, transaction
+from django.utils.timezone import now
+from psqlextra.partitioning.constants import AUTO_PARTITIONED_COMMENT
+from structlog.stdlib import get_logger
+
+from authentik.events.models import Event, Notification
+
+LOGGER = get_logger()
+
+# How many months of partitions are created ahead of the current month
+PARTITIONS_AHEAD = 3
+# Partition holding all events created before the table was partitioned
+LEGACY_PARTITION = "legacy"
+DEFAULT_PARTITION = "default"
+
+# Partitions of a table in the current schema, with their bounds. Bounds are `NULL` for
+# `MINVALUE` and the default partition.
+QUERY_PARTITIONS = """
+    SELECT
+        child.relname,
+        substring(
+            pg_get_expr(child.relpartbound, child.oid) FROM 'FROM \\(''([^'']+)''\\)'
+        )::timestamptz,
+        substring(
+            pg_get_expr(child.relpartbound, child.oid) FROM 'TO \\(''([^'']+)''\\)'
+        )::timestamptz
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = %s::regclass
+"""
+
+
+@dataclass(slots=True)
+class EventPartition:
+    """A single partition of the event table"""
+
+    name: str
+    start: datetime | None
+    end: datetime | None
+
+    @property
+    def table(self) -> str:
+        return f"{Event._meta.db_table}_{self.name}"
+
+
+def month_start(value: datetime, offset: int = 0) -> datetime:
+    """Get the start of the month `offset` months after the month of `value`"""
+    month = value.month - 1 + offset
+    return value.replace(
+        year=value.year + month // 12,
+        month=month % 12 + 1,
+        day=1,
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+
+
+def get_event_partitions() -> list[EventPartition]:
+    """Get all partitions of the event table in the current schema, ordered by their start"""
+    prefix = f"{Event._meta.db_table}_"
+    with connection.cursor() as cursor:
+        cursor.execute(QUERY_PARTITIONS, [Event._meta.db_table])
+        partitions = [
+            EventPartition(name=name.removeprefix(prefix), start=start, end=end)
+            for name, start, end in cursor.fetchall()
+        ]
+    return sorted(partitions, key=lambda part: (part.start is not None, part.start or now()))
+
+
+def create_event_partitions(ahead: int = PARTITIONS_AHEAD) -> list[str]:
+    """Create monthly partitions up to `ahead` months after the current month.
+
+    Partitions are only added after the last existing one, as ranges may not overlap."""
+    partitions = get_event_partitions()
+    last_end = max((part.end for part in partitions if part.end), default=None)
+    current = month_start(now())
+    if last_end and last_end > current:
+        current = last_end
+    created = []
+    with connection.schema_editor() as editor:
+        while current < month_start(now(), ahead + 1):
+            end = month_start(current, 1)
+            name = current.strftime("%Y_%m")
+            try:
+                with transaction.atomic():
+                    editor.add_range_partition(
+                        Event, name, current, end, comment=AUTO_PARTITIONED_COMMENT
+                    )
+                created.append(name)
+            except DatabaseError as exc:
+                # Most likely the default partition already contains events in this range
+                LOGGER.warning("Failed to create event partition", partition=name, exc=exc)
+            current = end
+    return created
+
+
+def _has_unexpired_events(partition: EventPartition) -> bool:
+    """Check if `partition` holds events which never expire or haven't expired yet"""
+    table = connection.ops.quote_name(partition.table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {table} WHERE NOT expiring OR expires > %s)",  # nosec
+            [now()],
+        )
+        return cursor.fetchone()[0]
+
+
+def _is_droppable(partition: EventPartition) -> bool:
+    """Check if `partition` is a partition whose range is over and whose events have
+    all expired"""
+    if partition.name == DEFAULT_PARTITION or not partition.end or partition.end > now():
+        return False
+    return not _has_unexpired_events(partition)
+
+
+def drop_expired_event_partitions() -> list[str]:
+    """Drop monthly partitions whose range is over and whose events have all expired"""
+    dropped = []
+    for partition in get_event_partitions():
+        with transaction.atomic(), connection.schema_editor() as editor:
+            if not _is_droppable(partition):
+                continue
+            table = editor.quote_name(partition.table)
+            with connection.cursor() as cursor:
+                # There's no foreign key constraint to set the event to null for us
+                cursor.execute(
+                    f"UPDATE {editor.quote_name(Notification._meta.db_table)} "  # nosec
+                    f"SET event_id = NULL WHERE event_id IN (SELECT event_uuid FROM {table})"
+                )
+            editor.delete_partition(Event, partition.name)
+        dropped.append(partition.name)
+    return dropped
+
+
+def get_event_dropped_ranges() -> list[tuple[datetime, datetime]]:
+    """Get the ranges of monthly partitions which can be dropped, as all their events expired.
+
+    Expired events outside of these ranges are deleted row by row, so that events don't outlive
+    their expiry while other events of the same month are still kept."""
+    ranges: list[tuple[datetime, datetime]] = []
+    for partition in get_event_partitions():
+        # The legacy partition has no start, its events are always expired row by row
+        if not partition.start or not _is_droppable(partition):
+            continue
+        # Merge adjacent partitions to keep the resulting query short
+        if ranges and ranges[-1][1] == partition.start:
+            ranges[-1] = (ranges[-1][0], partition.end)
+        else:
+            ranges.append((partition.start, partition.end))
+    return ranges
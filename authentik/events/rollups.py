@@ -0,0 +1,85 @@
+"""Hourly event rollups"""
+
+from datetime import datetime, timedelta
+
+import pglock
+from django.db import connection, transaction
+from django.db.models import Count, Max, QuerySet
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+from django.db.models.functions import TruncHour
+from django.utils.timezone import now
+from structlog.stdlib import get_logger
+
+from authentik.events.models import Event, EventRollup
+from authentik.lib.utils.db import raw_delete_batched
+
+LOGGER = get_logger()
+
+# How far back rollups are kept, and the maximum timeframe the events API aggregates over
+ROLLUP_HISTORY_DAYS = 60
+# Buckets before the watermark that are recomputed, to include events which were written late
+ROLLUP_OVERLAP = timedelta(hours=1)
+# Timeframe aggregated per transaction
+ROLLUP_CHUNK = timedelta(days=1)
+
+
+def get_rollup_watermark() -> datetime | None:
+    """Get the start of the newest rollup bucket. Buckets before it are complete,
+    events created since then have to be read from the event table"""
+    return EventRollup.objects.aggregate(watermark=Max("bucket"))["watermark"]
+
+
+def aggregate_events(events: QuerySet[Event]) -> QuerySet:
+    """Count `events` per hour, action, authorized application and user"""
+    return (
+        events.annotate(
+            bucket=TruncHour("created"),
+            application=KeyTransform("authorized_application", "context"),
+            user_pk=KeyTextTransform("pk", "user"),
+        )
+        .values("bucket", "action", "application", "user_pk")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+
+
+def update_event_rollups() -> int:
+    """Aggregate events created since the watermark into rollups, returns the number
+    of rollups written. Returns 0 without doing anything while rollups of the current tenant
+    are already being updated."""
+    with pglock.advisory(
+        lock_id=f"goauthentik.io/events/rollups/{connection.schema_name}",
+        side_effect=pglock.Return,
+        timeout=0,
+    ) as acquired:
+        if not acquired:
+            LOGGER.debug("Event rollups are already being updated")
+            return 0
+        return _update_event_rollups()
+
+
+def _update_event_rollups() -> int:
+    end = now()
+    watermark = get_rollup_watermark()
+    if watermark:
+        start = watermark - ROLLUP_OVERLAP
+    else:
+        start = (end - timedelta(days=ROLLUP_HISTORY_DAYS)).replace(
+            minute=0, second=0, microsecond=0
+        )
+    expiry = timedelta(days=ROLLUP_HISTORY_DAYS + 1)
+    written = 0
+    while start < end:
+        stop = min(start + ROLLUP_CHUNK, end)
+        rollups = [
+            EventRollup(expires=row["bucket"] + expiry, **row)
+            for row in aggregate_events(Event.objects.filter(created__gte=start, created__lt=stop))
+        ]
+        with transaction.atomic():
+            # Rollups have no relations, so they can be deleted without collecting them
+            raw_delete_batched(EventRollup.objects.filter(bucket__gte=start, bucket__lt=stop))
+            EventRollup.objects.bulk_create(rollups, batch_size=1000)
+        written += len(rollups)
+        start = stop
+    LOGGER.debug("Updated event rollups", count=written, watermark=watermark)
+    return written
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from django.db.models.query_utils import Q
 from django.utils.translation import gettext_lazy as _
+from django_dramatiq_postgres.composition import group
 from dramatiq.actor import actor
 from guardian.shortcuts import get_anonymous_user
 from structlog.stdlib import get_logger
@@ -15,6 +16,11 @@ from authentik.events.models import (
     NotificationRule,
     NotificationTransport,
 )
+from authentik.events.partitioning import (
+    create_event_partitions,
+    drop_expired_event_partitions,
+)
+from authentik.events.rollups import update_event_rollups
 from authentik.lib.utils.db import chunked_queryset
 from authentik.policies.engine import PolicyEngine
 from authentik.policies.models import PolicyBinding, PolicyEngineMode
@@ -25,8 +31,10 @@ LOGGER = get_logger()
 
 @actor(description=_("Dispatch new event notifications."))
 def event_trigger_dispatch(event_uuid: UUID):
-    for trigger in NotificationRule.objects.all():
-        event_trigger_handler.send_with_options(args=(event_uuid, trigger.name), rel_obj=trigger)
+    group(
+        event_trigger_handler.message_with_options(args=(event_uuid, trigger.name), rel_obj=trigger)
+        for trigger in NotificationRule.objects.all()
+    ).run()
 
 
 @actor(
@@ -141,3 +149,22 @@ def notification_cleanup():
     notifications.delete()
     LOGGER.debug("Expired notifications", amount=amount)
     self.info(f"Expired {amount} Notifications")
+
+
+@actor(description=_("Create upcoming event partitions and drop expired ones."))
+def event_partitions_maintenance():
+    """Create monthly event partitions ahead of time and drop partitions whose
+    events have all expired."""
+    self = CurrentTask.get_task()
+    created = create_event_partitions()
+    dropped = drop_expired_event_partitions()
+    LOGGER.debug("Maintained event partitions", created=created, dropped=dropped)
+    self.info(f"Created {len(created)} and dropped {len(dropped)} event partitions")
+
+
+@actor(description=_("Aggregate new events into hourly rollups."))
+def event_rollups_update():
+    """Aggregate events created since the last run into hourly rollups"""
+    self = CurrentTask.get_task()
+    count = update_event_rollups()
+    self.info(f"Updated {count} event rollups")
@@ -0,0 +1,85 @@
+"""Event partitioning tests"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from authentik.core.tests.utils import create_test_user
+from authentik.events.models import Event, EventAction, Notification, NotificationSeverity
+from authentik.events.partitioning import (
+    DEFAULT_PARTITION,
+    LEGACY_PARTITION,
+    create_event_partitions,
+    drop_expired_event_partitions,
+    get_event_dropped_ranges,
+    get_event_partitions,
+    month_start,
+)
+
+
+class TestEventPartitioning(TestCase):
+    """Test event partition maintenance"""
+
+    def test_create(self):
+        """Test partitions are created after the last existing partition"""
+        before = {part.name for part in get_event_partitions()}
+        self.assertIn(LEGACY_PARTITION, before)
+        self.assertIn(DEFAULT_PARTITION, before)
+        self.assertEqual(create_event_partitions(), [])
+        created = create_event_partitions(ahead=5)
+        self.assertEqual(
+            created,
+            [month_start(now(), 4).strftime("%Y_%m"), month_start(now(), 5).strftime("%Y_%m")],
+        )
+        # Partitions whose range isn't over yet can't be dropped
+        self.assertEqual(get_event_dropped_ranges(), [])
+        with patch("authentik.events.partitioning.now", return_value=now() + timedelta(days=800)):
+            self.assertEqual(
+                get_event_dropped_ranges(), [(month_start(now(), 1), month_start(now(), 6))]
+            )
+
+    def test_drop(self):
+        """Test partitions are only dropped once all their events have expired"""
+        kept = Event.new(EventAction.CUSTOM_PREFIX)
+        kept.expiring = False
+        kept.save()
+        event = Event.new(EventAction.CUSTOM_PREFIX)
+        event.save()
+        # Move the event into the partition of next month
+        Event.objects.filter(pk=event.pk).update(created=month_start(now(), 1))
+        notification = Notification.objects.create(
+            severity=NotificationSeverity.NOTICE, body="foo", user=create_test_user(), event=event
+        )
+        with patch("authentik.events.partitioning.now", return_value=now() + timedelta(days=800)):
+            dropped = drop_expired_event_partitions()
+        self.assertIn(month_start(now(), 1).strftime("%Y_%m"), dropped)
+        self.assertNotIn(LEGACY_PARTITION, dropped)
+        self.assertNotIn(DEFAULT_PARTITION, dropped)
+        self.assertFalse(Event.objects.filter(pk=event.pk).exists())
+        self.assertTrue(Event.objects.filter(pk=kept.pk).exists())
+        notification.refresh_from_db()
+        self.assertIsNone(notification.event_id)
+
+    def test_dropped_ranges(self):
+        """Test partitions which can't be dropped yet are expired row by row"""
+        kept = Event.new(EventAction.CUSTOM_PREFIX)
+        kept.expiring = False
+        kept.save()
+        Event.objects.filter(pk=kept.pk).update(created=month_start(now(), 1))
+        later = now() + timedelta(days=800)
+        with patch("authentik.events.partitioning.now", return_value=later):
+            ranges = get_event_dropped_ranges()
+        self.assertNotIn(month_start(now(), 1), [start for start, _ in ranges])
+        self.assertEqual(ranges[0][0], month_start(now(), 2))
+
+    def test_dropped_ranges_unexpired(self):
+        """Test partitions with events that haven't expired yet are expired row by row"""
+        event = Event.new(EventAction.CUSTOM_PREFIX)
+        event.expires = now() + timedelta(days=1000)
+        event.save()
+        Event.objects.filter(pk=event.pk).update(created=month_start(now(), 1))
+        with patch("authentik.events.partitioning.now", return_value=now() + timedelta(days=800)):
+            ranges = get_event_dropped_ranges()
+        self.assertNotIn(month_start(now(), 1), [start for start, _ in ranges])
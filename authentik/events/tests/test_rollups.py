@@ -0,0 +1,68 @@
+"""Event rollup tests"""
+
+from datetime import timedelta
+from json import loads
+
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+
+from authentik.core.tests.utils import create_test_admin_user
+from authentik.events.models import Event, EventAction, EventRollup
+from authentik.events.rollups import get_rollup_watermark, update_event_rollups
+from authentik.lib.generators import generate_id
+
+
+class TestEventRollups(APITestCase):
+    """Test event rollups"""
+
+    def setUp(self) -> None:
+        self.user = create_test_admin_user()
+        self.client.force_login(self.user)
+        self.application = {"pk": generate_id(), "name": generate_id()}
+
+    def _create_events(self, count: int, created=None):
+        for _ in range(count):
+            Event.new(
+                EventAction.AUTHORIZE_APPLICATION, authorized_application=self.application
+            ).set_user(self.user).save()
+        if created:
+            Event.objects.filter(created__gte=now() - timedelta(minutes=1)).update(created=created)
+
+    def test_update(self):
+        """Test rollups are updated incrementally"""
+        self._create_events(3, created=now() - timedelta(hours=3))
+        update_event_rollups()
+        rollup = EventRollup.objects.get(action=EventAction.AUTHORIZE_APPLICATION)
+        self.assertEqual(rollup.count, 3)
+        self.assertEqual(rollup.application, self.application)
+        self.assertEqual(rollup.user_pk, str(self.user.pk))
+        self.assertEqual(get_rollup_watermark(), rollup.bucket)
+        # Recomputed buckets replace existing rollups
+        self._create_events(2, created=now() - timedelta(hours=3))
+        update_event_rollups()
+        rollup = EventRollup.objects.get(action=EventAction.AUTHORIZE_APPLICATION)
+        self.assertEqual(rollup.count, 5)
+
+    def test_api(self):
+        """Test API results merge rollups and newer events"""
+        self._create_events(3, created=now() - timedelta(hours=3))
+        # Events of the newest bucket are read from the event table
+        self._create_events(1, created=now() - timedelta(hours=1))
+        update_event_rollups()
+        self._create_events(2)
+        response = self.client.get(
+            reverse("authentik_api:event-volume"),
+            data={"action": EventAction.AUTHORIZE_APPLICATION},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(row["count"] for row in loads(response.content)), 6)
+        response = self.client.get(
+            reverse("authentik_api:event-top-per-user"),
+            data={"action": EventAction.AUTHORIZE_APPLICATION},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            loads(response.content),
+            [{"application": self.application, "counted_events": 6, "unique_users": 1}],
+        )
@@ -0,0 +1,88 @@
+"""Event writer tests"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authentik.events.models import Event, EventAction
+from authentik.events.writer import EventWriter
+from authentik.lib.generators import generate_id
+
+
+class TestEventWriter(TestCase):
+    """Test buffered event persistence"""
+
+    def setUp(self):
+        # Large interval so that only explicit flushes write events
+        self.writer = EventWriter(batch_size=10, max_size=2, flush_interval=3600)
+
+    def test_buffered(self):
+        """Test events are buffered until flushed"""
+        uid = generate_id()
+        self.writer.write(Event.new(EventAction.CUSTOM_PREFIX, uid=uid))
+        self.writer.write(Event.new(EventAction.CUSTOM_PREFIX, uid=uid))
+        self.assertFalse(Event.objects.filter(context__uid=uid).exists())
+        with CaptureQueriesContext(connection) as ctx:
+            self.writer.flush()
+        inserts = [
+            query
+            for query in ctx.captured_queries
+            if query["sql"].startswith(f'INSERT INTO "{Event._meta.db_table}"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Event.objects.filter(context__uid=uid).count(), 2)
+
+    def test_full(self):
+        """Test events are written synchronously when the buffer is full"""
+        uid = generate_id()
+        for _ in range(3):
+            self.writer.write(Event.new(EventAction.CUSTOM_PREFIX, uid=uid))
+        self.assertEqual(Event.objects.filter(context__uid=uid).count(), 1)
+        self.writer.flush()
+        self.assertEqual(Event.objects.filter(context__uid=uid).count(), 3)
+
+    def test_disabled(self):
+        """Test events are written synchronously when buffering is disabled"""
+        uid = generate_id()
+        EventWriter(batch_size=0, max_size=0, flush_interval=1).write(
+            Event.new(EventAction.CUSTOM_PREFIX, uid=uid)
+        )
+        self.assertTrue(Event.objects.filter(context__uid=uid).exists())
+
+    def test_receiver_error(self):
+        """Test a failing post_save receiver doesn't keep other events from being handled"""
+        uid = generate_id()
+        received = []
+
+        def failing_receiver(sender, instance: Event, **_):
+            if instance.context["index"] == 0:
+                raise ValueError()
+
+        def receiver(sender, instance: Event, **_):
+            received.append(instance.context["index"])
+
+        self.writer.write(Event.new(EventAction.CUSTOM_PREFIX, uid=uid, index=0))
+        self.writer.write(Event.new(EventAction.CUSTOM_PREFIX, uid=uid, index=1))
+        post_save.connect(failing_receiver, sender=Event)
+        post_save.connect(receiver, sender=Event)
+        try:
+            self.writer.flush()
+        finally:
+            post_save.disconnect(failing_receiver, sender=Event)
+            post_save.disconnect(receiver, sender=Event)
+        self.assertEqual(Event.objects.filter(context__uid=uid).count(), 2)
+        self.assertEqual(received, [0, 1])
+
+    def test_created(self):
+        """Test buffered events keep the time they were created at"""
+        uid = generate_id()
+        event = Event.new(EventAction.CUSTOM_PREFIX, uid=uid)
+        self.writer.write(event)
+        created = event.created
+        with patch("django.utils.timezone.now", return_value=created + timedelta(minutes=5)):
+            self.writer.flush()
+        self.assertEqual(Event.objects.get(context__uid=uid).created, created)
@@ -0,0 +1,141 @@
+"""Buffered event persistence"""
+
+from atexit import register
+from collections import defaultdict
+from os import getpid
+from threading import Condition, Lock, Thread
+from typing import TYPE_CHECKING
+
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models.signals import post_save
+from django.utils.timezone import now
+from django_tenants.utils import schema_context
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+
+if TYPE_CHECKING:
+    from authentik.events.models import Event
+
+LOGGER = get_logger()
+
+_WRITER: EventWriter | None = None
+_WRITER_LOCK = Lock()
+
+
+class EventWriter:
+    """Buffer events in memory and persist them with multi-row INSERTs.
+
+    Buffered events are written by a background thread once `batch_size` events are pending
+    or every `flush_interval` seconds, and when the process exits. Events are written
+    synchronously when buffering is disabled (`batch_size` of 0) or when `max_size` events are
+    already pending."""
+
+    def __init__(self, batch_size: int, max_size: int, flush_interval: float) -> None:
+        self.batch_size = batch_size
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        # Pending events with the schema they were created in
+        self._buffer: list[tuple[str, Event]] = []
+        self._condition = Condition()
+        self._pid: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.batch_size > 0
+
+    def write(self, event: Event) -> None:
+        """Persist `event`, either buffered or synchronously"""
+        if self.enabled and event._state.adding:
+            with self._condition:
+                if len(self._buffer) < self.max_size:
+                    self._ensure_thread()
+                    # Events are written with the time they were buffered at, not when the
+                    # buffer is flushed
+                    event.created = now()
+                    event.log_created()
+                    self._buffer.append((connection.schema_name, event))
+                    if len(self._buffer) >= self.batch_size:
+                        self._condition.notify()
+                    return
+        event.save()
+
+    def flush(self) -> None:
+        """Write all pending events"""
+        with self._condition:
+            pending, self._buffer = self._buffer, []
+        if not pending:
+            return
+        from authentik.events.models import Event
+
+        by_schema: dict[str, list[Event]] = defaultdict(list)
+        for schema_name, event in pending:
+            by_schema[schema_name].append(event)
+        written: list[tuple[str, list[Event]]] = []
+        for schema_name, events in by_schema.items():
+            try:
+                with schema_context(schema_name):
+                    Event.objects.bulk_create(events, batch_size=self.batch_size)
+            except DatabaseError as exc:
+                LOGGER.warning("Failed to write events", exc=exc, count=len(events))
+                continue
+            written.append((schema_name, events))
+        # Signal receivers run once all events are written, so that one failing receiver
+        # doesn't keep the events of other schemas from being written
+        for schema_name, events in written:
+            with schema_context(schema_name):
+                for event in events:
+                    # A failing receiver must not keep the receivers of other events from running
+                    responses = post_save.send_robust(
+                        sender=Event,
+                        instance=event,
+                        created=True,
+                        update_fields=None,
+                        raw=False,
+                        using=event._state.db,
+                    )
+                    for receiver, response in responses:
+                        if isinstance(response, Exception):
+                            LOGGER.warning(
+                                "Failed to run event receiver",
+                                receiver=receiver,
+                                event=event,
+                                exc=response,
+                            )
+
+    def _ensure_thread(self) -> None:
+        """Start the flush thread for the current process. Must be called with the lock held"""
+        pid = getpid()
+        if self._pid == pid:
+            return
+        # Events buffered before a fork are written by the parent process
+        self._buffer = []
+        self._pid = pid
+        Thread(target=self._run, name="authentik-event-writer", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._buffer) >= self.batch_size, timeout=self.flush_interval
+                )
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as exc:  # noqa: BLE001
+                # Keep the thread alive, otherwise no buffered events would be written anymore
+                LOGGER.warning("Failed to flush events", exc=exc)
+
+
+def get_event_writer() -> EventWriter:
+    """Get the per-process event writer, creating it when required"""
+    global _WRITER  # noqa: PLW0603
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = EventWriter(
+                batch_size=CONFIG.get_int("events.buffer.size", 100),
+                max_size=CONFIG.get_int("events.buffer.max_size", 10000),
+                flush_interval=float(CONFIG.get("events.buffer.flush_interval", 1)),
+            )
+            register(_WRITER.flush)
+    return _WRITER
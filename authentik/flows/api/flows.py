@@ -1,6 +1,5 @@
 """Flow API Views"""
 
-from django.core.cache import cache
 from django.http import HttpResponse
 from django.urls import reverse
 from django.utils.translation import gettext as _
@@ -28,7 +27,11 @@ from authentik.events.logs import LogEventSerializer
 from authentik.flows.api.flows_diagram import FlowDiagram, FlowDiagramSerializer
 from authentik.flows.exceptions import FlowNonApplicableException
 from authentik.flows.models import Flow
-from authentik.flows.planner import CACHE_PREFIX, PLAN_CONTEXT_PENDING_USER, FlowPlanner, cache_key
+from authentik.flows.planner import (
+    FLOW_PLAN_CACHE,
+    PLAN_CONTEXT_PENDING_USER,
+    FlowPlanner,
+)
 from authentik.flows.views.executor import SESSION_KEY_HISTORY, SESSION_KEY_PLAN
 from authentik.lib.views import bad_request_message
 from authentik.rbac.decorators import permission_required
@@ -55,7 +58,7 @@ class FlowSerializer(ModelSerializer):
 
     def get_cache_count(self, flow: Flow) -> int:
         """Get count of cached flows"""
-        return len(cache.keys(f"{cache_key(flow)}*"))
+        return FLOW_PLAN_CACHE.count(str(flow.pk))
 
     def get_export_url(self, flow: Flow) -> str:
         """Get export URL for flow"""
@@ -128,7 +131,7 @@ class FlowViewSet(UsedByMixin, ModelViewSet):
     @action(detail=False, pagination_class=None, filter_backends=[])
     def cache_info(self, request: Request) -> Response:
         """Info about cached flows"""
-        return Response(data={"count": len(cache.keys(f"{CACHE_PREFIX}*"))})
+        return Response(data={"count": FLOW_PLAN_CACHE.count()})
 
     @permission_required(None, ["authentik_flows.clear_flow_cache"])
     @extend_schema(
@@ -141,9 +144,8 @@ class FlowViewSet(UsedByMixin, ModelViewSet):
     @action(detail=False, methods=["POST"])
     def cache_clear(self, request: Request) -> Response:
         """Clear flow cache"""
-        keys = cache.keys(f"{CACHE_PREFIX}*")
-        cache.delete_many(keys)
-        LOGGER.debug("Cleared flow cache", keys=len(keys))
+        FLOW_PLAN_CACHE.invalidate()
+        LOGGER.debug("Cleared flow cache")
         return Response(status=204)
 
     @permission_required(
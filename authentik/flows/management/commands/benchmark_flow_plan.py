@@ -0,0 +1,95 @@
+"""authentik flow plan session benchmark command"""
+
+from copy import deepcopy
+from time import perf_counter
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from authentik import authentik_version
+from authentik.core.sessions import SessionStore
+from authentik.core.tests.utils import create_test_admin_user
+from authentik.flows.models import Flow
+from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER, FlowPlan, FlowPlanner
+from authentik.flows.views.executor import SESSION_KEY_HISTORY, SESSION_KEY_PLAN
+
+
+def _full_state(plan: FlowPlan) -> dict[str, Any]:
+    """State of `plan` including full bindings and stages, as pickled before
+    `PLAN_STATE_VERSION` was introduced"""
+    return {
+        "flow_pk": plan.flow_pk,
+        "bindings": plan.bindings,
+        "markers": plan.markers,
+        "context": plan.context,
+    }
+
+
+class Command(BaseCommand):
+    """Benchmark the size and load time of sessions with a flow plan"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-f",
+            "--flow",
+            default="default-authentication-flow",
+            action="store",
+            help="Slug of the flow to plan.",
+        )
+        parser.add_argument(
+            "-n",
+            "--iterations",
+            default=1000,
+            type=int,
+            action="store",
+            help="How often sessions should be encoded and decoded.",
+        )
+
+    def measure(self, session: dict[str, Any], iterations: int) -> tuple[int, float, float]:
+        """Encode and decode `session`, returns its size in bytes and the average time to
+        encode and decode it in milliseconds"""
+        store = SessionStore()
+        encoded = store.encode(session)
+        start = perf_counter()
+        for _ in range(iterations):
+            store.encode(session)
+        encode_time = (perf_counter() - start) / iterations
+        start = perf_counter()
+        for _ in range(iterations):
+            store.decode(encoded)
+        decode_time = (perf_counter() - start) / iterations
+        return len(encoded), encode_time * 1000, decode_time * 1000
+
+    def handle(self, *args, **options):
+        """Start benchmark"""
+        flow = Flow.objects.get(slug=options["flow"])
+        user = create_test_admin_user()
+        planner = FlowPlanner(flow)
+        planner.use_cache = False
+        plan = planner.plan(RequestFactory().get("/"), {PLAN_CONTEXT_PENDING_USER: user})
+        history = [deepcopy(plan)]
+        try:
+            results = {
+                "compact": self.measure(
+                    {SESSION_KEY_PLAN: plan, SESSION_KEY_HISTORY: history},
+                    options["iterations"],
+                ),
+                "full": self.measure(
+                    {
+                        SESSION_KEY_PLAN: _full_state(plan),
+                        SESSION_KEY_HISTORY: [_full_state(entry) for entry in history],
+                    },
+                    options["iterations"],
+                ),
+            }
+        finally:
+            user.delete()
+
+        print(f"Version: {authentik_version()}")
+        print(f"Flow: {flow.slug}, {len(plan.bindings)} stages")
+        for name, (size, encode_time, decode_time) in results.items():
+            print(f"{name}:")
+            print(f"\tSize: {size} bytes")
+            print(f"\tEncode: {encode_time:.3f}ms")
+            print(f"\tDecode: {decode_time:.3f}ms")
@@ -1,9 +1,11 @@
 """Flows Planner"""
 
+from copy import deepcopy
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from django.core.cache import cache
+from django.db import connection
 from django.http import HttpRequest, HttpResponse
 from sentry_sdk import start_span
 from sentry_sdk.tracing import Span
@@ -23,10 +25,12 @@ from authentik.flows.models import (
     in_memory_stage,
 )
 from authentik.lib.config import CONFIG
+from authentik.lib.utils.cache import CacheNamespace
 from authentik.lib.utils.urls import redirect_with_qs
 from authentik.outposts.models import Outpost
 from authentik.policies.engine import PolicyEngine
 from authentik.root.middleware import ClientIPMiddleware
+from authentik.tenants.resolver import RESOLVER
 
 if TYPE_CHECKING:
     from authentik.flows.stage import StageView
@@ -48,14 +52,50 @@ PLAN_CONTEXT_IS_REDIRECTED = "is_redirected"
 PLAN_CONTEXT_REDIRECT_STAGE_TARGET = "redirect_stage_target"
 CACHE_TIMEOUT = CONFIG.get_int("cache.timeout_flows")
 CACHE_PREFIX = "goauthentik.io/flows/planner/"
+# Version of the state flow plans are pickled with, see `FlowPlan.__getstate__`
+PLAN_STATE_VERSION = 1
+# Pickled in place of a `ReevaluateMarker` for the binding it is attached to
+PLAN_MARKER_REEVALUATE = "reevaluate"
+
+
+# Flow plans, scoped per flow
+FLOW_PLAN_CACHE = CacheNamespace(CACHE_PREFIX)
 
 
 def cache_key(flow: Flow, user: User | None = None) -> str:
     """Generate Cache key for flow"""
-    prefix = CACHE_PREFIX + str(flow.pk)
-    if user:
-        prefix += f"#{user.pk}"
-    return prefix
+    return FLOW_PLAN_CACHE.key(f"#{user.pk}" if user else "", scope=str(flow.pk))
+
+
+def binding_cache_prefix() -> str:
+    """Prefix of the in-process cache keys of the flow stage bindings of the current tenant"""
+    return f"flows/bindings/{connection.schema_name}/"
+
+
+def get_bindings(pks: list[str]) -> dict[str, FlowStageBinding]:
+    """Get copies of flow stage bindings and their stages by primary key, from the in-process
+    cache if possible. Bindings that don't exist anymore are not returned."""
+    prefix = binding_cache_prefix()
+    bindings: dict[str, FlowStageBinding] = {}
+    missing = []
+    for pk in pks:
+        if (binding := RESOLVER.lookup(prefix + pk)) is not None:
+            bindings[pk] = binding
+        else:
+            missing.append(pk)
+    if missing:
+        loaded = list(FlowStageBinding.objects.filter(pk__in=missing))
+        stages = {
+            stage.pk: stage
+            for stage in Stage.objects.filter(
+                pk__in=[binding.stage_id for binding in loaded]
+            ).select_subclasses()
+        }
+        for binding in loaded:
+            binding.stage = stages[binding.stage_id]
+            RESOLVER.store(prefix + binding.pk.hex, binding)
+            bindings[binding.pk.hex] = binding
+    return {pk: deepcopy(binding) for pk, binding in bindings.items()}
 
 
 @dataclass(slots=True)
@@ -68,6 +108,79 @@ class FlowPlan:
     bindings: list[FlowStageBinding] = field(default_factory=list)
     context: dict[str, Any] = field(default_factory=dict)
     markers: list[StageMarker] = field(default_factory=list)
+    # Set when a stage binding of the plan was deleted since it was planned, the flow
+    # has to be planned again
+    invalid: bool = False
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle bindings from the database by their primary key instead of the full binding
+        and stage, they are loaded again when unpickling. In-memory bindings and the context
+        are pickled as-is."""
+        bindings = []
+        markers = []
+        for binding, marker in zip(self.bindings, self.markers, strict=True):
+            stored = not binding._state.adding
+            bindings.append(binding.pk.hex if stored else binding)
+            if marker.__class__ is StageMarker:
+                markers.append(None)
+            elif stored and isinstance(marker, ReevaluateMarker) and marker.binding is binding:
+                markers.append(PLAN_MARKER_REEVALUATE)
+            else:
+                markers.append(marker)
+        return {
+            "version": PLAN_STATE_VERSION,
+            "flow_pk": self.flow_pk,
+            "bindings": bindings,
+            "markers": markers,
+            "context": self.context,
+            "invalid": self.invalid,
+        }
+
+    def __setstate__(self, state: dict[str, Any] | tuple[None, dict[str, Any]]):
+        self.invalid = False
+        if isinstance(state, tuple):
+            # Plans pickled before `PLAN_STATE_VERSION` was introduced only have their slots
+            for key, value in state[1].items():
+                setattr(self, key, value)
+            return
+        self.flow_pk = state.get("flow_pk", "")
+        self.context = state.get("context", {})
+        self.invalid = state.get("invalid", False)
+        self.bindings = []
+        self.markers = []
+        if state.get("version") != PLAN_STATE_VERSION:
+            LOGGER.info("Unsupported flow plan version", version=state.get("version"))
+            self.invalid = True
+            return
+        loaded = get_bindings([pk for pk in state["bindings"] if isinstance(pk, str)])
+        for stored, stored_marker in zip(state["bindings"], state["markers"], strict=True):
+            binding = loaded.get(stored) if isinstance(stored, str) else stored
+            if binding is None:
+                # Don't let a plan continue without a stage it was planned with. Unpickling
+                # still succeeds so that the rest of the session is kept, the executor plans
+                # the flow again instead
+                LOGGER.info("Flow stage binding of plan was deleted", binding=stored)
+                self.invalid = True
+                self.bindings = []
+                self.markers = []
+                return
+            marker = stored_marker
+            if stored_marker is None:
+                marker = StageMarker()
+            elif stored_marker == PLAN_MARKER_REEVALUATE:
+                marker = ReevaluateMarker(binding=binding)
+            self.bindings.append(binding)
+            self.markers.append(marker)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> FlowPlan:
+        # Copy directly instead of through pickle's state, which would load bindings again
+        return FlowPlan(
+            flow_pk=self.flow_pk,
+            bindings=deepcopy(self.bindings, memo),
+            context=deepcopy(self.context, memo),
+            markers=deepcopy(self.markers, memo),
+            invalid=self.invalid,
+        )
 
     def append_stage(self, stage: Stage, marker: StageMarker | None = None):
         """Append `stage` to the end of the plan, optionally with stage marker"""
@@ -293,7 +406,7 @@ class FlowPlanner:
             )
             plan = self._build_plan(user, request, context)
             if self.use_cache:
-                cache.set(cache_key(self.flow, user), plan, CACHE_TIMEOUT)
+                cache.set(cached_plan_key, plan, CACHE_TIMEOUT)
             if not plan.bindings and not self.allow_empty_flows:
                 raise EmptyFlowException()
             return plan
@@ -326,6 +439,19 @@ class FlowPlanner:
                 FlowStageBinding.objects.filter(target__pk=self.flow.pk).order_by("order")
             )
             stages = Stage.objects.filter(flowstagebinding__in=[binding.pk for binding in bindings])
+
+            def setup_engine(engine: PolicyEngine):
+                engine.use_cache = self.use_cache
+                engine.request.context["flow_plan"] = plan
+                engine.request.context.update(plan.context)
+
+            # Policies of all bindings are fetched at once, and evaluated lazily in order
+            engines = PolicyEngine.evaluate_many(
+                [binding for binding in bindings if binding.evaluate_on_plan],
+                user,
+                request,
+                setup=setup_engine,
+            )
             for binding in bindings:
                 binding: FlowStageBinding
                 stage = [stage for stage in stages if stage.pk == binding.stage_id][0]
@@ -335,11 +461,7 @@ class FlowPlanner:
                         "f(plan): evaluating on plan",
                         stage=stage,
                     )
-                    engine = PolicyEngine(binding, user, request)
-                    engine.use_cache = self.use_cache
-                    engine.request.context["flow_plan"] = plan
-                    engine.request.context.update(plan.context)
-                    engine.build()
+                    engine = next(engines)
                     if engine.passing:
                         self._logger.debug(
                             "f(plan): stage passing",
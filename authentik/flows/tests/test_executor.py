@@ -81,6 +81,34 @@ class TestFlowExecutor(FlowTestCase):
             self.assertEqual(response.status_code, 302)
             self.assertEqual(cancel_mock.call_count, 2)
 
+    @patch(
+        "authentik.flows.views.executor.to_stage_response",
+        TO_STAGE_RESPONSE_MOCK,
+    )
+    def test_existing_plan_deleted_binding(self):
+        """Check that a plan whose stage binding was deleted is planned again"""
+        flow = create_test_flow()
+        binding = FlowStageBinding.objects.create(
+            target=flow, stage=DummyStage.objects.create(name=generate_id()), order=0
+        )
+        deleted = FlowStageBinding.objects.create(
+            target=flow, stage=DummyStage.objects.create(name=generate_id()), order=1
+        )
+        session = self.client.session
+        session[SESSION_KEY_PLAN] = FlowPlan(
+            flow_pk=flow.pk.hex, bindings=[binding, deleted], markers=[StageMarker()] * 2
+        )
+        session.save()
+        deleted.delete()
+
+        response = self.client.get(
+            reverse("authentik_api:flow-executor", kwargs={"flow_slug": flow.slug}),
+        )
+        self.assertEqual(response.status_code, 200)
+        plan: FlowPlan = self.client.session[SESSION_KEY_PLAN]
+        self.assertFalse(plan.invalid)
+        self.assertEqual(plan.bindings, [binding])
+
     @patch(
         "authentik.flows.views.executor.to_stage_response",
         TO_STAGE_RESPONSE_MOCK,
@@ -1,7 +1,9 @@
 """flow planner tests"""
 
+from pickle import dumps, loads  # nosec
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
+from django.contrib.auth import SESSION_KEY
 from django.core.cache import cache
 from django.http import HttpRequest
 from django.shortcuts import redirect
@@ -10,10 +12,12 @@ from django.urls import reverse
 
 from authentik.blueprints.tests import reconcile_app
 from authentik.core.models import User
+from authentik.core.sessions import SessionStore
 from authentik.core.tests.utils import (
     RequestFactory,
     create_test_admin_user,
     create_test_flow,
+    create_test_user,
     dummy_get_response,
 )
 from authentik.flows.exceptions import EmptyFlowException, FlowNonApplicableException
@@ -27,10 +31,12 @@ from authentik.flows.models import (
 from authentik.flows.planner import (
     PLAN_CONTEXT_IS_REDIRECTED,
     PLAN_CONTEXT_PENDING_USER,
+    FlowPlan,
     FlowPlanner,
     cache_key,
 )
-from authentik.flows.stage import StageView
+from authentik.flows.stage import RedirectStage, StageView
+from authentik.flows.views.executor import SESSION_KEY_PLAN
 from authentik.lib.generators import generate_id
 from authentik.outposts.apps import MANAGED_OUTPOST
 from authentik.outposts.models import Outpost
@@ -237,6 +243,63 @@ class TestFlowPlanner(TestCase):
             self.assertIsInstance(plan.markers[0], StageMarker)
             self.assertIsInstance(plan.markers[1], ReevaluateMarker)
 
+    def test_planner_pickle(self):
+        """Test plans are pickled with binding references and load their bindings again"""
+        flow = create_test_flow()
+        binding = FlowStageBinding.objects.create(
+            target=flow,
+            stage=DummyStage.objects.create(name=generate_id()),
+            order=0,
+            re_evaluate_policies=True,
+        )
+        deleted = FlowStageBinding.objects.create(
+            target=flow,
+            stage=DummyStage.objects.create(name=generate_id()),
+            order=1,
+            re_evaluate_policies=False,
+        )
+        request = self.request_factory.get(
+            reverse("authentik_api:flow-executor", kwargs={"flow_slug": flow.slug}),
+        )
+        plan = FlowPlanner(flow).plan(request, {"foo": "bar"})
+        plan.redirect("https://authentik.company")
+        data = dumps(plan)
+        self.assertNotIn(binding.stage.name.encode(), data)
+
+        loaded = loads(data)  # nosec
+        self.assertEqual(loaded.flow_pk, plan.flow_pk)
+        self.assertEqual(loaded.context, plan.context)
+        self.assertEqual(len(loaded.bindings), 3)
+        self.assertEqual(loaded.bindings[0], binding)
+        self.assertIsInstance(loaded.bindings[0].stage, DummyStage)
+        self.assertIsInstance(loaded.markers[0], ReevaluateMarker)
+        self.assertIs(loaded.markers[0].binding, loaded.bindings[0])
+        self.assertEqual(loaded.bindings[1].stage.view, RedirectStage)
+        self.assertEqual(loaded.markers[1].__class__, StageMarker)
+        self.assertEqual(loaded.bindings[2], deleted)
+
+        # Plans can't skip stages whose binding was deleted
+        deleted.delete()
+        loaded = loads(data)  # nosec
+        self.assertTrue(loaded.invalid)
+        self.assertEqual(loaded.bindings, [])
+        self.assertTrue(loads(dumps(loaded)).invalid)  # nosec
+
+    def test_planner_pickle_session(self):
+        """Test sessions holding a plan whose binding was deleted are kept"""
+        flow = create_test_flow()
+        binding = FlowStageBinding.objects.create(
+            target=flow, stage=DummyStage.objects.create(name=generate_id()), order=0
+        )
+        user = create_test_user()
+        plan = FlowPlan(flow_pk=flow.pk.hex, bindings=[binding], markers=[StageMarker()])
+        store = SessionStore()
+        data = store.encode({SESSION_KEY: str(user.pk), SESSION_KEY_PLAN: plan})
+        binding.delete()
+        session = store.decode(data)
+        self.assertEqual(session[SESSION_KEY], str(user.pk))
+        self.assertTrue(session[SESSION_KEY_PLAN].invalid)
+
     def test_to_redirect(self):
         """Test to_redirect and skipping the flow executor"""
         flow = create_test_flow()
@@ -1,10 +1,10 @@
 """authentik multi-stage authentication engine"""
 
 from copy import deepcopy
+from pickle import UnpicklingError  # nosec
 
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.cache import cache
 from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.http.request import QueryDict
 from django.shortcuts import get_object_or_404, redirect
@@ -46,7 +46,7 @@ from authentik.flows.models import (
     Stage,
 )
 from authentik.flows.planner import (
-    CACHE_PREFIX,
+    FLOW_PLAN_CACHE,
     PLAN_CONTEXT_IS_RESTORED,
     PLAN_CONTEXT_PENDING_USER,
     PLAN_CONTEXT_REDIRECT,
@@ -140,12 +140,12 @@ class FlowExecutorView(APIView):
         plan = None
         try:
             plan = token.plan
-        except (AttributeError, EOFError, ImportError, IndexError) as exc:
+        except (AttributeError, EOFError, ImportError, IndexError, UnpicklingError) as exc:
             LOGGER.warning("f(exec): Failed to restore token plan", exc=exc)
         finally:
             if token.revoke_on_execution:
                 token.delete()
-        if not isinstance(plan, FlowPlan):
+        if not isinstance(plan, FlowPlan) or plan.invalid:
             return None
         if existing_plan := self.request.session.get(SESSION_KEY_PLAN):
             plan.context.update(existing_plan.context)
@@ -164,10 +164,13 @@ class FlowExecutorView(APIView):
             # Early check if there's an active Plan for the current session
             if SESSION_KEY_PLAN in self.request.session:
                 self.plan: FlowPlan = self.request.session[SESSION_KEY_PLAN]
-                if self.plan.flow_pk != self.flow.pk.hex:
+                # Plans whose stages were deleted since they were planned are planned again
+                if self.plan.flow_pk != self.flow.pk.hex or self.plan.invalid:
                     self._logger.warning(
-                        "f(exec): Found existing plan for other flow, deleting plan",
+                        "f(exec): Found existing plan for other flow or with deleted stages, "
+                        "deleting plan",
                         other_flow=self.plan.flow_pk,
+                        invalid=self.plan.invalid,
                     )
                     # Existing plan is deleted from session and instance
                     self.plan = None
@@ -209,8 +212,7 @@ class FlowExecutorView(APIView):
                 self._logger.warning(
                     "f(exec): found incompatible flow plan, invalidating run", exc=exc
                 )
-                keys = cache.keys(f"{CACHE_PREFIX}*")
-                cache.delete_many(keys)
+                FLOW_PLAN_CACHE.invalidate()
                 return self.stage_invalid()
             if not next_binding:
                 self._logger.debug("f(exec): no more stages, flow is done.")
@@ -359,8 +361,7 @@ class FlowExecutorView(APIView):
             # from the cache. If there are errors, just delete all cached flows
             _ = plan.has_stages
         except Exception:  # noqa
-            keys = cache.keys(f"{CACHE_PREFIX}*")
-            cache.delete_many(keys)
+            FLOW_PLAN_CACHE.invalidate()
             return self._initiate_plan()
         return plan
 
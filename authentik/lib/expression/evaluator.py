@@ -2,25 +2,29 @@
 
 import re
 import socket
+from hashlib import sha256
 from ipaddress import ip_address, ip_network
 from smtplib import SMTPException
 from textwrap import indent
+from threading import Lock
 from types import CodeType
 from typing import TYPE_CHECKING, Any
 
-from cachetools import TLRUCache, cached
+from cachetools import LRUCache, TLRUCache, cached
 from django.core.exceptions import FieldError
 from django.http import HttpRequest
 from django.utils.text import slugify
 from django.utils.timezone import now
 from guardian.shortcuts import get_anonymous_user
+from prometheus_client import Counter
 from rest_framework.serializers import ValidationError
 from sentry_sdk import start_span
 from sentry_sdk.tracing import Span
 from structlog.stdlib import get_logger
 
-from authentik.core.models import User
+from authentik.core.models import Group, User
 from authentik.events.models import Event
+from authentik.lib.config import CONFIG
 from authentik.lib.expression.exceptions import ControlFlowException
 from authentik.lib.utils.email import normalize_addresses
 from authentik.lib.utils.http import get_http_session
@@ -40,6 +44,21 @@ LOGGER = get_logger()
 
 ARG_SANITIZE = re.compile(r"[:.-]")
 
+COMPILE_CACHE_HITS = Counter(
+    "authentik_expression_compile_cache_hits",
+    "Number of expression compilations served from the compile cache",
+)
+COMPILE_CACHE_MISSES = Counter(
+    "authentik_expression_compile_cache_misses",
+    "Number of expressions compiled because they were not in the compile cache",
+)
+# Process-wide cache of compiled expressions, keyed by
+# (hash of the expression, handler signature, filename)
+COMPILE_CACHE: LRUCache[tuple[str, str, str], CodeType] = LRUCache(
+    maxsize=CONFIG.get_int("expressions.compile_cache_size", 1024)
+)
+_COMPILE_CACHE_LOCK = Lock()
+
 
 def sanitize_arg(arg_name: str) -> str:
     return re.sub(ARG_SANITIZE, "_", slugify(arg_name))
@@ -137,7 +156,7 @@ class BaseEvaluator:
     @staticmethod
     def expr_is_group_member(user: User, **group_filters) -> bool:
         """Check if `user` is member of group with name `group_name`"""
-        return user.all_groups().filter(**group_filters).exists()
+        return Group.objects.filter(pk__in=user.identity.all_group_pks, **group_filters).exists()
 
     @staticmethod
     def expr_user_by(**filters) -> User | None:
@@ -309,11 +328,13 @@ class BaseEvaluator:
             LOGGER.warning("Failed to send email", exc=exc, addresses=to_addresses, subject=subject)
             return False
 
+    def handler_signature(self) -> str:
+        """Arguments of the wrapping handler function, based on the current context"""
+        return ",".join([x for x in [sanitize_arg(x) for x in self._context.keys()] if x])
+
     def wrap_expression(self, expression: str) -> str:
         """Wrap expression in a function, call it, and save the result as `result`"""
-        handler_signature = ",".join(
-            [x for x in [sanitize_arg(x) for x in self._context.keys()] if x]
-        )
+        handler_signature = self.handler_signature()
         full_expression = ""
         full_expression += f"def handler({handler_signature}):\n"
         full_expression += indent(expression, "    ")
@@ -321,9 +342,24 @@ class BaseEvaluator:
         return full_expression
 
     def compile(self, expression: str) -> CodeType:
-        """Parse expression. Raises SyntaxError or ValueError if the syntax is incorrect."""
-        expression = self.wrap_expression(expression)
-        return compile(expression, self._filename, "exec")
+        """Parse expression. Raises SyntaxError or ValueError if the syntax is incorrect.
+        Compiled code is cached process-wide, as the same expressions are evaluated
+        many times with the same context keys."""
+        key = (
+            sha256(expression.encode(), usedforsecurity=False).hexdigest(),
+            self.handler_signature(),
+            self._filename,
+        )
+        with _COMPILE_CACHE_LOCK:
+            code = COMPILE_CACHE.get(key)
+        if code is not None:
+            COMPILE_CACHE_HITS.inc()
+            return code
+        COMPILE_CACHE_MISSES.inc()
+        code = compile(self.wrap_expression(expression), self._filename, "exec")
+        with _COMPILE_CACHE_LOCK:
+            COMPILE_CACHE[key] = code
+        return code
 
     def evaluate(self, expression_source: str) -> Any:
         """Parse and evaluate expression. If the syntax is incorrect, a SyntaxError is raised.
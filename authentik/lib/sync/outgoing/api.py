@@ -111,6 +111,8 @@ class OutgoingSyncProviderStatusMixin:
                 "page": 1,
                 "provider_pk": provider.pk,
                 "override_dry_run": body.validated_data["override_dry_run"],
+                # Objects synced manually are always written, even if they didn't change
+                "force": True,
                 "pk": pk,
             },
             retries=0,
@@ -1,19 +1,26 @@
 """Basic outgoing sync Client"""
 
 from enum import StrEnum
+from hashlib import sha256
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from deepmerge import always_merger
 from django.db import DatabaseError
+from orjson import OPT_SORT_KEYS, dumps
+from prometheus_client import Counter
+from pydantic import BaseModel
 from structlog.stdlib import get_logger
 
 from authentik.core.expression.exceptions import (
     PropertyMappingExpressionException,
 )
 from authentik.events.models import Event, EventAction
+from authentik.events.utils import sanitize_item
 from authentik.lib.expression.exceptions import ControlFlowException
 from authentik.lib.sync.mapper import PropertyMappingManager
 from authentik.lib.sync.outgoing.exceptions import NotFoundSyncException, StopSync
+from authentik.lib.sync.outgoing.pipeline import RequestLimiter
 
 if TYPE_CHECKING:
     from django.db.models import Model
@@ -21,6 +28,19 @@ if TYPE_CHECKING:
     from authentik.lib.sync.outgoing.models import OutgoingSyncProvider
 
 
+COUNTER_OUTGOING_SYNC_WRITES = Counter(
+    "authentik_outgoing_sync_writes",
+    "Objects written by outgoing sync providers, by whether they were pushed or skipped",
+    ["provider_type", "object_type", "result"],
+)
+
+
+class WriteResult(StrEnum):
+    created = "created"
+    updated = "updated"
+    skipped = "skipped"
+
+
 class Direction(StrEnum):
     add = "add"
     remove = "remove"
@@ -52,37 +72,89 @@ class BaseOutgoingSyncClient[
     def __init__(self, provider: TProvider):
         self.logger = get_logger().bind(provider=provider.name)
         self.provider = provider
-
-    def create(self, obj: TModel) -> TConnection:
-        """Create object in remote destination"""
+        # Number of objects written by this client, by `WriteResult`
+        self.write_results: dict[WriteResult, int] = {}
+        self._write_results_lock = Lock()
+        # Shared by all threads writing with this client
+        self.limiter = RequestLimiter(provider.sync_page_concurrency)
+
+    def create(self, obj: TModel, schema: TSchema | None = None) -> TConnection:
+        """Create object in remote destination, using `schema` when it was already
+        converted"""
         raise NotImplementedError()
 
-    def update(self, obj: TModel, connection: TConnection):
-        """Update object in remote destination"""
+    def update(self, obj: TModel, connection: TConnection, schema: TSchema | None = None):
+        """Update object in remote destination, using `schema` when it was already
+        converted"""
         raise NotImplementedError()
 
-    def write(self, obj: TModel) -> tuple[TConnection, bool]:
+    def write(
+        self, obj: TModel, force: bool = False
+    ) -> tuple[TConnection | None, WriteResult | None]:
         """Write object to destination. Uses self.create and self.update, but
-        can be overwritten for further logic"""
+        can be overwritten for further logic. Objects whose schema didn't change since they
+        were last written are skipped, unless `force` is set. Returns the connection and how
+        the object was written, or `None` for both when the object couldn't be written."""
         connection = self.connection_type.objects.filter(
             provider=self.provider, **{self.connection_type_query: obj}
         ).first()
         try:
             if not connection:
-                connection = self.create(obj)
-                return connection, True
+                return self._write_create(obj), WriteResult.created
+            schema = self.to_schema(obj, connection)
+            schema_hash = self.schema_hash(obj, schema)
+            if not force and schema_hash == connection.schema_hash:
+                self._write_done(obj, None, WriteResult.skipped)
+                return connection, WriteResult.skipped
             try:
-                self.update(obj, connection)
-                return connection, False
+                self.update(obj, connection, schema)
+                self._write_done(obj, connection, WriteResult.updated, schema_hash)
+                return connection, WriteResult.updated
             except NotFoundSyncException:
                 connection.delete()
-                connection = self.create(obj)
-                return connection, True
+                return self._write_create(obj), WriteResult.created
         except DatabaseError as exc:
             self.logger.warning("Failed to write object", obj=obj, exc=exc)
             if connection:
                 connection.delete()
-        return None, False
+        return None, None
+
+    def _write_create(self, obj: TModel) -> TConnection:
+        """Create `obj` in the remote system"""
+        schema = self.to_schema(obj, None)
+        # Hashed before creating, as `create` may modify the schema. When mappings depend on
+        # the connection, the next sync updates the object once.
+        schema_hash = self.schema_hash(obj, schema)
+        connection = self.create(obj, schema)
+        self._write_done(obj, connection, WriteResult.created, schema_hash)
+        return connection
+
+    def _write_done(
+        self,
+        obj: TModel,
+        connection: TConnection | None,
+        result: WriteResult,
+        schema_hash: str = "",
+    ):
+        """Count the written object and store the hash of its schema on `connection`"""
+        with self._write_results_lock:
+            self.write_results[result] = self.write_results.get(result, 0) + 1
+        COUNTER_OUTGOING_SYNC_WRITES.labels(
+            provider_type=self.provider._meta.model_name,
+            object_type=obj._meta.model_name,
+            result=result,
+        ).inc()
+        if not connection:
+            return
+        connection.schema_hash = schema_hash
+        connection.save(update_fields=["schema_hash"])
+
+    def schema_hash(self, obj: TModel, schema: TSchema) -> str:
+        """Stable hash of `schema`, to detect objects that didn't change since they were
+        last written"""
+        if isinstance(schema, BaseModel):
+            schema = schema.model_dump(mode="json", exclude_unset=True)
+        return sha256(dumps(sanitize_item(schema), option=OPT_SORT_KEYS)).hexdigest()
 
     def delete(self, identifier: str):
         """Delete object from destination"""
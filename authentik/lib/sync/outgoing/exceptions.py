@@ -91,3 +91,14 @@ class StopSync(BaseSyncException):
         if self.mapping:
             msg += f" (mapping {self.mapping})"
         return msg
+
+
+class ThrottledSyncException(TransientSyncException):
+    """Exception when the remote system asked to slow down, for example with a 429 response"""
+
+    error_prefix = "Throttled"
+    error_default = "Throttled by remote system"
+
+    def __init__(self, response=None, retry_after: str | None = None):
+        super().__init__(response)
+        self.retry_after = retry_after
@@ -2,7 +2,7 @@ from typing import Any, Self
 
 import pglock
 from django.core.paginator import Paginator
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import connection, models
 from django.db.models import Model, QuerySet, TextChoices
 from django.utils.translation import gettext_lazy as _
@@ -37,6 +37,14 @@ class OutgoingSyncProvider(ScheduledModel, Model):
         default="minutes=30",
         validators=[timedelta_string_validator],
     )
+    sync_page_concurrency = models.PositiveIntegerField(
+        help_text=_(
+            "Controls the number of objects of a page which are synced in parallel. Requests are "
+            "throttled further when the remote system asks to slow down."
+        ),
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(32)],
+    )
 
     dry_run = models.BooleanField(
         default=False,
@@ -0,0 +1,192 @@
+"""Concurrent writes and request backpressure for outgoing sync"""
+
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from contextvars import copy_context
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from queue import Empty, Queue
+from random import uniform
+from threading import Condition, Event, Thread
+from time import monotonic
+
+from django.db import connection
+from structlog.stdlib import get_logger
+
+from authentik.lib.sync.outgoing.exceptions import ThrottledSyncException
+
+LOGGER = get_logger()
+# How often a throttled request is retried before the object is given up on
+MAX_RETRIES = 4
+# Longest time a single throttled request waits, regardless of its Retry-After header
+MAX_RETRY_DELAY = 60
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait according to a Retry-After header, which is either a number of
+    seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds(), 0)
+    except TypeError, ValueError:
+        return None
+
+
+class RequestLimiter:
+    """Limit the number of requests a client has in flight at once.
+
+    The limit starts at `max_in_flight`. Whenever the remote system throttles a request, the
+    limit is halved and no requests are sent until the delay it asked for has passed. After
+    as many requests as the current limit succeeded, the limit is raised by one, up to
+    `max_in_flight`.
+
+    With a single request in flight, requests are neither paused nor retried, so that objects
+    fail right away as they do without concurrency."""
+
+    def __init__(self, max_in_flight: int = 1) -> None:
+        self.max_in_flight = max(max_in_flight, 1)
+        self.limit = self.max_in_flight
+        self._in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._condition = Condition()
+
+    @contextmanager
+    def slot(self):
+        """Wait until a request may be sent, and hold a slot while it is in flight"""
+        with self._condition:
+            while True:
+                delay = self._paused_until - monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                elif self._in_flight >= self.limit:
+                    self._condition.wait()
+                else:
+                    break
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def succeeded(self):
+        """Record a request which was not throttled"""
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_in_flight:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def throttled(self, retry_after: str | None = None, attempt: int = 0) -> float:
+        """Record a throttled request and pause all requests, returns the delay in seconds"""
+        if self.max_in_flight == 1:
+            return 0
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            # Add jitter so that requests throttled at the same time aren't retried at once
+            delay = 2**attempt + uniform(0, 1)  # nosec
+        delay = min(delay, MAX_RETRY_DELAY)
+        with self._condition:
+            self.limit = max(self.limit // 2, 1)
+            self._successes = 0
+            self._paused_until = max(self._paused_until, monotonic() + delay)
+        return delay
+
+    def send[T](self, send: Callable[[], T]) -> T:
+        """Call `send` once a request may be sent. While it raises `ThrottledSyncException`,
+        it is retried after the requested delay, up to `MAX_RETRIES` times."""
+        if self.max_in_flight == 1:
+            return send()
+        attempt = 0
+        while True:
+            try:
+                with self.slot():
+                    result = send()
+            except ThrottledSyncException as exc:
+                delay = self.throttled(exc.retry_after, attempt)
+                if attempt >= MAX_RETRIES:
+                    raise
+                LOGGER.info("Request throttled by remote system", delay=delay, attempt=attempt)
+                attempt += 1
+                continue
+            self.succeeded()
+            return result
+
+
+class WritePipeline[T]:
+    """Write objects with up to `workers` threads, reporting results in the calling thread.
+
+    `write` returns the exception an object failed with, if any, and runs in the worker
+    threads. `report` runs in the calling thread for each written object, in the order writes
+    finish, and returns False to stop writing further objects. Worker threads use the tenant
+    of the calling thread and close their database connection when they're done."""
+
+    def __init__(
+        self,
+        write: Callable[[T], Exception | None],
+        report: Callable[[T, Exception | None], bool],
+        workers: int = 1,
+    ) -> None:
+        self.write = write
+        self.report = report
+        self.workers = max(workers, 1)
+
+    def run(self, objects: Iterable[T]):
+        if self.workers == 1:
+            for obj in objects:
+                if not self.report(obj, self.write(obj)):
+                    break
+            return
+        pending: Queue[T] = Queue()
+        for obj in objects:
+            pending.put(obj)
+        total = pending.qsize()
+        done: Queue[tuple[T, Exception | None, Exception | None]] = Queue()
+        stop = Event()
+        tenant = getattr(connection, "tenant", None)
+        threads = [
+            Thread(
+                target=copy_context().run,
+                args=(self._work, tenant, pending, done, stop),
+                name=f"authentik-sync-{idx}",
+                daemon=True,
+            )
+            for idx in range(min(self.workers, total))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(total):
+                obj, result, error = done.get()
+                if error:
+                    raise error
+                if not self.report(obj, result):
+                    break
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _work(self, tenant, pending: Queue[T], done: Queue, stop: Event):
+        if tenant:
+            connection.set_tenant(tenant)
+        try:
+            while not stop.is_set():
+                try:
+                    obj = pending.get_nowait()
+                except Empty:
+                    return
+                try:
+                    done.put((obj, self.write(obj), None))
+                except Exception as exc:  # noqa: BLE001
+                    done.put((obj, None, exc))
+        finally:
+            connection.close()
@@ -1,15 +1,15 @@
 from django.core.paginator import Paginator
 from django.db.models import Model, QuerySet
 from django.db.models.query import Q
+from django_dramatiq_postgres.composition import group
 from dramatiq.actor import Actor
-from dramatiq.composition import group
 from dramatiq.errors import Retry
 from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.core.expression.exceptions import SkipObjectException
 from authentik.core.models import Group, User
 from authentik.events.utils import sanitize_item
-from authentik.lib.sync.outgoing.base import Direction
+from authentik.lib.sync.outgoing.base import Direction, WriteResult
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
     DryRunRejected,
@@ -18,6 +18,7 @@ from authentik.lib.sync.outgoing.exceptions import (
     TransientSyncException,
 )
 from authentik.lib.sync.outgoing.models import OutgoingSyncProvider
+from authentik.lib.sync.outgoing.pipeline import WritePipeline
 from authentik.lib.utils.errors import exception_to_dict
 from authentik.lib.utils.reflection import class_to_path, path_to_class
 from authentik.lib.utils.time import timedelta_from_string
@@ -42,6 +43,7 @@ class SyncTasks:
         sync_objects: Actor[[str, int, int, bool], None],
         paginator: Paginator,
         object_type: type[User | Group],
+        force: bool = False,
         **options,
     ):
         tasks = []
@@ -49,6 +51,7 @@ class SyncTasks:
         for page in paginator.page_range:
             page_sync = sync_objects.message_with_options(
                 args=(class_to_path(object_type), page, provider.pk),
+                kwargs={"force": force},
                 time_limit=time_limit,
                 # Assign tasks to the same schedule as the current one
                 rel_obj=current_task.rel_obj,
@@ -62,6 +65,7 @@ class SyncTasks:
         self,
         provider_pk: int,
         sync_objects: Actor[[str, int, int, bool], None],
+        force: bool = False,
     ):
         task = CurrentTask.get_task()
         self.logger = get_logger().bind(
@@ -90,6 +94,7 @@ class SyncTasks:
                         sync_objects=sync_objects,
                         paginator=provider.get_paginator(User),
                         object_type=User,
+                        force=force,
                     )
                 )
                 group_tasks = group(
@@ -99,6 +104,7 @@ class SyncTasks:
                         sync_objects=sync_objects,
                         paginator=provider.get_paginator(Group),
                         object_type=Group,
+                        force=force,
                     )
                 )
                 users_tasks.run().wait(timeout=provider.get_object_sync_time_limit_ms(User))
@@ -147,6 +153,7 @@ class SyncTasks:
         page: int,
         provider_pk: int,
         override_dry_run=False,
+        force=False,
         **filter,
     ):
         task = CurrentTask.get_task()
@@ -180,13 +187,28 @@ class SyncTasks:
             client.discover()
         self.logger.debug("starting sync for page", page=page)
         task.info(f"Syncing page {page} or {_object_type._meta.verbose_name_plural}")
-        for obj in paginator.page(page).object_list:
-            obj: Model
+
+        def write(obj: Model) -> Exception | None:
+            try:
+                client.write(obj, force=force)
+            except (
+                SkipObjectException,
+                DryRunRejected,
+                BadRequestSyncException,
+                TransientSyncException,
+                StopSync,
+            ) as exc:
+                return exc
+            return None
+
+        def report(obj: Model, result: Exception | None) -> bool:
+            """Log why writing `obj` failed, returns False when the sync should stop"""
             try:
-                client.write(obj)
+                if result:
+                    raise result
             except SkipObjectException:
                 self.logger.debug("skipping object due to SkipObject", obj=obj)
-                continue
+                return True
             except DryRunRejected as exc:
                 task.info(
                     "Dropping mutating request due to dry run",
@@ -216,7 +238,20 @@ class SyncTasks:
                     f"Stopping sync due to error: {exc.detail()}",
                     obj=sanitize_item(obj),
                 )
-                break
+                return False
+            return True
+
+        # Objects are written by worker threads when the provider syncs concurrently, however
+        # errors are reported to the task from this thread
+        WritePipeline(write, report, provider.sync_page_concurrency).run(
+            paginator.page(page).object_list
+        )
+        task.info(
+            f"Synced page {page} of {_object_type._meta.verbose_name_plural}",
+            pushed=client.write_results.get(WriteResult.created, 0)
+            + client.write_results.get(WriteResult.updated, 0),
+            skipped=client.write_results.get(WriteResult.skipped, 0),
+        )
 
     def sync_signal_direct_dispatch(
         self,
@@ -38,6 +38,20 @@ class TestEvaluator(TestCase):
         """Test expr_is_group_member"""
         self.assertFalse(BaseEvaluator.expr_is_group_member(create_test_admin_user(), name="test"))
 
+    def test_compile_cache(self):
+        """Test that compiled expressions are shared between evaluators"""
+        filename = generate_id()
+        first = BaseEvaluator(filename)
+        first._context = {"foo": "bar"}
+        second = BaseEvaluator(filename)
+        second._context = {"foo": "baz"}
+        self.assertIs(first.compile("return foo"), second.compile("return foo"))
+        self.assertEqual(second.evaluate("return foo"), "baz")
+        # Different context keys result in a different handler signature
+        third = BaseEvaluator(filename)
+        third._context = {"bar": "baz"}
+        self.assertIsNot(first.compile("return foo"), third.compile("return foo"))
+
     def test_expr_event_create(self):
         """Test expr_event_create"""
         evaluator = BaseEvaluator(generate_id())
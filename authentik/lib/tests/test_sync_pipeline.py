@@ -0,0 +1,113 @@
+"""Outgoing sync pipeline tests"""
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from threading import get_ident
+
+from django.test import TestCase
+
+from authentik.lib.sync.outgoing.exceptions import ThrottledSyncException
+from authentik.lib.sync.outgoing.pipeline import (
+    MAX_RETRIES,
+    RequestLimiter,
+    WritePipeline,
+    parse_retry_after,
+)
+
+
+class TestSyncPipeline(TestCase):
+    """Outgoing sync pipeline tests"""
+
+    def test_parse_retry_after(self):
+        """Test parsing Retry-After headers"""
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("foo"))
+        self.assertEqual(parse_retry_after("5"), 5)
+        self.assertEqual(parse_retry_after("-5"), 0)
+        retry_at = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(retry_at), 30, delta=2)
+
+    def test_limiter_retry(self):
+        """Test throttled requests are retried and lower the limit"""
+        limiter = RequestLimiter(4)
+        attempts = []
+
+        def send():
+            attempts.append(True)
+            if len(attempts) == 1:
+                raise ThrottledSyncException(retry_after="0")
+            return "foo"
+
+        self.assertEqual(limiter.send(send), "foo")
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(limiter.limit, 2)
+        limiter.send(lambda: None)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_limiter_max_retries(self):
+        """Test throttled requests are only retried up to `MAX_RETRIES` times"""
+        limiter = RequestLimiter(2)
+        attempts = []
+
+        def send():
+            attempts.append(True)
+            raise ThrottledSyncException(retry_after="0")
+
+        with self.assertRaises(ThrottledSyncException):
+            limiter.send(send)
+        self.assertEqual(len(attempts), MAX_RETRIES + 1)
+
+    def test_limiter_serial(self):
+        """Test requests aren't retried without concurrency"""
+        limiter = RequestLimiter(1)
+        attempts = []
+
+        def send():
+            attempts.append(True)
+            raise ThrottledSyncException(retry_after="0")
+
+        with self.assertRaises(ThrottledSyncException):
+            limiter.send(send)
+        self.assertEqual(len(attempts), 1)
+        self.assertEqual(limiter.throttled("10"), 0)
+
+    def test_pipeline(self):
+        """Test objects are written by multiple threads and reported in this thread"""
+        threads = set()
+        reported = {}
+
+        def write(obj: int) -> Exception | None:
+            threads.add(get_ident())
+            return ValueError() if obj % 2 else None
+
+        def report(obj: int, result: Exception | None) -> bool:
+            self.assertNotIn(get_ident(), threads)
+            reported[obj] = result
+            return True
+
+        WritePipeline(write, report, 4).run(range(20))
+        self.assertEqual(set(reported), set(range(20)))
+        self.assertIsInstance(reported[1], ValueError)
+        self.assertIsNone(reported[2])
+
+    def test_pipeline_stop(self):
+        """Test no more objects are reported once the report asks to stop"""
+        reported = []
+
+        def report(obj: int, result: Exception | None) -> bool:
+            reported.append(obj)
+            return False
+
+        WritePipeline(lambda obj: None, report, 4).run(range(20))
+        self.assertEqual(len(reported), 1)
+        WritePipeline(lambda obj: None, report, 1).run(range(20))
+        self.assertEqual(len(reported), 2)
+
+    def test_pipeline_error(self):
+        """Test unexpected errors are raised in this thread"""
+
+        def write(obj: int) -> Exception | None:
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            WritePipeline(write, lambda obj, result: True, 4).run(range(20))
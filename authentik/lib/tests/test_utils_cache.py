@@ -0,0 +1,75 @@
+"""Test cache utils"""
+
+from time import monotonic
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authentik.lib.generators import generate_id
+from authentik.lib.utils.cache import CacheNamespace
+
+
+class TestCacheNamespace(TestCase):
+    """Test CacheNamespace"""
+
+    def setUp(self):
+        self.namespace = CacheNamespace(f"goauthentik.io/tests/{generate_id()}/")
+
+    def test_invalidate(self):
+        """Test invalidating the namespace"""
+        key = self.namespace.key("foo")
+        cache.set(key, "bar")
+        self.assertEqual(self.namespace.key("foo"), key)
+        self.assertEqual(self.namespace.count(), 1)
+        self.namespace.invalidate()
+        self.assertNotEqual(self.namespace.key("foo"), key)
+        self.assertIsNone(cache.get(self.namespace.key("foo")))
+        self.assertEqual(self.namespace.count(), 0)
+
+    def test_invalidate_scope(self):
+        """Test invalidating a single scope"""
+        key_a = self.namespace.key("foo", scope="a")
+        key_b = self.namespace.key("foo", scope="b")
+        cache.set(key_a, "bar")
+        cache.set(key_b, "bar")
+        self.namespace.invalidate("a")
+        self.assertNotEqual(self.namespace.key("foo", scope="a"), key_a)
+        self.assertEqual(self.namespace.key("foo", scope="b"), key_b)
+        self.assertEqual(self.namespace.count("a"), 0)
+        self.assertEqual(self.namespace.count("b"), 1)
+        # Invalidating the namespace includes all scopes
+        self.namespace.invalidate()
+        self.assertNotEqual(self.namespace.key("foo", scope="b"), key_b)
+
+    def test_local(self):
+        """Test generations are re-used in-process until they time out"""
+        other = CacheNamespace(self.namespace.prefix)
+        key = self.namespace.key("foo", scope="a")
+        self.assertEqual(other.key("foo", scope="a"), key)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.namespace.key("foo", scope="a"), key)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        # Invalidations are seen immediately by the invalidating namespace, and by others
+        # once their generations time out
+        other.invalidate("a")
+        self.assertNotEqual(other.key("foo", scope="a"), key)
+        self.assertEqual(self.namespace.key("foo", scope="a"), key)
+        with patch(
+            "authentik.lib.utils.cache.monotonic",
+            return_value=monotonic() + self.namespace.local_timeout,
+        ):
+            self.assertEqual(self.namespace.key("foo", scope="a"), other.key("foo", scope="a"))
+
+    def test_prefetch(self):
+        """Test generations of multiple scopes are read at once"""
+        self.namespace.key("foo", scope="a")
+        self.namespace.key("foo", scope="b")
+        namespace = CacheNamespace(self.namespace.prefix)
+        with CaptureQueriesContext(connection) as ctx:
+            namespace.prefetch(["a", "b"])
+            namespace.key("foo", scope="a")
+            namespace.key("foo", scope="b")
+        self.assertEqual(len(ctx.captured_queries), 1)
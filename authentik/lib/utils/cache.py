@@ -0,0 +1,109 @@
+"""Cache utilities"""
+
+from collections.abc import Iterable
+from time import monotonic, time_ns
+
+from django.core.cache import cache
+from django.db import connection
+
+from authentik.lib.config import CONFIG
+
+# Generations read by this process are re-used for this many seconds
+GENERATION_TIMEOUT = float(CONFIG.get("cache.timeout_generations", 1))
+# Expired generations are removed once a namespace holds this many
+GENERATION_MAX_ENTRIES = 10000
+
+
+class CacheNamespace:
+    """Group of cache keys which can be invalidated at once, optionally per scope (for example
+    per user).
+
+    Keys include the current generation of the namespace and of their scope, which are stored
+    in the cache themselves. Invalidating replaces the generation, so entries with the previous
+    generation are never read again and age out with their timeout. This doesn't need to find
+    the existing keys, which requires scanning the cache table.
+
+    Generations are re-used in-process for `local_timeout` seconds, so invalidations by other
+    processes can take that long to be seen."""
+
+    def __init__(self, prefix: str, local_timeout: float = GENERATION_TIMEOUT) -> None:
+        self.prefix = prefix
+        self.local_timeout = local_timeout
+        # Generations known to this process by schema and generation key, with the time they
+        # were read at
+        self._local: dict[tuple[str, str], tuple[str, float]] = {}
+
+    def _generation_key(self, scope: str = "") -> str:
+        if scope:
+            return f"{self.prefix}generation/{scope}"
+        return f"{self.prefix}generation"
+
+    def _get_local(self, key: str) -> str | None:
+        entry = self._local.get((connection.schema_name, key))
+        if entry and monotonic() - entry[1] < self.local_timeout:
+            return entry[0]
+        return None
+
+    def _set_local(self, key: str, generation: str):
+        if self.local_timeout <= 0:
+            return
+        if len(self._local) >= GENERATION_MAX_ENTRIES:
+            threshold = monotonic() - self.local_timeout
+            self._local = {k: v for k, v in self._local.items() if v[1] >= threshold}
+        self._local[(connection.schema_name, key)] = (generation, monotonic())
+
+    def _resolve(self, keys: list[str]) -> dict[str, str]:
+        """Get the generations of `keys`, reading those not known to this process with a
+        single query"""
+        generations = {}
+        for key in keys:
+            if (generation := self._get_local(key)) is not None:
+                generations[key] = generation
+        missing = [key for key in keys if key not in generations]
+        if not missing:
+            return generations
+        fetched = cache.get_many(missing)
+        for key in missing:
+            if key not in fetched:
+                # Another process might've set the generation in the meantime
+                cache.add(key, f"{time_ns():x}", None)
+                fetched[key] = cache.get(key)
+            generations[key] = fetched[key]
+            self._set_local(key, fetched[key])
+        return generations
+
+    def _generations(self, scope: str = "") -> list[str]:
+        keys = [self._generation_key()]
+        if scope:
+            keys.append(self._generation_key(scope))
+        generations = self._resolve(keys)
+        return [generations[key] for key in keys]
+
+    def prefetch(self, scopes: Iterable[str]):
+        """Read the generations of the namespace and all `scopes` at once, so that getting
+        keys of these scopes doesn't query the cache"""
+        self._resolve([self._generation_key(), *(self._generation_key(scope) for scope in scopes)])
+
+    def current_prefix(self, scope: str = "") -> str:
+        """Get the prefix of all keys of the current generation, of `scope` if given"""
+        generations = self._generations(scope)
+        prefix = f"{self.prefix}{generations[0]}/"
+        if scope:
+            prefix += f"{scope}/{generations[1]}/"
+        return prefix
+
+    def key(self, key: str = "", scope: str = "") -> str:
+        """Get the cache key for `key` in `scope` at the current generation"""
+        return f"{self.current_prefix(scope)}{key}"
+
+    def invalidate(self, scope: str = "") -> None:
+        """Invalidate all keys, or all keys of `scope`"""
+        key = self._generation_key(scope)
+        generation = f"{time_ns():x}"
+        cache.set(key, generation, None)
+        self._set_local(key, generation)
+
+    def count(self, scope: str = "") -> int:
+        """Count the keys of the current generation, of `scope` if given. Without a scope, this
+        includes keys of invalidated scopes that didn't expire yet."""
+        return len(cache.keys(f"{self.current_prefix(scope)}*") or [])
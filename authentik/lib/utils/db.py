@@ -28,3 +28,33 @@ def chunked_queryset[T: Model](queryset: QuerySet[T], chunk_size: int = 1_000) -
         reset_queries()
         gc.collect()
         yield from chunk.iterator(chunk_size=chunk_size)
+
+
+def delete_batched[T: Model](queryset: QuerySet[T], batch_size: int = 1_000) -> int:
+    """Delete all objects matching `queryset` in batches of `batch_size`. Related objects
+    are collected and signals are sent as with `QuerySet.delete()`. Returns the number of
+    deleted objects, not including related objects."""
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if pks:
+            queryset.model._base_manager.filter(pk__in=pks).delete()
+            deleted += len(pks)
+        if len(pks) < batch_size:
+            return deleted
+
+
+def raw_delete_batched[T: Model](queryset: QuerySet[T], batch_size: int = 10_000) -> int:
+    """Delete all objects matching `queryset` with DELETE statements of up to `batch_size`
+    rows each. No signals are sent and related objects are not collected, so this must only
+    be used for models without side effects on deletion. Returns the number of deleted
+    objects."""
+    deleted = 0
+    while True:
+        batch = queryset.model._base_manager.filter(
+            pk__in=queryset.order_by().values("pk")[:batch_size]
+        )
+        count = batch._raw_delete(batch.db)
+        deleted += count
+        if count < batch_size:
+            return deleted
@@ -1,10 +1,18 @@
 """authentik policy engine"""
 
-from collections.abc import Iterable
+from collections import defaultdict
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import copy_context
+from enum import StrEnum
 from multiprocessing import Pipe, current_process
 from multiprocessing.connection import Connection
+from threading import Event, Lock
+from time import monotonic
 
 from django.core.cache import cache
+from django.db import close_old_connections, connection
 from django.db.models import Count, Q, QuerySet
 from django.http import HttpRequest
 from sentry_sdk import start_span
@@ -12,29 +20,86 @@ from sentry_sdk.tracing import Span
 from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.core.models import User
+from authentik.lib.config import CONFIG
 from authentik.lib.utils.reflection import class_to_path
 from authentik.policies.apps import HIST_POLICIES_ENGINE_TOTAL_TIME, HIST_POLICIES_EXECUTION_TIME
 from authentik.policies.exceptions import PolicyEngineException
 from authentik.policies.models import Policy, PolicyBinding, PolicyBindingModel, PolicyEngineMode
 from authentik.policies.process import PolicyProcess, cache_key
-from authentik.policies.types import PolicyRequest, PolicyResult
+from authentik.policies.types import POLICY_CACHE, PolicyRequest, PolicyResult
 
 CURRENT_PROCESS = current_process()
 
+_THREAD_POOL: ThreadPoolExecutor | None = None
+_THREAD_POOL_LOCK = Lock()
+
+
+class PolicyEngineBackend(StrEnum):
+    """How policies are executed by the policy engine"""
+
+    # Run policies in the current thread, one after the other
+    INLINE = "inline"
+    # Fork a new process for every policy
+    FORK = "fork"
+    # Run policies concurrently in a persistent thread pool
+    THREAD = "thread"
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get the per-process thread pool used to execute policies, creating it when required"""
+    global _THREAD_POOL  # noqa: PLW0603
+    with _THREAD_POOL_LOCK:
+        if _THREAD_POOL is None:
+            _THREAD_POOL = ThreadPoolExecutor(
+                max_workers=CONFIG.get_int("policies.execution_threads", 4),
+                thread_name_prefix="authentik-policy",
+            )
+    return _THREAD_POOL
+
+
+def _execute_in_thread(proc_info: PolicyProcessInfo, tenant) -> PolicyResult:
+    """Execute a policy within a pool thread. Database connections are kept
+    open between executions (subject to CONN_MAX_AGE), and the tenant of the
+    calling thread is activated"""
+    proc_info.started = monotonic()
+    proc_info.running.set()
+    close_old_connections()
+    if tenant:
+        connection.set_tenant(tenant)
+    try:
+        return proc_info.process.timed_execute()
+    finally:
+        close_old_connections()
+
 
 class PolicyProcessInfo:
     """Dataclass to hold all information and communication channels to a process"""
 
     process: PolicyProcess
-    connection: Connection
+    connection: Connection | None
+    future: Future[PolicyResult] | None
     result: PolicyResult | None
     binding: PolicyBinding
+    # When the binding was dispatched, and when a pool thread started executing it
+    dispatched: float
+    started: float | None
+    running: Event
 
-    def __init__(self, process: PolicyProcess, connection: Connection, binding: PolicyBinding):
+    def __init__(
+        self,
+        process: PolicyProcess,
+        connection: Connection | None,
+        binding: PolicyBinding,
+        future: Future[PolicyResult] | None = None,
+    ):
         self.process = process
         self.connection = connection
+        self.future = future
         self.binding = binding
         self.result = None
+        self.dispatched = monotonic()
+        self.started = None
+        self.running = Event()
 
 
 class PolicyEngine:
@@ -42,6 +107,7 @@ class PolicyEngine:
 
     use_cache: bool
     request: PolicyRequest
+    backend: PolicyEngineBackend
 
     logger: BoundLogger
     mode: PolicyEngineMode
@@ -66,8 +132,68 @@ class PolicyEngine:
         self.__cached_policies: list[PolicyResult] = []
         self.__processes: list[PolicyProcessInfo] = []
         self.use_cache = True
+        self.backend = PolicyEngineBackend(
+            CONFIG.get("policies.execution_backend", PolicyEngineBackend.FORK)
+        )
+        if self.backend == PolicyEngineBackend.FORK and not CURRENT_PROCESS._config.get("daemon"):
+            self.backend = PolicyEngineBackend.INLINE
         self.__expected_result_count = 0
         self.__static_result: PolicyResult | None = None
+        # Set by `evaluate_many`, bindings and group PKs which have been fetched in bulk
+        self.__prefetched_bindings: list[PolicyBinding] | None = None
+        self.__prefetched_group_pks: frozenset | None = None
+
+    @classmethod
+    def evaluate_many(
+        cls,
+        pbms: Iterable[PolicyBindingModel],
+        user: User,
+        request: HttpRequest | None = None,
+        setup: Callable[[PolicyEngine], None] | None = None,
+    ) -> Generator[PolicyEngine]:
+        """Evaluate policies for multiple objects at once. Bindings of all objects, their
+        policies and the groups of `user` are each fetched with a single query, and static
+        user/group bindings are decided in memory. Engines are built lazily and yielded in
+        the order of `pbms`. `setup` is called with each engine before it is built."""
+        pbms = list(pbms)
+        if not pbms:
+            return
+        bindings_by_target: dict[str, list[PolicyBinding]] = defaultdict(list)
+        bindings = list(
+            PolicyBinding.objects.filter(
+                target__in=[pbm.pk for pbm in pbms], enabled=True
+            ).order_by("order")
+        )
+        policies = {
+            policy.pk: policy
+            for policy in Policy.objects.filter(
+                pk__in={binding.policy_id for binding in bindings if binding.policy_id}
+            ).select_subclasses()
+        }
+        for binding in bindings:
+            if binding.policy_id:
+                binding.policy = policies[binding.policy_id]
+            bindings_by_target[binding.target_id].append(binding)
+        # Cache keys of the policy bindings of all objects are built with a single query
+        POLICY_CACHE.prefetch(
+            binding.policy_binding_uuid.hex for binding in bindings if binding.policy_id
+        )
+        group_pks = frozenset()
+        if user.pk:
+            group_pks = user.identity.all_group_pks
+        # Context processors (GeoIP, etc) only need to run once
+        shared_request = PolicyRequest(user)
+        if request:
+            shared_request.set_http_request(request)
+        for pbm in pbms:
+            engine = cls(pbm, user)
+            engine.request.http_request = shared_request.http_request
+            engine.request.context.update(shared_request.context)
+            engine.__prefetched_bindings = bindings_by_target[pbm.pk]
+            engine.__prefetched_group_pks = group_pks
+            if setup:
+                setup(engine)
+            yield engine.build()
 
     def bindings(self) -> QuerySet[PolicyBinding] | Iterable[PolicyBinding]:
         """Make sure all Policies are their respective classes"""
@@ -110,7 +236,7 @@ class PolicyEngine:
             ),
         }
         if self.request.user.pk:
-            all_groups = self.request.user.all_groups()
+            all_groups = self.request.user.identity.all_group_pks
             aggrs["passing"] = Count(
                 "pk",
                 filter=Q(
@@ -126,7 +252,30 @@ class PolicyEngine:
                     enabled=True,
                 ),
             )
-        matched_bindings = bindings.aggregate(**aggrs)
+        self._set_static_result(bindings.aggregate(**aggrs))
+
+    def compute_static_bindings_prefetched(
+        self, bindings: list[PolicyBinding], group_pks: frozenset
+    ):
+        """Check static bindings in memory, based on bindings and groups fetched
+        by `evaluate_many`. Equivalent to `compute_static_bindings`."""
+        matched_bindings = {
+            "total": len([x for x in bindings if not x.policy_id and (x.group_id or x.user_id)]),
+        }
+        if self.request.user.pk:
+            passing = 0
+            for binding in bindings:
+                if not binding.group_id and not binding.user_id:
+                    continue
+                matches = (binding.user_id and binding.user_id == self.request.user.pk) or (
+                    binding.group_id and binding.group_id in group_pks
+                )
+                if bool(matches) != binding.negate:
+                    passing += 1
+            matched_bindings["passing"] = passing
+        self._set_static_result(matched_bindings)
+
+    def _set_static_result(self, matched_bindings: dict[str, int]):
         passing = False
         if matched_bindings["total"] == 0 and matched_bindings.get("passing", 0) == 0:
             # If we didn't find any static bindings, do nothing
@@ -145,6 +294,68 @@ class PolicyEngine:
             passing = False
         self.__static_result = PolicyResult(passing)
 
+    def _dispatch(self, binding: PolicyBinding) -> PolicyProcessInfo:
+        """Start evaluating `binding` using the configured backend"""
+        if self.backend == PolicyEngineBackend.THREAD:
+            task = PolicyProcess(binding, self.request, None)
+            self.logger.debug("P_ENG: Submitting to pool", binding=binding, request=self.request)
+            proc_info = PolicyProcessInfo(process=task, connection=None, binding=binding)
+            proc_info.future = get_thread_pool().submit(
+                copy_context().run,
+                _execute_in_thread,
+                proc_info,
+                getattr(connection, "tenant", None),
+            )
+            return proc_info
+        our_end, task_end = Pipe(False)
+        task = PolicyProcess(binding, self.request, task_end)
+        task.daemon = False
+        self.logger.debug("P_ENG: Starting Process", binding=binding, request=self.request)
+        if self.backend == PolicyEngineBackend.INLINE:
+            task.run()
+        else:
+            task.start()
+        return PolicyProcessInfo(process=task, connection=our_end, binding=binding)
+
+    def _collect(self, proc_info: PolicyProcessInfo):
+        """Wait for the result of a dispatched binding"""
+        if proc_info.future:
+            timeout = proc_info.binding.timeout
+            # Timed out policies can't be interrupted and keep occupying their pool thread
+            # until they finish, so waiting for a free thread is limited by the timeout as well
+            queued = max(proc_info.dispatched + timeout - monotonic(), 0)
+            if not proc_info.running.wait(queued):
+                if proc_info.future.cancel():
+                    self.logger.warning(
+                        "P_ENG: No thread available to execute policy",
+                        binding=proc_info.binding,
+                        request=self.request,
+                    )
+                    proc_info.result = PolicyResult(
+                        proc_info.binding.failure_result, "Policy timed out"
+                    )
+                    return
+                # The policy started just now
+                proc_info.running.wait()
+            remaining = max(proc_info.started + timeout - monotonic(), 0)
+            try:
+                proc_info.result = proc_info.future.result(timeout=remaining)
+            except FutureTimeoutError:
+                # Threads can't be killed, so the policy keeps running in the background
+                # and its result is discarded
+                self.logger.warning(
+                    "P_ENG: Policy timed out", binding=proc_info.binding, request=self.request
+                )
+                proc_info.result = PolicyResult(
+                    proc_info.binding.failure_result, "Policy timed out"
+                )
+            return
+        if proc_info.process.is_alive():
+            proc_info.process.join(proc_info.binding.timeout)
+        # Only call .recv() if no result is saved, otherwise we just deadlock here
+        if not proc_info.result:
+            proc_info.result = proc_info.connection.recv()
+
     def build(self) -> PolicyEngine:
         """Build wrapper which monitors performance"""
         with (
@@ -160,11 +371,21 @@ class PolicyEngine:
             span: Span
             span.set_data("pbm", self.__pbm)
             span.set_data("request", self.request)
-            bindings = self.bindings()
-            policy_bindings = bindings
-            if isinstance(bindings, QuerySet):
-                self.compute_static_bindings(bindings)
-                policy_bindings = [x for x in bindings if x.policy]
+            if self.__prefetched_bindings is not None:
+                self.compute_static_bindings_prefetched(
+                    self.__prefetched_bindings, self.__prefetched_group_pks
+                )
+                policy_bindings = [x for x in self.__prefetched_bindings if x.policy_id]
+            else:
+                bindings = self.bindings()
+                policy_bindings = bindings
+                if isinstance(bindings, QuerySet):
+                    self.compute_static_bindings(bindings)
+                    policy_bindings = [x for x in bindings if x.policy]
+            policy_bindings = list(policy_bindings)
+            if self.use_cache:
+                # Cache keys of all bindings are built with a single query
+                POLICY_CACHE.prefetch(x.policy_binding_uuid.hex for x in policy_bindings)
             for binding in policy_bindings:
                 self.__expected_result_count += 1
 
@@ -172,34 +393,28 @@ class PolicyEngine:
                 if self._check_cache(binding):
                     continue
                 self.logger.debug("P_ENG: Evaluating policy", binding=binding, request=self.request)
-                our_end, task_end = Pipe(False)
-                task = PolicyProcess(binding, self.request, task_end)
-                task.daemon = False
-                self.logger.debug("P_ENG: Starting Process", binding=binding, request=self.request)
-                if not CURRENT_PROCESS._config.get("daemon"):
-                    task.run()
-                else:
-                    task.start()
-                self.__processes.append(
-                    PolicyProcessInfo(process=task, connection=our_end, binding=binding)
-                )
+                self.__processes.append(self._dispatch(binding))
             # If all policies are cached, we have an empty list here.
-            for proc_info in self.__processes:
-                if proc_info.process.is_alive():
-                    proc_info.process.join(proc_info.binding.timeout)
-                # Only call .recv() if no result is saved, otherwise we just deadlock here
-                if not proc_info.result:
-                    proc_info.result = proc_info.connection.recv()
-                if proc_info.result and proc_info.result._exec_time:
-                    HIST_POLICIES_EXECUTION_TIME.labels(
-                        binding_order=proc_info.binding.order,
-                        binding_target_type=proc_info.binding.target_type,
-                        binding_target_name=proc_info.binding.target_name,
-                        object_type=(
-                            class_to_path(self.request.obj.__class__) if self.request.obj else ""
-                        ),
-                        mode="execute_process",
-                    ).observe(proc_info.result._exec_time)
+            try:
+                for proc_info in self.__processes:
+                    self._collect(proc_info)
+                    if proc_info.result and proc_info.result._exec_time:
+                        HIST_POLICIES_EXECUTION_TIME.labels(
+                            binding_order=proc_info.binding.order,
+                            binding_target_type=proc_info.binding.target_type,
+                            binding_target_name=proc_info.binding.target_name,
+                            object_type=(
+                                class_to_path(self.request.obj.__class__)
+                                if self.request.obj
+                                else ""
+                            ),
+                            mode="execute_process",
+                        ).observe(proc_info.result._exec_time)
+            finally:
+                # Don't leave policies queued in the pool when collecting results failed
+                for proc_info in self.__processes:
+                    if proc_info.future:
+                        proc_info.future.cancel()
             return self
 
     @property
@@ -0,0 +1,71 @@
+"""authentik policy engine benchmark command"""
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authentik import authentik_version
+from authentik.core.tests.utils import create_test_admin_user
+from authentik.lib.generators import generate_id
+from authentik.policies.engine import PolicyEngine, PolicyEngineBackend
+from authentik.policies.expression.models import ExpressionPolicy
+from authentik.policies.models import PolicyBinding, PolicyBindingModel
+
+
+class Command(BaseCommand):
+    """Benchmark policy engine execution backends"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-b",
+            "--bindings",
+            default=10,
+            type=int,
+            help="How many policies should be bound.",
+        )
+        parser.add_argument(
+            "-i",
+            "--iterations",
+            default=100,
+            type=int,
+            help="How many times the policy engine should be run per backend.",
+        )
+
+    def benchmark_backend(
+        self, backend: PolicyEngineBackend, pbm: PolicyBindingModel, iterations: int
+    ) -> list[float]:
+        """Run the policy engine `iterations` times with `backend`"""
+        user = create_test_admin_user()
+        diffs = []
+        for _ in range(iterations):
+            engine = PolicyEngine(pbm, user)
+            engine.use_cache = False
+            engine.backend = backend
+            start = perf_counter()
+            engine.build()
+            diffs.append(perf_counter() - start)
+        user.delete()
+        return diffs
+
+    def handle(self, *args, **options):
+        """Start benchmark"""
+        with transaction.atomic():
+            pbm = PolicyBindingModel.objects.create()
+            for order in range(options["bindings"]):
+                policy = ExpressionPolicy.objects.create(
+                    name=f"benchmark-{generate_id()}", expression="return True"
+                )
+                PolicyBinding.objects.create(target=pbm, policy=policy, order=order)
+        print(f"Version: {authentik_version()}")
+        print(f"Bindings: {options['bindings']}, iterations: {options['iterations']}")
+        try:
+            for backend in PolicyEngineBackend:
+                values = self.benchmark_backend(backend, pbm, options["iterations"])
+                print(f"Backend: {backend}")
+                print(f"\tMax: {max(values) * 1000:.2f}ms")
+                print(f"\tMin: {min(values) * 1000:.2f}ms")
+                print(f"\tAvg: {sum(values) / len(values) * 1000:.2f}ms")
+        finally:
+            ExpressionPolicy.objects.filter(bindings=pbm).delete()
+            pbm.delete()
@@ -14,7 +14,7 @@ from authentik.lib.config import CONFIG
 from authentik.lib.utils.errors import exception_to_dict
 from authentik.policies.exceptions import PolicyException
 from authentik.policies.models import PolicyBinding
-from authentik.policies.types import CACHE_PREFIX, PolicyRequest, PolicyResult
+from authentik.policies.types import POLICY_CACHE, PolicyRequest, PolicyResult
 
 LOGGER = get_logger()
 
@@ -25,12 +25,12 @@ PROCESS_CLASS = FORK_CTX.Process
 
 def cache_key(binding: PolicyBinding, request: PolicyRequest) -> str:
     """Generate Cache key for policy"""
-    prefix = f"{CACHE_PREFIX}{binding.policy_binding_uuid.hex}_"
+    key = ""
     if request.http_request and hasattr(request.http_request, "session"):
-        prefix += f"_{request.http_request.session.session_key}"
+        key += f"_{request.http_request.session.session_key}"
     if request.user:
-        prefix += f"#{request.user.pk}"
-    return prefix
+        key += f"#{request.user.pk}"
+    return POLICY_CACHE.key(key, scope=binding.policy_binding_uuid.hex)
 
 
 class PolicyProcess(PROCESS_CLASS):
@@ -130,9 +130,9 @@ class PolicyProcess(PROCESS_CLASS):
             span.set_data("request", self.request)
             return self.execute()
 
-    def run(self):  # pragma: no cover
-        """Task wrapper to run policy checking"""
-        result = None
+    def timed_execute(self) -> PolicyResult:
+        """Run policy and record its execution time. Never raises, any
+        exception is converted into a failing result"""
         try:
             start = perf_counter()
             result = self.profiling_wrapper()
@@ -141,5 +141,12 @@ class PolicyProcess(PROCESS_CLASS):
         except Exception as exc:  # noqa
             LOGGER.warning("Policy failed to run", exc=exc)
             result = PolicyResult(False, str(exc))
+        return result
+
+    def run(self):  # pragma: no cover
+        """Task wrapper to run policy checking"""
+        result = None
+        try:
+            result = self.timed_execute()
         finally:
             self.connection.send(result)
@@ -72,6 +72,8 @@ class ReputationPolicy(Policy):
 class Reputation(InternallyManagedMixin, ExpiringModel, SerializerModel):
     """Reputation for user and or IP."""
 
+    expire_in_bulk = True
+
     objects = PostgresManager()
 
     reputation_uuid = models.UUIDField(primary_key=True, unique=True, default=uuid4)
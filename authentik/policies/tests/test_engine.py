@@ -1,20 +1,23 @@
 """policy engine tests"""
 
-from django.core.cache import cache
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 from django.db import connections
 from django.test import TestCase
 from django.test.utils import CaptureQueriesContext
 
 from authentik.core.models import Group
 from authentik.core.tests.utils import create_test_user
+from authentik.lib.config import CONFIG
 from authentik.lib.generators import generate_id
 from authentik.policies.dummy.models import DummyPolicy
-from authentik.policies.engine import PolicyEngine
+from authentik.policies.engine import PolicyEngine, PolicyEngineBackend
 from authentik.policies.exceptions import PolicyEngineException
 from authentik.policies.expression.models import ExpressionPolicy
 from authentik.policies.models import Policy, PolicyBinding, PolicyBindingModel, PolicyEngineMode
 from authentik.policies.tests.test_process import clear_policy_cache
-from authentik.policies.types import CACHE_PREFIX
+from authentik.policies.types import POLICY_CACHE
 
 
 class TestPolicyEngine(TestCase):
@@ -135,6 +138,51 @@ class TestPolicyEngine(TestCase):
         self.assertEqual(result.passing, True)
         self.assertEqual(result.messages, ("division by zero",))
 
+    @CONFIG.patch("policies.execution_backend", "thread")
+    def test_engine_thread(self):
+        """Test thread backend"""
+        pbm = PolicyBindingModel.objects.create(policy_engine_mode=PolicyEngineMode.MODE_ANY)
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_false, order=0)
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_true, order=1)
+        engine = PolicyEngine(pbm, self.user)
+        engine.request.debug = True
+        self.assertEqual(engine.backend, PolicyEngineBackend.THREAD)
+        result = engine.build().result
+        self.assertEqual(result.passing, True)
+        self.assertEqual(result.messages, ("dummy", "dummy"))
+
+    @CONFIG.patch("policies.execution_backend", "thread")
+    def test_engine_thread_timeout(self):
+        """Test thread backend with a policy exceeding its timeout"""
+        pbm = PolicyBindingModel.objects.create()
+        policy = DummyPolicy.objects.create(name=generate_id(), result=True, wait_min=2, wait_max=3)
+        PolicyBinding.objects.create(
+            target=pbm, policy=policy, order=0, timeout=1, failure_result=False
+        )
+        engine = PolicyEngine(pbm, self.user)
+        engine.request.debug = True
+        result = engine.build().result
+        self.assertEqual(result.passing, False)
+        self.assertEqual(result.messages, ("Policy timed out",))
+
+    @CONFIG.patch("policies.execution_backend", "thread")
+    def test_engine_thread_queued(self):
+        """Test thread backend timeouts only start once a policy is executed"""
+        pbm = PolicyBindingModel.objects.create()
+        policy = DummyPolicy.objects.create(name=generate_id(), result=True, wait_min=2, wait_max=3)
+        PolicyBinding.objects.create(target=pbm, policy=policy, order=0, timeout=3)
+        PolicyBinding.objects.create(target=pbm, policy=policy, order=1, timeout=3)
+        with (
+            ThreadPoolExecutor(max_workers=1) as pool,
+            patch("authentik.policies.engine.get_thread_pool", return_value=pool),
+        ):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            engine.request.debug = True
+            result = engine.build().result
+        self.assertEqual(result.passing, True)
+        self.assertEqual(result.messages, ("dummy", "dummy"))
+
     def test_engine_policy_type(self):
         """Test invalid policy type"""
         pbm = PolicyBindingModel.objects.create()
@@ -148,11 +196,11 @@ class TestPolicyEngine(TestCase):
         pbm = PolicyBindingModel.objects.create()
         binding = PolicyBinding.objects.create(target=pbm, policy=self.policy_false, order=0)
         engine = PolicyEngine(pbm, self.user)
-        self.assertEqual(len(cache.keys(f"{CACHE_PREFIX}{binding.policy_binding_uuid.hex}*")), 0)
+        self.assertEqual(POLICY_CACHE.count(binding.policy_binding_uuid.hex), 0)
         self.assertEqual(engine.build().passing, False)
-        self.assertEqual(len(cache.keys(f"{CACHE_PREFIX}{binding.policy_binding_uuid.hex}*")), 1)
+        self.assertEqual(POLICY_CACHE.count(binding.policy_binding_uuid.hex), 1)
         self.assertEqual(engine.build().passing, False)
-        self.assertEqual(len(cache.keys(f"{CACHE_PREFIX}{binding.policy_binding_uuid.hex}*")), 1)
+        self.assertEqual(POLICY_CACHE.count(binding.policy_binding_uuid.hex), 1)
 
     def test_engine_static_bindings(self):
         """Test static bindings"""
@@ -194,6 +242,42 @@ class TestPolicyEngine(TestCase):
                 self.assertLess(ctx.final_queries, 1000)
                 self.assertEqual(engine.result.passing, case["passing"])
 
+    def test_engine_evaluate_many(self):
+        """Test evaluating multiple objects at once"""
+        user = create_test_user()
+        pbm_static = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(target=pbm_static, group=self.group_member, order=0)
+        pbm_static_negate = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(
+            target=pbm_static_negate, group=self.group_member, negate=True, order=0
+        )
+        pbm_static_user = PolicyBindingModel.objects.create(
+            policy_engine_mode=PolicyEngineMode.MODE_ALL
+        )
+        PolicyBinding.objects.create(target=pbm_static_user, user=self.user, order=0)
+        PolicyBinding.objects.create(target=pbm_static_user, user=user, order=1)
+        pbm_policy = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(target=pbm_policy, policy=self.policy_true, order=0)
+        pbm_empty = PolicyBindingModel.objects.create()
+        pbms = [pbm_static, pbm_static_negate, pbm_static_user, pbm_policy, pbm_empty]
+        expected = [True, False, False, True, True]
+
+        for pbm, passing in zip(pbms, expected, strict=True):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            self.assertEqual(engine.build().passing, passing)
+
+        def setup(engine: PolicyEngine):
+            engine.use_cache = False
+            # Don't cache results, which would cause additional queries
+            engine.request.debug = True
+
+        with CaptureQueriesContext(connections["default"]) as ctx:
+            engines = list(PolicyEngine.evaluate_many(pbms, self.user, setup=setup))
+        # bindings, policies and groups
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual([engine.passing for engine in engines], expected)
+
     def test_engine_group_complex(self):
         """Test more complex group setups"""
         group_a = Group.objects.create(name=generate_id())
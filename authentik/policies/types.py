@@ -10,6 +10,7 @@ from django.http import HttpRequest
 from structlog.stdlib import get_logger
 
 from authentik.events.context_processors.base import get_context_processors
+from authentik.lib.utils.cache import CacheNamespace
 
 if TYPE_CHECKING:
     from authentik.core.models import User
@@ -18,6 +19,8 @@ if TYPE_CHECKING:
 
 LOGGER = get_logger()
 CACHE_PREFIX = "goauthentik.io/policies/"
+# Policy results, scoped per policy binding
+POLICY_CACHE = CacheNamespace(CACHE_PREFIX)
 
 
 @dataclass(slots=True)
@@ -472,6 +472,8 @@ class BaseGrantModel(models.Model):
 class AuthorizationCode(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseGrantModel):
     """OAuth2 Authorization Code"""
 
+    expire_in_bulk = True
+
     code = models.CharField(max_length=255, unique=True, verbose_name=_("Code"))
     nonce = models.TextField(null=True, default=None, verbose_name=_("Nonce"))
     code_challenge = models.CharField(max_length=255, null=True, verbose_name=_("Code Challenge"))
@@ -507,6 +509,8 @@ class AuthorizationCode(InternallyManagedMixin, SerializerModel, ExpiringModel,
 class AccessToken(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseGrantModel):
     """OAuth2 access token, non-opaque using a JWT as identifier"""
 
+    expire_in_bulk = True
+
     token = models.TextField()
     _id_token = models.TextField()
 
@@ -555,6 +559,8 @@ class AccessToken(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseGr
 class RefreshToken(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseGrantModel):
     """OAuth2 Refresh Token, opaque"""
 
+    expire_in_bulk = True
+
     token = models.TextField(default=generate_client_secret)
     _id_token = models.TextField(verbose_name=_("ID Token"))
     # Shadow the `session` field from `BaseGrantModel` as we want refresh tokens to persist even
@@ -595,6 +601,8 @@ class RefreshToken(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseG
 class DeviceToken(InternallyManagedMixin, ExpiringModel):
     """Temporary device token for OAuth device flow"""
 
+    expire_in_bulk = True
+
     user = models.ForeignKey(
         "authentik_core.User", default=None, on_delete=models.CASCADE, null=True
     )
@@ -30,6 +30,8 @@ OUTPOST_CALLBACK_SIGNATURE = "X-authentik-auth-callback"
 class ProxySession(InternallyManagedMixin, ExpiringModel):
     """Session storage for proxyv2 outposts using PostgreSQL"""
 
+    expire_in_bulk = True
+
     uuid = models.UUIDField(default=uuid4, primary_key=True)
     session_key = models.TextField(unique=True, db_index=True)
     user_id = models.UUIDField(null=True, blank=True, db_index=True)
@@ -22,9 +22,12 @@ from authentik.rbac.filters import ObjectFilter
 LOGGER = get_logger()
 
 
+CACHE_PREFIX = "goauthentik.io/providers/rac/endpoint_access/"
+
+
 def user_endpoint_cache_key(user_pk: str, provider_pk: str) -> str:
     """Cache key where endpoint list for user is saved"""
-    return f"goauthentik.io/providers/rac/endpoint_access/{user_pk}/{provider_pk}"
+    return f"{CACHE_PREFIX}{user_pk}/{provider_pk}"
 
 
 class EndpointSerializer(ModelSerializer):
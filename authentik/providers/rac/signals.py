@@ -7,7 +7,7 @@ from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from authentik.core.models import AuthenticatedSession
-from authentik.providers.rac.api.endpoints import user_endpoint_cache_key
+from authentik.providers.rac.api.endpoints import CACHE_PREFIX
 from authentik.providers.rac.consumer_client import (
     build_rac_client_group_session,
     build_rac_client_group_token,
@@ -37,5 +37,4 @@ def pre_delete_connection_token_disconnect(sender, instance: ConnectionToken, **
 @receiver([post_save, post_delete], sender=Endpoint)
 def post_save_post_delete_endpoint(**_):
     """Clear user's endpoint cache upon endpoint creation or deletion"""
-    keys = cache.keys(user_endpoint_cache_key("*", "*"))
-    cache.delete_many(keys)
+    cache.delete_prefix(CACHE_PREFIX)
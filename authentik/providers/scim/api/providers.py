@@ -40,6 +40,7 @@ class SCIMProviderSerializer(
             "exclude_users_service_account",
             "sync_page_size",
             "sync_page_timeout",
+            "sync_page_concurrency",
             "group_filters",
             "dry_run",
         ]
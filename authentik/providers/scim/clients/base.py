@@ -5,7 +5,8 @@ from typing import TYPE_CHECKING
 from django.core.cache import cache
 from django.http import HttpResponseBadRequest, HttpResponseNotFound
 from pydantic import ValidationError
-from requests import RequestException, Session
+from requests import RequestException, Response, Session
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from authentik.lib.sync.outgoing import (
     HTTP_CONFLICT,
@@ -18,7 +19,7 @@ from authentik.lib.sync.outgoing.exceptions import (
     DryRunRejected,
     NotFoundSyncException,
     ObjectExistsSyncException,
-    TransientSyncException,
+    ThrottledSyncException,
 )
 from authentik.lib.utils.http import get_http_session
 from authentik.providers.scim.clients.exceptions import SCIMRequestException
@@ -44,6 +45,10 @@ class SCIMClient[TModel: "Model", TConnection: "Model", TSchema: "BaseModel"](
         super().__init__(provider)
         self._session = get_http_session()
         self._session.verify = provider.verify_certificates
+        # Keep a connection alive for each request which can be in flight at once
+        adapter = HTTPAdapter(pool_maxsize=max(provider.sync_page_concurrency, DEFAULT_POOLSIZE))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self.provider = provider
         self.auth = provider.scim_auth()
         # Remove trailing slashes as we assume the URL doesn't have any
@@ -57,25 +62,30 @@ class SCIMClient[TModel: "Model", TConnection: "Model", TSchema: "BaseModel"](
         """Wrapper to send a request to the full URL"""
         if self.provider.dry_run and method.upper() not in SAFE_METHODS:
             raise DryRunRejected(f"{self.base_url}{path}", method, body=kwargs.get("json"))
-        try:
-            response = self._session.request(
-                method,
-                f"{self.base_url}{path}",
-                **kwargs,
-                auth=self.auth,
-                headers={
-                    "Accept": "application/scim+json",
-                    "Content-Type": "application/scim+json",
-                },
-            )
-        except RequestException as exc:
-            raise SCIMRequestException(message="Failed to send request") from exc
+
+        def send() -> Response:
+            try:
+                response = self._session.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    **kwargs,
+                    auth=self.auth,
+                    headers={
+                        "Accept": "application/scim+json",
+                        "Content-Type": "application/scim+json",
+                    },
+                )
+            except RequestException as exc:
+                raise SCIMRequestException(message="Failed to send request") from exc
+            if response.status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+                raise ThrottledSyncException(response, response.headers.get("Retry-After"))
+            return response
+
+        response = self.limiter.send(send)
         self.logger.debug("scim request", path=path, method=method, **kwargs)
         if response.status_code >= HttpResponseBadRequest.status_code:
             if response.status_code == HttpResponseNotFound.status_code:
                 raise NotFoundSyncException(response)
-            if response.status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
-                raise TransientSyncException()
             if response.status_code == HTTP_CONFLICT:
                 raise ObjectExistsSyncException(response)
             self.logger.warning(
@@ -87,14 +87,30 @@ class SCIMGroupClient(SCIMClient[Group, SCIMProviderGroup, SCIMGroupSchema]):
             del scim_group.members
         return scim_group
 
+    def schema_hash(self, obj: Group, schema: SCIMGroupSchema) -> str:
+        if not self._config.patch.supported:
+            return super().schema_hash(obj, schema)
+        # Members aren't part of the schema when they're reconciled with PATCH requests,
+        # include them so that membership changes aren't skipped
+        members = SCIMProviderUser.objects.filter(
+            provider=self.provider, user__pk__in=obj.users.values("pk")
+        ).values_list("scim_id", flat=True)
+        return super().schema_hash(
+            obj,
+            {
+                **schema.model_dump(mode="json", exclude_unset=True),
+                "members": sorted(members),
+            },
+        )
+
     def delete(self, identifier: str):
         """Delete group"""
         SCIMProviderGroup.objects.filter(provider=self.provider, scim_id=identifier).delete()
         return self._request("DELETE", f"/Groups/{identifier}")
 
-    def create(self, group: Group):
+    def create(self, group: Group, schema: SCIMGroupSchema | None = None):
         """Create group from scratch and create a connection object"""
-        scim_group = self.to_schema(group, None)
+        scim_group = schema or self.to_schema(group, None)
         connection = None
         with transaction.atomic():
             try:
@@ -142,9 +158,11 @@ class SCIMGroupClient(SCIMClient[Group, SCIMProviderGroup, SCIMGroupSchema]):
         MERGE_LIST_UNIQUE.merge(local_updated, local_created)
         return dumps(local_updated) != dumps(local_known)
 
-    def update(self, group: Group, connection: SCIMProviderGroup):
+    def update(
+        self, group: Group, connection: SCIMProviderGroup, schema: SCIMGroupSchema | None = None
+    ):
         """Update existing group"""
-        scim_group = self.to_schema(group, connection)
+        scim_group = schema or self.to_schema(group, connection)
         scim_group.id = connection.scim_id
         payload = scim_group.model_dump(mode="json", exclude_unset=True)
         if not self.diff(payload, connection):
@@ -55,9 +55,9 @@ class SCIMUserClient(SCIMClient[User, SCIMProviderUser, SCIMUserSchema]):
         SCIMProviderUser.objects.filter(provider=self.provider, scim_id=identifier).delete()
         return self._request("DELETE", f"/Users/{identifier}")
 
-    def create(self, user: User):
+    def create(self, user: User, schema: SCIMUserSchema | None = None):
         """Create user from scratch and create a connection object"""
-        scim_user = self.to_schema(user, None)
+        scim_user = schema or self.to_schema(user, None)
         with transaction.atomic():
             try:
                 response = self._request(
@@ -101,9 +101,11 @@ class SCIMUserClient(SCIMClient[User, SCIMProviderUser, SCIMUserSchema]):
         MERGE_LIST_UNIQUE.merge(local_updated, local_created)
         return dumps(local_updated) != dumps(local_known)
 
-    def update(self, user: User, connection: SCIMProviderUser):
+    def update(
+        self, user: User, connection: SCIMProviderUser, schema: SCIMUserSchema | None = None
+    ):
         """Update existing user"""
-        scim_user = self.to_schema(user, connection)
+        scim_user = schema or self.to_schema(user, connection)
         scim_user.id = connection.scim_id
         payload = scim_user.model_dump(
             mode="json",
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.12 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_providers_scim", "0019_scimprovider_group_filters_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scimprovidergroup",
+            name="schema_hash",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="scimprovideruser",
+            name="schema_hash",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.12 on 2026-10-18 23:40
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_providers_scim", "0020_scimprovidergroup_schema_hash_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scimprovider",
+            name="sync_page_concurrency",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="Controls the number of objects of a page which are synced in parallel. Requests are throttled further when the remote system asks to slow down.",
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(32),
+                ],
+            ),
+        ),
+    ]
@@ -31,6 +31,7 @@ class SCIMProviderUser(InternallyManagedMixin, SerializerModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     provider = models.ForeignKey("SCIMProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    schema_hash = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
@@ -53,6 +54,7 @@ class SCIMProviderGroup(InternallyManagedMixin, SerializerModel):
     group = models.ForeignKey(Group, on_delete=models.CASCADE)
     provider = models.ForeignKey("SCIMProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    schema_hash = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
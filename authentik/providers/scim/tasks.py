@@ -17,7 +17,7 @@ def scim_sync_objects(*args, **kwargs):
 @actor(description=_("Full sync for SCIM provider."))
 def scim_sync(provider_pk: int, *args, **kwargs):
     """Run full sync for SCIM provider"""
-    return sync_tasks.sync(provider_pk, scim_sync_objects)
+    return sync_tasks.sync(provider_pk, scim_sync_objects, **kwargs)
 
 
 @actor(description=_("Sync a direct object (user, group) for SCIM provider."))
@@ -7,6 +7,7 @@ from requests_mock import Mocker
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import Application
 from authentik.lib.generators import generate_id
+from authentik.lib.sync.outgoing.exceptions import ThrottledSyncException
 from authentik.providers.scim.clients.base import SCIMClient
 from authentik.providers.scim.models import SCIMMapping, SCIMProvider
 from authentik.providers.scim.tasks import scim_sync
@@ -208,3 +209,31 @@ class SCIMClientTests(TestCase):
             # Creating a new client should now hit the API again since cache was cleared
             SCIMClient(self.provider)
             self.assertEqual(mock.call_count, 2)  # New API call after cache invalidation
+
+    def test_throttled(self):
+        """Test throttled requests are retried when syncing concurrently"""
+        self.provider.sync_page_concurrency = 4
+        self.provider.save()
+        with Mocker() as mock:
+            mock.get("https://localhost/ServiceProviderConfig", json={})
+            mock.get(
+                "https://localhost/Users",
+                [
+                    {"status_code": 429, "headers": {"Retry-After": "0"}},
+                    {"json": {"totalResults": 0, "Resources": []}},
+                ],
+            )
+            client = SCIMClient(self.provider)
+            self.assertEqual(client._request("GET", "/Users"), {"totalResults": 0, "Resources": []})
+            self.assertEqual(mock.call_count, 3)
+            self.assertEqual(client.limiter.limit, 2)
+
+    def test_throttled_serial(self):
+        """Test throttled requests fail right away when syncing one object at a time"""
+        with Mocker() as mock:
+            mock.get("https://localhost/ServiceProviderConfig", json={})
+            mock.get("https://localhost/Users", status_code=429)
+            client = SCIMClient(self.provider)
+            with self.assertRaises(ThrottledSyncException):
+                client._request("GET", "/Users")
+            self.assertEqual(mock.call_count, 2)
@@ -7,7 +7,7 @@ from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import Application, Group, User
 from authentik.lib.generators import generate_id
 from authentik.providers.scim.clients.schema import ServiceProviderConfiguration
-from authentik.providers.scim.models import SCIMMapping, SCIMProvider
+from authentik.providers.scim.models import SCIMMapping, SCIMProvider, SCIMProviderGroup
 from authentik.providers.scim.tasks import scim_sync
 from authentik.tenants.models import Tenant
 
@@ -353,3 +353,49 @@ class SCIMMembershipTests(TestCase):
                     ]
                 },
             )
+
+    def test_member_schema_hash(self):
+        """Test membership changes change the schema hash of groups with PATCH support"""
+        config = ServiceProviderConfiguration.default()
+
+        config.patch.supported = True
+        user_scim_id = generate_id()
+        group_scim_id = generate_id()
+        group = Group.objects.create(name=generate_id())
+        user = User.objects.create(username=generate_id())
+
+        with Mocker() as mocker:
+            mocker.get(
+                "https://localhost/ServiceProviderConfig",
+                json=config.model_dump(),
+            )
+            mocker.post(
+                "https://localhost/Users",
+                json={
+                    "id": user_scim_id,
+                },
+            )
+            mocker.post(
+                "https://localhost/Groups",
+                json={
+                    "id": group_scim_id,
+                },
+            )
+            mocker.patch(
+                f"https://localhost/Groups/{group_scim_id}",
+                json={},
+            )
+
+            self.configure()
+            scim_sync.send(self.provider.pk)
+            connection = SCIMProviderGroup.objects.get(provider=self.provider, group=group)
+            client = self.provider.client_for_model(Group)
+            self.assertEqual(
+                client.schema_hash(group, client.to_schema(group, connection)),
+                connection.schema_hash,
+            )
+            group.users.add(user)
+            self.assertNotEqual(
+                client.schema_hash(group, client.to_schema(group, connection)),
+                connection.schema_hash,
+            )
@@ -10,7 +10,7 @@ from requests_mock import Mocker
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import Application, Group, User, UserTypes
 from authentik.lib.generators import generate_id
-from authentik.lib.sync.outgoing.base import SAFE_METHODS
+from authentik.lib.sync.outgoing.base import SAFE_METHODS, WriteResult
 from authentik.lib.sync.outgoing.exceptions import TransientSyncException
 from authentik.providers.scim.models import SCIMMapping, SCIMProvider, SCIMProviderUser
 from authentik.providers.scim.tasks import scim_sync, scim_sync_objects, sync_tasks
@@ -539,6 +539,42 @@ class SCIMUserTests(TestCase):
         self.assertEqual(mock.request_history[0].method, "GET")
         self.assertEqual(mock.request_history[1].method, "POST")
 
+    @Mocker()
+    def test_user_write_unchanged(self, mock: Mocker):
+        """Test unchanged users are only written when forced"""
+        scim_id = generate_id()
+        mock.get(
+            "https://localhost/ServiceProviderConfig",
+            json={},
+        )
+        mock.post(
+            "https://localhost/Users",
+            json={
+                "id": scim_id,
+            },
+        )
+        mock.put(
+            f"https://localhost/Users/{scim_id}",
+            json={
+                "id": scim_id,
+            },
+        )
+        uid = generate_id()
+        user = User.objects.create(
+            username=uid,
+            name=f"{uid} {uid}",
+            email=f"{uid}@goauthentik.io",
+        )
+        self.assertEqual(mock.call_count, 2)
+        self.assertNotEqual(SCIMProviderUser.objects.get(user=user).schema_hash, "")
+        client = self.provider.client_for_model(User)
+        client.write(user)
+        self.assertEqual(mock.call_count, 2)
+        client.write(user, force=True)
+        self.assertEqual(mock.call_count, 3)
+        self.assertEqual(mock.request_history[2].method, "PUT")
+        self.assertEqual(client.write_results, {WriteResult.skipped: 1, WriteResult.updated: 1})
+
     @Mocker()
     def test_discover(self, mock: Mocker):
         user = User.objects.create(username="admin@goauthentik.io")
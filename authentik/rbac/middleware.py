@@ -7,6 +7,8 @@ from functools import partial
 from django.db.models import Model
 from django.db.models.signals import post_save
 from django.http import HttpRequest, HttpResponse
+from django.utils.functional import SimpleLazyObject
+from guardian.core import checker_scope
 
 from authentik.core.models import User
 from authentik.rbac.permissions import assign_initial_permissions
@@ -68,3 +70,18 @@ class InitialPermissionsMiddleware:
         if not user or user.is_anonymous:
             return
         assign_initial_permissions(user, instance)
+
+
+class PermissionCheckerMiddleware:
+    """Share permission checkers for the duration of request-response, so the permissions
+    of the user are only loaded once per object"""
+
+    get_response: Callable[[HttpRequest], HttpResponse]
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        # Resolved lazily, as API authentication replaces the user later in the request
+        with checker_scope(SimpleLazyObject(lambda: request.user)):
+            return self.get_response(request)
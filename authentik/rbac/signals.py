@@ -0,0 +1,25 @@
+"""rbac signals"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from guardian.core import clear_checkers
+from guardian.models import RoleModelPermission, RoleObjectPermission
+
+from authentik.core.models import Group, User
+
+
+@receiver(post_save, sender=RoleModelPermission)
+@receiver(post_delete, sender=RoleModelPermission)
+@receiver(post_save, sender=RoleObjectPermission)
+@receiver(post_delete, sender=RoleObjectPermission)
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.roles.through)
+@receiver(m2m_changed, sender=Group.roles.through)
+@receiver(m2m_changed, sender=Group.parents.through)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def permissions_changed(sender, **kwargs):
+    """Drop the permission checkers of the current request when permissions or role
+    memberships change"""
+    if kwargs.get("action", "post_").startswith("post_"):
+        clear_checkers()
@@ -0,0 +1,59 @@
+"""RBAC permission checker tests"""
+
+from django.test import TestCase
+from guardian.core import ObjectPermissionChecker, checker_scope, get_checker
+
+from authentik.core.models import Application, Group
+from authentik.core.tests.utils import create_test_user
+from authentik.lib.generators import generate_id
+
+
+class TestPermissionChecker(TestCase):
+    """Test permission checkers"""
+
+    def setUp(self) -> None:
+        self.user = create_test_user()
+        self.apps = [
+            Application.objects.create(name=generate_id(), slug=generate_id()) for _ in range(3)
+        ]
+
+    def test_prefetch(self):
+        """Test prefetched permissions match permissions checked per object"""
+        self.user.assign_perms_to_managed_role("authentik_core.add_application")
+        self.user.assign_perms_to_managed_role("authentik_core.view_application", self.apps[0])
+        self.user.assign_perms_to_managed_role("authentik_core.change_application", self.apps[1])
+        checker = ObjectPermissionChecker(self.user)
+        # Load the identity and model permissions of the user
+        checker.get_perms()
+        with self.assertNumQueries(1):
+            checker.prefetch_perms(self.apps)
+        with self.assertNumQueries(0):
+            prefetched = [checker.get_perms(app) for app in self.apps]
+        self.assertEqual(
+            prefetched, [ObjectPermissionChecker(self.user).get_perms(app) for app in self.apps]
+        )
+        self.assertEqual(
+            prefetched[0], {"authentik_core.add_application", "authentik_core.view_application"}
+        )
+        self.assertEqual(prefetched[2], {"authentik_core.add_application"})
+
+    def test_scope(self):
+        """Test checkers are shared within a scope and dropped when permissions change"""
+        self.assertIsNot(get_checker(self.user), get_checker(self.user))
+        with checker_scope():
+            self.assertIs(get_checker(self.user), get_checker(self.user))
+            self.assertFalse(self.user.has_perm("authentik_core.view_application", self.apps[0]))
+            with self.assertNumQueries(0):
+                self.assertFalse(
+                    self.user.has_perm("authentik_core.view_application", self.apps[0])
+                )
+            self.user.assign_perms_to_managed_role("authentik_core.view_application", self.apps[0])
+            self.assertTrue(self.user.has_perm("authentik_core.view_application", self.apps[0]))
+
+    def test_scope_identity(self):
+        """Test memberships changed from the group side are seen by users of the scope"""
+        group = Group.objects.create(name=generate_id())
+        with checker_scope(self.user):
+            self.assertEqual(self.user.identity.group_pks, set())
+            group.users.add(self.user)
+            self.assertEqual(self.user.identity.group_pks, {group.pk})
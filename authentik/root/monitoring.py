@@ -5,15 +5,40 @@ from pathlib import Path
 from tempfile import gettempdir
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import connections
 from django.db.utils import OperationalError
-from django.dispatch import Signal
+from django.dispatch import Signal, receiver
 from django.http import HttpRequest, HttpResponse
 from django.views import View
 from django_prometheus.exports import ExportToDjangoView
+from prometheus_client import Gauge
 
 monitoring_set = Signal()
 
+GAUGE_CACHE_L1_HITS = Gauge("authentik_cache_l1_hits", "In-process cache hits")
+GAUGE_CACHE_L1_MISSES = Gauge("authentik_cache_l1_misses", "In-process cache misses")
+GAUGE_CACHE_L1_EVICTIONS = Gauge(
+    "authentik_cache_l1_evictions", "In-process cache entries evicted due to size"
+)
+GAUGE_CACHE_L1_INVALIDATIONS = Gauge(
+    "authentik_cache_l1_invalidations", "In-process cache entries invalidated"
+)
+GAUGE_CACHE_L1_ENTRIES = Gauge("authentik_cache_l1_entries", "In-process cache entries")
+
+
+@receiver(monitoring_set)
+def monitoring_set_cache(sender, **kwargs):
+    """set in-process cache gauges"""
+    local = getattr(cache, "local", None)
+    if local is None:
+        return
+    GAUGE_CACHE_L1_HITS.set(local.stats.hits)
+    GAUGE_CACHE_L1_MISSES.set(local.stats.misses)
+    GAUGE_CACHE_L1_EVICTIONS.set(local.stats.evictions)
+    GAUGE_CACHE_L1_INVALIDATIONS.set(local.stats.invalidations)
+    GAUGE_CACHE_L1_ENTRIES.set(len(local))
+
 
 class MetricsView(View):
     """Wrapper around ExportToDjangoView with authentication, accessed by the authentik router"""
@@ -149,6 +149,7 @@ PUBLIC_SCHEMA_NAME = CONFIG.get("postgresql.default_schema")
 
 GUARDIAN_GROUP_MODEL = "authentik_core.Group"
 GUARDIAN_ROLE_MODEL = "authentik_rbac.Role"
+GUARDIAN_USER_OBJ_PERMS_MODEL = "authentik_core.EffectiveObjectPermission"
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "authentik",
@@ -239,11 +240,20 @@ REST_FRAMEWORK = {
 }
 
 
+_cache_l1_prefixes = CONFIG.get("cache.l1.prefixes", [])
+if isinstance(_cache_l1_prefixes, str):
+    _cache_l1_prefixes = [prefix for prefix in _cache_l1_prefixes.split(",") if prefix]
 CACHES = {
     "default": {
         "BACKEND": "django_postgres_cache.backend.DatabaseCache",
         "KEY_FUNCTION": "django_tenants.cache.make_key",
         "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+        "OPTIONS": {
+            "L1_PREFIXES": _cache_l1_prefixes,
+            "L1_MAX_ENTRIES": CONFIG.get_int("cache.l1.max_entries", 1000),
+            "L1_TIMEOUT": CONFIG.get_int("cache.l1.timeout", 30),
+            "COMPRESS_MIN_LENGTH": CONFIG.get_int("cache.compress_min_length", 0) or None,
+        },
     }
 }
 SESSION_ENGINE = "authentik.core.sessions"
@@ -276,6 +286,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "authentik.core.middleware.ImpersonateMiddleware",
+    "authentik.rbac.middleware.PermissionCheckerMiddleware",
     "authentik.rbac.middleware.InitialPermissionsMiddleware",
 ]
 MIDDLEWARE_LAST = [
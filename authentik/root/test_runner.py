@@ -71,6 +71,9 @@ class PytestTestRunner(DiscoverRunner):  # pragma: no cover
         test_config = {
             "events.context_processors.geoip": "tests/GeoLite2-City-Test.mmdb",
             "events.context_processors.asn": "tests/GeoLite2-ASN-Test.mmdb",
+            "events.buffer.size": 0,
+            "tenants.resolver_cache_timeout": 0,
+            "sessions.cache_timeout": 0,
             "blueprints_dir": "./blueprints",
             "outposts.container_image_base": f"ghcr.io/goauthentik/dev-%(type)s:{get_docker_tag()}",
             "tenants.enabled": False,
@@ -0,0 +1,124 @@
+"""cache tests"""
+
+from time import sleep
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import TestCase
+from django_postgres_cache.backend import ZSTD_MAGIC, DatabaseCache
+from django_postgres_cache.local import _MISSING, LocalCache
+from django_postgres_cache.models import CacheEntry
+
+from authentik.lib.generators import generate_id
+
+
+class TestLocalCache(TestCase):
+    """Test in-process cache tier"""
+
+    def setUp(self):
+        params = dict(settings.CACHES["default"])
+        params["OPTIONS"] = {"L1_PREFIXES": ["test/"], "L1_MAX_ENTRIES": 2, "L1_TIMEOUT": 30}
+        self.cache = DatabaseCache("", params)
+
+    def test_lru(self):
+        """Test size limit and TTL"""
+        local = LocalCache(max_entries=2, timeout=30)
+        local.set("a", 1)
+        local.set("b", 2)
+        self.assertEqual(local.get("a"), 1)
+        local.set("c", 3)
+        self.assertEqual(local.get("b"), _MISSING)
+        self.assertEqual(local.stats.evictions, 1)
+        local.set("d", 4, ttl=0.01)
+        sleep(0.02)
+        self.assertEqual(local.get("d"), _MISSING)
+        self.assertEqual(local.stats.hits, 1)
+        self.assertEqual(local.stats.misses, 2)
+
+    def test_get_set(self):
+        """Test values are served from L1 and invalidated on write"""
+        key = f"test/{generate_id()}"
+        with patch.object(DatabaseCache, "_local_ready", return_value=True):
+            self.cache.set(key, "foo")
+            self.assertEqual(self.cache.get(key), "foo")
+            self.assertEqual(self.cache.get(key), "foo")
+            self.assertEqual(self.cache.local.stats.hits, 1)
+            self.cache.set(key, "bar")
+            self.assertEqual(self.cache.get(key), "bar")
+            self.cache.delete(key)
+            self.assertIsNone(self.cache.get(key))
+
+    def test_get_copy(self):
+        """Test every caller gets its own copy of a value served from L1"""
+        key = f"test/{generate_id()}"
+        with patch.object(DatabaseCache, "_local_ready", return_value=True):
+            self.cache.set(key, {"foo": "bar"})
+            first = self.cache.get(key)
+            second = self.cache.get(key)
+            self.assertEqual(self.cache.local.stats.hits, 1)
+            self.assertEqual(first, second)
+            self.assertIsNot(first, second)
+            first["foo"] = "baz"
+            self.assertEqual(self.cache.get(key), {"foo": "bar"})
+
+    def test_invalidate_during_load(self):
+        """Test values loaded before an invalidation arrived aren't cached"""
+        local = LocalCache(max_entries=2, timeout=30)
+        generation = local.generation("a")
+        local.delete("a")
+        local.set("a", 1, generation=generation)
+        self.assertEqual(local.get("a"), _MISSING)
+        local.set("a", 1, generation=local.generation("a"))
+        self.assertEqual(local.get("a"), 1)
+
+    def test_prefix(self):
+        """Test keys without a configured prefix bypass L1"""
+        key = f"other/{generate_id()}"
+        with patch.object(DatabaseCache, "_local_ready", return_value=True):
+            self.cache.set(key, "foo")
+            self.assertEqual(self.cache.get(key), "foo")
+        self.assertEqual(len(self.cache.local), 0)
+
+
+class TestDatabaseCache(TestCase):
+    """Test database cache"""
+
+    def setUp(self):
+        params = dict(settings.CACHES["default"])
+        params["OPTIONS"] = {"COMPRESS_MIN_LENGTH": 100}
+        self.cache = DatabaseCache("", params)
+
+    def test_many(self):
+        """Test batched get/set/delete"""
+        prefix = f"test/{generate_id()}/"
+        data = {f"{prefix}{idx}": idx for idx in range(10)}
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cache.set_many(data), [])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cache.get_many([*data.keys(), f"{prefix}foo"]), data)
+        with self.assertNumQueries(1):
+            self.cache.delete_many([f"{prefix}0", f"{prefix}1"])
+        self.assertEqual(len(self.cache.get_many(data.keys())), 8)
+        self.assertEqual(self.cache.delete_prefix(prefix), 8)
+        self.assertEqual(self.cache.get_many(data.keys()), {})
+
+    def test_compression(self):
+        """Test large values are compressed"""
+        key = f"test/{generate_id()}"
+        value = "a" * 1000
+        self.cache.set(key, value)
+        raw = bytes(CacheEntry.objects.get(cache_key=self.cache.make_key(key)).value)
+        self.assertTrue(raw.startswith(ZSTD_MAGIC))
+        self.assertLess(len(raw), 1000)
+        self.assertEqual(self.cache.get(key), value)
+
+    def test_keys(self):
+        """Test glob key lookups"""
+        prefix = f"test/{generate_id()}/"
+        self.cache.set_many({f"{prefix}a_1/b": 1, f"{prefix}a_2/c": 2, f"{prefix}ax1/b": 3})
+        self.assertCountEqual(
+            self.cache.keys(f"{prefix}*"),
+            [f"{prefix}a_1/b", f"{prefix}a_2/c", f"{prefix}ax1/b"],
+        )
+        self.assertCountEqual(self.cache.keys(f"{prefix}a_*/b"), [f"{prefix}a_1/b"])
+        self.assertEqual(self.cache.keys(f"{prefix}a.*"), [])
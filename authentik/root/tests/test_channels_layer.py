@@ -0,0 +1,133 @@
+"""postgres channel layer tests"""
+
+from asyncio import CancelledError, wait_for
+from datetime import timedelta
+from os import urandom
+
+from django.test import TransactionTestCase
+from django.utils.timezone import now
+from django_channels_postgres.layer import MESSAGE_TABLE, PostgresChannelLayer
+from psycopg import AsyncConnection, sql
+
+from authentik.lib.generators import generate_id
+
+TIMEOUT = 10
+
+
+class TestPostgresChannelLayer(TransactionTestCase):
+    """Test postgres channel layer"""
+
+    def setUp(self):
+        self.layer = PostgresChannelLayer()
+
+    async def _close(self):
+        await self.layer.flush()
+        layer = self.layer._get_layer(allow_sync=False)
+        if layer._pool is not None:
+            await layer._pool.close()
+
+    async def _listen(self, channel: str):
+        """Wait for the receiver to listen for notifications. Messages sent before are
+        delivered once it's connected, so receiving one means it's listening."""
+        await self.layer.send(channel, {"type": "test.ready"})
+        self.assertEqual(
+            await wait_for(self.layer.receive(channel), TIMEOUT), {"type": "test.ready"}
+        )
+        # Received messages are deleted in the background
+        layer = self.layer._get_layer(allow_sync=False)
+        if layer._delete_task is not None:
+            await layer._delete_task
+
+    async def test_send_receive(self):
+        """Test sending to a specific channel"""
+        try:
+            channel = await self.layer.new_channel()
+            await self._listen(channel)
+            await self.layer.send(channel, {"type": "test.message", "value": "foo"})
+            self.assertEqual(
+                await wait_for(self.layer.receive(channel), TIMEOUT),
+                {"type": "test.message", "value": "foo"},
+            )
+        finally:
+            await self._close()
+
+    async def test_group_send(self):
+        """Test group messages are delivered to all members hosted by the receiver"""
+        group = generate_id()
+        try:
+            channels = [await self.layer.new_channel() for _ in range(3)]
+            for channel in channels[:2]:
+                await self.layer.group_add(group, channel)
+            await self._listen(channels[0])
+            await self.layer.group_send(group, {"type": "test.message", "value": "foo"})
+            for channel in channels[:2]:
+                self.assertEqual(
+                    await wait_for(self.layer.receive(channel), TIMEOUT),
+                    {"type": "test.message", "value": "foo"},
+                )
+            # Not a member
+            with self.assertRaises(TimeoutError):
+                await wait_for(self.layer.receive(channels[2]), 1)
+        finally:
+            await self._close()
+
+    async def test_group_reconnect(self):
+        """Test group messages sent while disconnected are delivered once after reconnecting,
+        without delivering messages that were already received again"""
+        group = generate_id()
+        try:
+            channel = await self.layer.new_channel()
+            await self.layer.group_add(group, channel)
+            await self._listen(channel)
+            disconnected_at = now() - timedelta(seconds=1)
+            await self.layer.group_send(group, {"type": "test.message", "value": "before"})
+            self.assertEqual(
+                await wait_for(self.layer.receive(channel), TIMEOUT),
+                {"type": "test.message", "value": "before"},
+            )
+            # Stop listening, as if the connection was lost
+            receiver = self.layer._get_layer(allow_sync=False).receiver
+            receiver._receive_task.cancel()
+            with self.assertRaises(CancelledError):
+                await receiver._receive_task
+            receiver._receive_task = None
+            await self.layer.group_send(group, {"type": "test.message", "value": "after"})
+            receiver._disconnected_at = disconnected_at
+            receiver._ensure_receiver()
+            self.assertEqual(
+                await wait_for(self.layer.receive(channel), TIMEOUT),
+                {"type": "test.message", "value": "after"},
+            )
+            with self.assertRaises(TimeoutError):
+                await wait_for(self.layer.receive(channel), 1)
+        finally:
+            await self._close()
+
+    async def test_large_message(self):
+        """Test messages too large for a notification are fetched from the database"""
+        group = generate_id()
+        # Random data can't be compressed below the notification size limit
+        message = {"type": "test.message", "value": urandom(16 * 1024)}
+        try:
+            channel = await self.layer.new_channel()
+            other = await self.layer.new_channel()
+            await self.layer.group_add(group, channel)
+            await self.layer.group_add(group, other)
+            await self._listen(channel)
+            await self.layer.send(channel, message)
+            self.assertEqual(await wait_for(self.layer.receive(channel), TIMEOUT), message)
+            await self.layer.group_send(group, message)
+            self.assertEqual(await wait_for(self.layer.receive(channel), TIMEOUT), message)
+            self.assertEqual(await wait_for(self.layer.receive(other), TIMEOUT), message)
+            # Received direct messages are removed
+            layer = self.layer._get_layer(allow_sync=False)
+            async with await AsyncConnection.connect(layer.make_conninfo()) as conn:
+                cursor = await conn.execute(
+                    sql.SQL("SELECT COUNT(*) FROM {table} WHERE channel = %s").format(
+                        table=sql.Identifier(MESSAGE_TABLE)
+                    ),
+                    (channel,),
+                )
+                self.assertEqual((await cursor.fetchone())[0], 0)
+        finally:
+            await self._close()
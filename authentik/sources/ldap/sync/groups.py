@@ -3,6 +3,7 @@
 from collections.abc import Generator
 
 from django.core.exceptions import FieldError
+from django.db.transaction import atomic
 from django.db.utils import IntegrityError
 from ldap3 import ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, SUBTREE
 
@@ -10,7 +11,7 @@ from authentik.core.expression.exceptions import (
     PropertyMappingExpressionException,
     SkipObjectException,
 )
-from authentik.core.models import Group
+from authentik.core.models import Group, GroupAncestryNode
 from authentik.core.sources.mapper import SourceMapper
 from authentik.events.models import Event, EventAction
 from authentik.lib.sync.outgoing.exceptions import StopSync
@@ -59,66 +60,71 @@ class GroupLDAPSynchronizer(BaseLDAPSynchronizer):
             self._task.info("Group syncing is disabled for this Source")
             return -1
         group_count = 0
-        for group_data in page_data:
-            if (attributes := self.get_attributes(group_data)) is None:
-                continue
-            group_dn = flatten(flatten(group_data.get("entryDN", group_data.get("dn"))))
-            if not (uniq := self.get_identifier(attributes)):
-                self._task.info(
-                    f"Uniqueness field not found/not set in attributes: '{group_dn}'",
-                    attributes=list(attributes.keys()),
-                    dn=group_dn,
-                )
-                continue
-            try:
-                defaults = {
-                    k: flatten(v)
-                    for k, v in self.mapper.build_object_properties(
-                        object_type=Group,
-                        manager=self.manager,
-                        user=None,
-                        request=None,
+        # Parent changes are collected and applied to the group ancestry once per page
+        with GroupAncestryNode.deferred():
+            for group_data in page_data:
+                if (attributes := self.get_attributes(group_data)) is None:
+                    continue
+                group_dn = flatten(flatten(group_data.get("entryDN", group_data.get("dn"))))
+                if not (uniq := self.get_identifier(attributes)):
+                    self._task.info(
+                        f"Uniqueness field not found/not set in attributes: '{group_dn}'",
+                        attributes=list(attributes.keys()),
                         dn=group_dn,
-                        ldap=attributes,
-                    ).items()
-                }
-                if "name" not in defaults:
-                    raise IntegrityError("Name was not set by propertymappings")
-                # Special check for `users` field, as this is an M2M relation, and cannot be sync'd
-                if "users" in defaults:
-                    del defaults["users"]
-                parent = defaults.pop("parent", None)
-                group, created = Group.update_or_create_attributes(
-                    {
-                        f"attributes__{LDAP_UNIQUENESS}": uniq,
-                    },
-                    defaults,
-                )
-                if parent:
-                    group.parents.add(parent)
-                self._logger.debug("Created group with attributes", **defaults)
-                if not GroupLDAPSourceConnection.objects.filter(
-                    source=self._source, identifier=uniq
-                ):
-                    GroupLDAPSourceConnection.objects.create(
-                        source=self._source, group=group, identifier=uniq
                     )
-            except SkipObjectException:
-                continue
-            except PropertyMappingExpressionException as exc:
-                raise StopSync(exc, None, exc.mapping) from exc
-            except (IntegrityError, FieldError, TypeError, AttributeError) as exc:
-                Event.new(
-                    EventAction.CONFIGURATION_ERROR,
-                    message=(
-                        f"Failed to create group: {str(exc)} "
-                        "To merge new group with existing group, set the groups's "
-                        f"Attribute '{LDAP_UNIQUENESS}' to '{uniq}'"
-                    ),
-                    source=self._source,
-                    dn=group_dn,
-                ).save()
-            else:
-                self._logger.debug("Synced group", group=group.name, created=created)
-                group_count += 1
+                    continue
+                try:
+                    defaults = {
+                        k: flatten(v)
+                        for k, v in self.mapper.build_object_properties(
+                            object_type=Group,
+                            manager=self.manager,
+                            user=None,
+                            request=None,
+                            dn=group_dn,
+                            ldap=attributes,
+                        ).items()
+                    }
+                    if "name" not in defaults:
+                        raise IntegrityError("Name was not set by propertymappings")
+                    # Special check for `users` field, as this is an M2M relation,
+                    # and cannot be sync'd
+                    if "users" in defaults:
+                        del defaults["users"]
+                    parent = defaults.pop("parent", None)
+                    # Savepoint per group, so a failing group doesn't abort the deferred transaction
+                    with atomic():
+                        group, created = Group.update_or_create_attributes(
+                            {
+                                f"attributes__{LDAP_UNIQUENESS}": uniq,
+                            },
+                            defaults,
+                        )
+                        if parent:
+                            group.parents.add(parent)
+                        self._logger.debug("Created group with attributes", **defaults)
+                        if not GroupLDAPSourceConnection.objects.filter(
+                            source=self._source, identifier=uniq
+                        ):
+                            GroupLDAPSourceConnection.objects.create(
+                                source=self._source, group=group, identifier=uniq
+                            )
+                except SkipObjectException:
+                    continue
+                except PropertyMappingExpressionException as exc:
+                    raise StopSync(exc, None, exc.mapping) from exc
+                except (IntegrityError, FieldError, TypeError, AttributeError) as exc:
+                    Event.new(
+                        EventAction.CONFIGURATION_ERROR,
+                        message=(
+                            f"Failed to create group: {str(exc)} "
+                            "To merge new group with existing group, set the groups's "
+                            f"Attribute '{LDAP_UNIQUENESS}' to '{uniq}'"
+                        ),
+                        source=self._source,
+                        dn=group_dn,
+                    ).save()
+                else:
+                    self._logger.debug("Synced group", group=group.name, created=created)
+                    group_count += 1
         return group_count
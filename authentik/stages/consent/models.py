@@ -54,6 +54,8 @@ class ConsentStage(Stage):
 class UserConsent(InternallyManagedMixin, SerializerModel, ExpiringModel):
     """Consent given by a user for an application"""
 
+    expire_in_bulk = True
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     application = models.ForeignKey(Application, on_delete=models.CASCADE)
     permissions = models.TextField(default="")
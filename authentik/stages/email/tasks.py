@@ -7,8 +7,8 @@ from django.core.mail import EmailMultiAlternatives
 from django.core.mail.utils import DNS_NAME
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
+from django_dramatiq_postgres.composition import group
 from dramatiq.actor import actor
-from dramatiq.composition import group
 from structlog.stdlib import get_logger
 
 from authentik.events.models import Event, EventAction
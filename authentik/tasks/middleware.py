@@ -63,6 +63,11 @@ class TenantMiddleware(Middleware):
     def before_enqueue(self, broker: Broker, message: Message, delay: int):
         message.options["model_create_defaults"]["tenant"] = get_current_tenant()
 
+    def before_enqueue_many(self, broker: Broker, messages: list[Message], delay: int | None):
+        tenant = get_current_tenant()
+        for message in messages:
+            message.options["model_create_defaults"]["tenant"] = tenant
+
     def before_process_message(self, broker: Broker, message: Message):
         task: Task = message.options["task"]
         task.tenant.activate()
@@ -111,6 +116,25 @@ class TaskLogMiddleware(Middleware):
                 ),
             )
 
+    def after_enqueue_many(self, broker: Broker, messages: list[Message], delay: int | None):
+        log_events = []
+        for message in messages:
+            if not message.options["task_created"]:
+                self.after_enqueue(broker, message, delay)
+                continue
+            log_events.append(
+                (
+                    message.options["task"],
+                    Task._make_log(
+                        class_to_path(type(self)),
+                        TaskStatus.INFO,
+                        "Task has been queued",
+                        delay=delay,
+                    ),
+                )
+            )
+        TaskLog.bulk_create_for_tasks(log_events)
+
     def before_process_message(self, broker: Broker, message: Message):
         task: Task = message.options["task"]
         task.log(class_to_path(type(self)), TaskStatus.INFO, "Task is being processed")
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:00
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_tasks", "0005_tasklog"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="task",
+            name="notify_enqueueing",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="task",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_enqueueing",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    condition="WHEN (NEW.\"eta\" IS NULL AND NEW.\"state\" = 'queued' AND current_setting('django_dramatiq_postgres.bulk_enqueue', true) IS DISTINCT FROM 'on')",
+                    constraint="CONSTRAINT",
+                    func="\n                    PERFORM pg_notify(\n                        'authentik.tasks.' || NEW.queue_name || '.enqueue',\n                        NEW.message_id::text\n                    );\n                    RETURN NEW;\n                ",
+                    hash="6c5708be9d271dad0fbc7618efc27de1b4ecd3ef",
+                    operation="INSERT OR UPDATE",
+                    pgid="pgtrigger_notify_enqueueing_0bc94",
+                    table="authentik_tasks_task",
+                    timing="DEFERRABLE INITIALLY DEFERRED",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
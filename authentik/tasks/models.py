@@ -200,6 +200,27 @@ class TaskLog(InternallyManagedMixin, models.Model):
             ]
         )
 
+    @classmethod
+    def bulk_create_for_tasks(
+        cls,
+        log_events: Iterable[tuple[Task, LogEvent]],
+    ) -> list[Self]:
+        """Create one log entry per task in a single query"""
+        return cls.objects.bulk_create(
+            [
+                cls(
+                    task=task,
+                    event=log_event.event,
+                    log_level=log_event.log_level,
+                    logger=log_event.logger,
+                    timestamp=log_event.timestamp,
+                    attributes=sanitize_item(log_event.attributes),
+                )
+                for task, log_event in log_events
+                if task.message
+            ]
+        )
+
     def to_log_event(self) -> LogEvent:
         return LogEvent(
             event=self.event,
@@ -67,6 +67,20 @@ class TestBroker(PostgresBroker):
         self.worker.process_message(MessageProxy(message))
         return message
 
+    def enqueue_many(self, *args, **kwargs):
+        messages = [
+            message.copy(queue_name=TESTING_QUEUE)
+            for message in super().enqueue_many(*args, **kwargs)
+        ]
+        if not self.worker:
+            return messages
+        for message in messages:
+            # Messages which already had a task went through `enqueue` and were processed there
+            if not message.options.get("task_created"):
+                continue
+            self.worker.process_message(MessageProxy(message))
+        return messages
+
 
 def use_test_broker():
     old_broker = get_broker()
@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django_dramatiq_postgres.composition import group
+from dramatiq.broker import get_broker
+
+from authentik.events.tasks import gdpr_cleanup
+from authentik.tasks.models import Task, TaskLog, TaskState
+
+
+class TestBroker(TestCase):
+    def test_enqueue_many(self):
+        messages = [gdpr_cleanup.message(-1) for _ in range(3)]
+        group(messages).run()
+        tasks = Task.objects.filter(message_id__in=[message.message_id for message in messages])
+        self.assertEqual(tasks.count(), 3)
+        for task in tasks:
+            self.assertEqual(task.state, TaskState.DONE)
+            self.assertTrue(
+                TaskLog.objects.filter(task=task, event="Task has been queued").exists()
+            )
+
+    def test_enqueue_many_existing(self):
+        broker = get_broker()
+        existing = gdpr_cleanup.message(-1)
+        broker.enqueue_many([existing])
+        with patch.object(
+            broker.worker, "process_message", wraps=broker.worker.process_message
+        ) as process_message:
+            broker.enqueue_many([existing, gdpr_cleanup.message(-1)])
+        self.assertEqual(process_message.call_count, 2)
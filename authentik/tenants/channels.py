@@ -1,12 +1,10 @@
 from channels.db import database_sync_to_async
 from django.db import close_old_connections, connection
 from django.http.request import split_domain_port
-from django_tenants.utils import (
-    get_public_schema_name,
-    remove_www,
-)
+from django_tenants.utils import remove_www
 
-from authentik.tenants.models import Domain, Tenant
+from authentik.tenants.models import Tenant
+from authentik.tenants.resolver import resolve_tenant
 
 
 class TenantsAwareMiddleware:
@@ -22,22 +20,11 @@ class TenantsAwareMiddleware:
             return None
         return remove_www(hostname)
 
-    async def get_default_tenant(self) -> Tenant:
-        return await database_sync_to_async(Tenant.objects.get)(
-            schema_name=get_public_schema_name()
-        )
-
     async def get_tenant(self, hostname: str | None) -> Tenant:
-        if not hostname:
-            return await self.get_default_tenant()
-
-        try:
-            domain = await database_sync_to_async(Domain.objects.select_related("tenant").get)(
-                domain=hostname
-            )
-        except Domain.DoesNotExist:
-            return await self.get_default_tenant()
-        return domain.tenant
+        tenant = await database_sync_to_async(resolve_tenant)(hostname)
+        if tenant is None:
+            raise Tenant.DoesNotExist()
+        return tenant
 
     async def __call__(self, scope, receive, send):
         close_old_connections()
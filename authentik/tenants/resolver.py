@@ -0,0 +1,213 @@
+"""In-process cache for tenant, brand and session resolution"""
+
+from collections.abc import Callable, Iterable
+from copy import copy
+from os import getpid
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
+from typing import Any
+
+from django.db import connection, connections
+from django.db.models import Model
+from django_tenants.utils import get_public_schema_name
+from psycopg import Connection, sql
+from psycopg.conninfo import make_conninfo
+from psycopg.errors import Error as PsycopgError
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+from authentik.tenants.models import Domain, Tenant
+
+LOGGER = get_logger()
+INVALIDATE_CHANNEL = "authentik_resolver_invalidate"
+# Invalidated prefixes are sent in multiple notifications if they exceed this many characters
+NOTIFY_PAYLOAD_MAX = 7000
+# Expired entries are pruned once this many are cached, everything is dropped if none expired
+RESOLVER_MAX_ENTRIES = 10000
+
+
+class DomainTrie[T]:
+    """Match hostnames against domains, including their subdomains.
+
+    Domains are stored by their labels in reverse, so looking up a hostname walks from its
+    top-level domain downwards and the deepest node with values is the longest matching domain.
+    """
+
+    def __init__(self) -> None:
+        self._children: dict[str, DomainTrie[T]] = {}
+        self._values: list[T] = []
+
+    def insert(self, domain: str, value: T) -> None:
+        node = self
+        for label in reversed(domain.lower().split(".")):
+            node = node._children.setdefault(label, DomainTrie())
+        node._values.append(value)
+
+    def match(self, hostname: str) -> list[T]:
+        """Get the values of the longest domain `hostname` is equal to or a subdomain of"""
+        node = self
+        matched: list[T] = []
+        for label in reversed(hostname.lower().split(".")):
+            node = node._children.get(label)
+            if node is None:
+                break
+            matched = node._values or matched
+        return matched
+
+
+class ResolverListener:
+    """Background thread listening for invalidations sent by other processes"""
+
+    def __init__(self, resolver: Resolver) -> None:
+        self.resolver = resolver
+        self.ready = Event()
+        self.pid = getpid()
+        self._thread = Thread(target=self._run, name="authentik-resolver", daemon=True)
+        self._thread.start()
+
+    def make_conninfo(self) -> str:
+        db_params = connections["default"].get_connection_params()
+        # Prevent psycopg from using the custom synchronous cursor factory from django
+        db_params.pop("cursor_factory", None)
+        db_params.pop("context", None)
+        return make_conninfo(conninfo="", **db_params, connect_timeout=10)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with Connection.connect(self.make_conninfo(), autocommit=True) as conn:
+                    conn.execute(
+                        sql.SQL("LISTEN {channel}").format(
+                            channel=sql.Identifier(INVALIDATE_CHANNEL)
+                        )
+                    )
+                    self.ready.set()
+                    while True:
+                        for notify in conn.notifies(timeout=30):
+                            for prefix in notify.payload.split("\n"):
+                                self.resolver.clear(prefix)
+            except PsycopgError as exc:
+                LOGGER.warning("Postgres connection is not healthy", exc=exc)
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.warning("Unexpected exception in resolver listener", exc=exc, exc_info=True)
+            # Invalidations may have been missed while disconnected
+            self.ready.clear()
+            self.resolver.clear()
+            sleep(1)
+
+
+class Resolver:
+    """Per-process cache of the objects needed to resolve the tenant, brand and session of
+    a request.
+
+    Entries are loaded on first use and dropped whenever they change in any process. Until this
+    process listens for those changes, entries are loaded on every call instead."""
+
+    def __init__(self) -> None:
+        self._timeout: float | None = None
+        self._data: dict[str, tuple[float, Any]] = {}
+        self._lock = Lock()
+        self._listener: ResolverListener | None = None
+
+    @property
+    def timeout(self) -> float:
+        """How long entries are used, as a safety net for changes that don't send signals,
+        such as `QuerySet.update()`"""
+        if self._timeout is None:
+            self._timeout = CONFIG.get_int("tenants.resolver_cache_timeout", 60)
+        return self._timeout
+
+    def _ready(self) -> bool:
+        listener = self._listener
+        if listener is None or listener.pid != getpid():
+            with self._lock:
+                listener = self._listener
+                if listener is None or listener.pid != getpid():
+                    # Don't re-use state inherited from a parent process
+                    self._data = {}
+                    listener = self._listener = ResolverListener(self)
+        return listener.ready.is_set()
+
+    def lookup(self, key: str) -> Any | None:
+        """Get the cached value of `key`, or None if it isn't cached"""
+        listener = self._listener
+        if listener is None or listener.pid != getpid():
+            return None
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > monotonic():
+            return entry[1]
+        return None
+
+    def store(self, key: str, value: Any, timeout: float | None = None) -> None:
+        """Cache `value` for `timeout` seconds, defaulting to the configured timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        if timeout <= 0 or not self._ready():
+            return
+        if len(self._data) >= RESOLVER_MAX_ENTRIES:
+            current = monotonic()
+            self._data = {k: v for k, v in list(self._data.items()) if v[0] > current}
+            if len(self._data) >= RESOLVER_MAX_ENTRIES:
+                self._data = {}
+        self._data[key] = (monotonic() + timeout, value)
+
+    def get[T](self, key: str, loader: Callable[[], T], timeout: float | None = None) -> T:
+        value = self.lookup(key)
+        if value is None:
+            value = loader()
+            self.store(key, value, timeout)
+        return value
+
+    def clear(self, prefix: str = "") -> None:
+        """Drop all entries starting with `prefix` in this process"""
+        if not prefix:
+            self._data = {}
+            return
+        for key in list(self._data):
+            if key.startswith(prefix):
+                self._data.pop(key, None)
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop all entries starting with `prefix` in all processes. Other processes are
+        notified once the current transaction commits."""
+        self.clear(prefix)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [INVALIDATE_CHANNEL, prefix])
+
+    def invalidate_many(self, prefixes: Iterable[str]) -> None:
+        """Drop all entries starting with any of `prefixes` in all processes, with as few
+        notifications as possible. Other processes are notified once the current transaction
+        commits."""
+        payloads = [""]
+        for prefix in prefixes:
+            if not prefix:
+                # Would drop everything when sent on its own
+                continue
+            self.clear(prefix)
+            if payloads[-1] and len(payloads[-1]) + len(prefix) >= NOTIFY_PAYLOAD_MAX:
+                payloads.append("")
+            payloads[-1] = f"{payloads[-1]}\n{prefix}" if payloads[-1] else prefix
+        with connection.cursor() as cursor:
+            for payload in payloads:
+                if payload:
+                    cursor.execute("SELECT pg_notify(%s, %s)", [INVALIDATE_CHANNEL, payload])
+
+
+RESOLVER = Resolver()
+
+
+def invalidate_resolver(sender: type[Model], **_):
+    """Signal handler to invalidate the resolver when a tenant, domain or brand changes"""
+    RESOLVER.invalidate()
+
+
+def _load_tenants() -> tuple[dict[str, Tenant], Tenant | None]:
+    domains = {domain.domain: domain.tenant for domain in Domain.objects.select_related("tenant")}
+    return domains, Tenant.objects.filter(schema_name=get_public_schema_name()).first()
+
+
+def resolve_tenant(hostname: str | None) -> Tenant | None:
+    """Get the tenant for `hostname`, falling back to the default tenant"""
+    domains, default = RESOLVER.get("tenants", _load_tenants)
+    tenant = domains.get(hostname, default) if hostname else default
+    # Cached instances are shared between requests
+    return copy(tenant) if tenant else None
@@ -1,14 +1,24 @@
 """authentik tenants signals"""
 
 from django.db import models
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django_tenants.utils import get_public_schema_name
 
-from authentik.tenants.models import Tenant
+from authentik.tenants.models import Domain, Tenant
+from authentik.tenants.resolver import invalidate_resolver
 
 
 @receiver(pre_delete, sender=Tenant)
 def tenants_ensure_no_default_delete(sender, instance: Tenant, **kwargs):
     if instance.schema_name == get_public_schema_name():
         raise models.ProtectedError("Cannot delete schema public", instance)
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def tenants_invalidate_resolver(sender, **kwargs):
+    """Invalidate cached tenants and domains"""
+    invalidate_resolver(sender)
@@ -0,0 +1,97 @@
+"""Test tenant and brand resolution"""
+
+from time import monotonic, sleep
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from authentik.tenants.resolver import INVALIDATE_CHANNEL, DomainTrie, Resolver, ResolverListener
+
+
+class TestDomainTrie(SimpleTestCase):
+    """Test DomainTrie"""
+
+    def test_match(self):
+        """Test the longest matching domain is used"""
+        trie = DomainTrie()
+        trie.insert("example.com", "parent")
+        trie.insert("Sub.example.com", "child")
+        trie.insert("sub.example.com", "other")
+        self.assertEqual(trie.match("example.com"), ["parent"])
+        self.assertEqual(trie.match("foo.example.com"), ["parent"])
+        self.assertEqual(trie.match("sub.EXAMPLE.com"), ["child", "other"])
+        self.assertEqual(trie.match("a.b.sub.example.com"), ["child", "other"])
+        self.assertEqual(trie.match("otherexample.com"), [])
+        self.assertEqual(trie.match("com"), [])
+
+
+class TestResolver(TestCase):
+    """Test Resolver"""
+
+    def setUp(self):
+        self.resolver = Resolver()
+        self.resolver._timeout = 60
+
+    def _wait_ready(self):
+        self.resolver._ready()
+        self.assertTrue(self.resolver._listener.ready.wait(10))
+
+    def test_not_ready(self):
+        """Test nothing is cached until the process listens for invalidations"""
+        with patch.object(ResolverListener, "_run"):
+            self.resolver.store("foo", "bar")
+            self.assertIsNone(self.resolver.lookup("foo"))
+            self.assertEqual(self.resolver.get("foo", lambda: "baz"), "baz")
+            self.assertIsNone(self.resolver.lookup("foo"))
+
+    def test_store_lookup(self):
+        """Test entries are cached until they time out or are cleared"""
+        self._wait_ready()
+        self.resolver.store("foo/a", "bar")
+        self.resolver.store("foo/b", "bar", timeout=1)
+        self.resolver.store("baz", "bar")
+        self.assertEqual(self.resolver.lookup("foo/a"), "bar")
+        self.assertEqual(self.resolver.get("foo/a", lambda: "other"), "bar")
+        with patch("authentik.tenants.resolver.monotonic", return_value=monotonic() + 2):
+            self.assertEqual(self.resolver.lookup("foo/a"), "bar")
+            self.assertIsNone(self.resolver.lookup("foo/b"))
+        self.resolver.clear("foo/")
+        self.assertIsNone(self.resolver.lookup("foo/a"))
+        self.assertEqual(self.resolver.lookup("baz"), "bar")
+
+    def test_invalidate_many(self):
+        """Test multiple prefixes are invalidated with a single notification"""
+        self._wait_ready()
+        self.resolver.store("foo/a", "bar")
+        self.resolver.store("foo/b", "bar")
+        self.resolver.store("baz", "bar")
+        with CaptureQueriesContext(connection) as ctx:
+            self.resolver.invalidate_many(["foo/a", "foo/b"])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIsNone(self.resolver.lookup("foo/a"))
+        self.assertIsNone(self.resolver.lookup("foo/b"))
+        self.assertEqual(self.resolver.lookup("baz"), "bar")
+
+
+class TestResolverListener(TransactionTestCase):
+    """Test invalidations sent by other processes"""
+
+    def test_invalidate(self):
+        """Test all prefixes of a notification are dropped"""
+        resolver = Resolver()
+        resolver._timeout = 60
+        resolver._ready()
+        self.assertTrue(resolver._listener.ready.wait(10))
+        resolver.store("foo/a", "bar")
+        resolver.store("foo/b", "bar")
+        resolver.store("baz", "bar")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [INVALIDATE_CHANNEL, "foo/a\nfoo/b"])
+        deadline = monotonic() + 10
+        while resolver.lookup("foo/b") is not None and monotonic() < deadline:
+            sleep(0.05)
+        self.assertIsNone(resolver.lookup("foo/a"))
+        self.assertIsNone(resolver.lookup("foo/b"))
+        self.assertEqual(resolver.lookup("baz"), "bar")
@@ -7,7 +7,7 @@ from django.db.models import Model
 from django.http import HttpRequest
 
 from guardian.conf import settings as guardian_settings
-from guardian.core import ObjectPermissionChecker
+from guardian.core import get_checker
 from guardian.exceptions import WrongAppError
 from guardian.utils import get_content_type
 
@@ -105,8 +105,7 @@ class ObjectPermissionBackend:
                         f"content_type has app label '{ctype.app_label}'"
                     )
 
-        check = ObjectPermissionChecker(user_obj)
-        return check.has_perm(perm, obj)
+        return get_checker(user_obj).has_perm(perm, obj)
 
     def get_all_permissions(self, user_obj: Any, obj: Model | None = None) -> Iterable[str]:
         """Returns all permissions for a given object.
@@ -123,5 +122,4 @@ class ObjectPermissionBackend:
         if not support:
             return set()
 
-        check = ObjectPermissionChecker(user_obj)
-        return check.get_perms(obj)
+        return get_checker(user_obj).get_perms(obj)
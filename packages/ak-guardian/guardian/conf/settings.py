@@ -11,6 +11,9 @@ ANONYMOUS_USER_CACHE_TTL = getattr(settings, "GUARDIAN_ANONYMOUS_USER_CACHE_TTL"
 
 group_model_label = getattr(settings, "GUARDIAN_GROUP_MODEL", None)
 role_model_label = getattr(settings, "GUARDIAN_ROLE_MODEL", None)
+# Optional model with the object permissions of each user through all of their roles,
+# with the fields `user`, `content_type`, `permission` and `object_pk`
+user_obj_perms_model_label = getattr(settings, "GUARDIAN_USER_OBJ_PERMS_MODEL", None)
 if group_model_label is None:
     raise ImproperlyConfigured("ak-guardian requires settings.GUARDIAN_GROUP_MODEL")
 if role_model_label is None:
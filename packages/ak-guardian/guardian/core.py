@@ -1,8 +1,23 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.contrib.auth.models import Permission
 from django.db.models import Model, Q
 from django.utils.encoding import force_str
 
-from guardian.utils import get_content_type, get_identity
+from guardian.utils import (
+    get_content_type,
+    get_identity,
+    get_role_obj_perms_model,
+    get_user_obj_perms_model,
+)
+
+_CTX_CHECKERS = ContextVar[dict[tuple, "ObjectPermissionChecker"] | None](
+    "guardian_checkers", default=None
+)
+# User of the current scope, for example the user of a request
+_CTX_SCOPE_USER = ContextVar[Model | None]("guardian_scope_user", default=None)
 
 
 def remove_app_label(perm: str) -> str:
@@ -60,18 +75,29 @@ class ObjectPermissionChecker:
 
         return perm in perms
 
-    def role_filter(self, related_name: str) -> dict:
+    def role_filter(self, related_name: str = "") -> dict:
+        prefix = f"{related_name}__" if related_name else ""
         if self.user:
-            return {f"{related_name}__role__in": self.user.all_roles()}
+            return {f"{prefix}role__in": self.user.identity.role_pks}
         elif self.group:
-            return {f"{related_name}__role__in": self.group.all_roles()}
+            return {f"{prefix}role__in": self.group.all_roles()}
         elif self.role:
-            return {f"{related_name}__role": self.role}
+            return {f"{prefix}role": self.role}
         return {}
 
     def object_filter(self, obj: Model) -> dict:
         from guardian.models import RoleObjectPermission
 
+        user_model = get_user_obj_perms_model()
+        if self.user and user_model:
+            # Object permissions of the user through all roles, without resolving the roles
+            related_name = user_model.permission.field.related_query_name()
+            return {
+                f"{related_name}__user": self.user,
+                f"{related_name}__content_type": get_content_type(obj),
+                f"{related_name}__object_pk": obj.pk,
+            }
+
         related_name = RoleObjectPermission.permission.field.related_query_name()
         filter = {
             f"{related_name}__content_type": get_content_type(obj),
@@ -118,9 +144,95 @@ class ObjectPermissionChecker:
             self._obj_perms_cache[key] = {f"{ct}.{name}" for ct, name in perms_list}
         return self._obj_perms_cache[key]
 
+    def prefetch_perms(self, objects: Iterable[Model]) -> None:
+        """Load the permissions for all given objects at once, for example for a page of a
+        list view. Later checks for these objects don't hit the database.
+
+        Parameters:
+            objects (Iterable[Model]): Django `Model` instances, may be of different models.
+        """
+        if self.user and (not self.user.is_active or self.user.is_superuser):
+            # Checks don't query permissions for these users
+            return
+        pending: dict[int, set[str]] = {}
+        for obj in objects:
+            ctype_id, pk = self.get_local_cache_key(obj)
+            if (ctype_id, pk) not in self._obj_perms_cache:
+                pending.setdefault(ctype_id, set()).add(pk)
+        if not pending:
+            return
+        model_perms = self.get_perms()
+        user_model = get_user_obj_perms_model() if self.user else None
+        for ctype_id, pks in pending.items():
+            obj_perms: dict[str, set[str]] = {pk: set() for pk in pks}
+            if user_model:
+                rows = user_model.objects.filter(
+                    user=self.user, content_type_id=ctype_id, object_pk__in=pks
+                )
+            else:
+                rows = get_role_obj_perms_model().objects.filter(
+                    content_type_id=ctype_id, object_pk__in=pks, **self.role_filter()
+                )
+            for pk, app_label, codename in rows.values_list(
+                "object_pk", "permission__content_type__app_label", "permission__codename"
+            ):
+                obj_perms[pk].add(f"{app_label}.{codename}")
+            for pk, perms in obj_perms.items():
+                self._obj_perms_cache[(ctype_id, pk)] = model_perms | perms
+
     def get_local_cache_key(self, obj: Model | None) -> tuple:
         """Returns cache key for `_obj_perms_cache` dict."""
         if not obj:
             return ("", "")
         ctype = get_content_type(obj)
         return ctype.id, force_str(obj.pk)
+
+
+@contextmanager
+def checker_scope(user: Model | None = None) -> Iterator[None]:
+    """Share checkers between all permission checks within this context, for example a
+    request. Checkers created by `get_checker` outside of a scope are not shared. Nested
+    scopes share the checkers of the outermost scope. State `user` resolved once per instance
+    is cleared by `clear_checkers` as well."""
+    if _CTX_CHECKERS.get() is not None:
+        yield
+        return
+    token = _CTX_CHECKERS.set({})
+    user_token = _CTX_SCOPE_USER.set(user)
+    try:
+        yield
+    finally:
+        _CTX_SCOPE_USER.reset(user_token)
+        _CTX_CHECKERS.reset(token)
+
+
+def get_checker(identity: Model) -> ObjectPermissionChecker:
+    """Get the checker for `identity` of the current scope, or a new checker when not
+    within a scope.
+
+    Parameters:
+        identity (User | Group | Role): The identity to check permissions for.
+    """
+    checkers = _CTX_CHECKERS.get()
+    if checkers is None:
+        return ObjectPermissionChecker(identity)
+    key = (identity._meta.label, identity.pk)
+    if key not in checkers:
+        checkers[key] = ObjectPermissionChecker(identity)
+    return checkers[key]
+
+
+def clear_checkers() -> None:
+    """Drop the checkers of the current scope, after permissions or role memberships
+    changed. Users of the scope and its checkers with memberships resolved once per instance
+    (`clear_identity`) resolve them again."""
+    checkers = _CTX_CHECKERS.get()
+    if checkers is None:
+        return
+    users = [checker.user for checker in checkers.values() if checker.user is not None]
+    if (scope_user := _CTX_SCOPE_USER.get()) is not None:
+        users.append(scope_user)
+    for user in users:
+        if clear_identity := getattr(user, "clear_identity", None):
+            clear_identity()
+    checkers.clear()
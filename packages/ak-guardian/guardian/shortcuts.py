@@ -14,7 +14,7 @@ from django.db.models import (
 )
 from django.db.models.expressions import RawSQL
 
-from guardian.core import ObjectPermissionChecker
+from guardian.core import ObjectPermissionChecker, checker_scope
 from guardian.exceptions import (
     GuardianError,
     InvalidIdentity,
@@ -26,6 +26,7 @@ from guardian.utils import (
     get_identity,
     get_role_model_perms_model,
     get_role_obj_perms_model,
+    get_user_obj_perms_model,
 )
 
 
@@ -240,8 +241,10 @@ def get_objects_for_user(  # noqa: PLR0912 PLR0915
     if user.is_anonymous:
         user = get_anonymous_user()
 
-    # If the user has a model-level permission, we don't need to filter on it
-    model_perms = {code for code in codenames if user.has_perm(ctype.app_label + "." + code)}
+    # If the user has a model-level permission, we don't need to filter on it.
+    # The user's model-level permissions are loaded once for all codenames
+    with checker_scope():
+        model_perms = {code for code in codenames if user.has_perm(ctype.app_label + "." + code)}
     for code in model_perms:
         codenames.discard(code)
     # We may be done
@@ -249,12 +252,18 @@ def get_objects_for_user(  # noqa: PLR0912 PLR0915
         return queryset
 
     # Now we should extract the list of pk values for which we would filter the queryset
-    role_model = get_role_obj_perms_model()
-    perms_queryset = (
-        role_model.objects.filter(role__in=user.all_roles())
-        .filter(permission__content_type=ctype)
-        .filter(permission__codename__in=codenames)
-    )
+    if user_model := get_user_obj_perms_model():
+        # Object permissions of the user through all roles, without resolving the roles
+        perms_queryset = user_model.objects.filter(
+            user=user, content_type=ctype, permission__codename__in=codenames
+        )
+    else:
+        role_model = get_role_obj_perms_model()
+        perms_queryset = (
+            role_model.objects.filter(role__in=user.identity.role_pks)
+            .filter(permission__content_type=ctype)
+            .filter(permission__codename__in=codenames)
+        )
 
     if len(codenames) > 1:
         perms_queryset = (
@@ -40,6 +40,13 @@ def get_role_model_perms_model() -> type[Model]:
     return RoleModelPermission
 
 
+def get_user_obj_perms_model() -> type[Model] | None:
+    if guardian_settings.user_obj_perms_model_label is None:
+        return None
+    app_name, model_name = guardian_settings.user_obj_perms_model_label.split(".", 1)
+    return apps.get_model(app_name, model_name)
+
+
 def get_group_model() -> type[Model]:
     app_name, model_name = guardian_settings.group_model_label.split(".", 1)
     return apps.get_model(app_name, model_name)
@@ -19,13 +19,20 @@ from psycopg.errors import Error as PsycopgError
 from psycopg_pool import AsyncConnectionPool
 from structlog.stdlib import get_logger
 
-from django_channels_postgres.models import NOTIFY_CHANNEL, GroupChannel, Message
+from django_channels_postgres.models import (
+    NOTIFY_CHANNEL,
+    GroupChannel,
+    GroupMessage,
+    Message,
+    notify_channel_for_token,
+)
 
 LOGGER = get_logger()
 
 
 GROUP_CHANNEL_TABLE = GroupChannel._meta.db_table
 MESSAGE_TABLE = Message._meta.db_table
+GROUP_MESSAGE_TABLE = GroupMessage._meta.db_table
 
 
 async def _async_proxy(
@@ -127,6 +134,15 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
 
     Using a database also means messages are durable and will always be
     available to consumers (as long as they're not expired).
+
+    Specific channels created by `new_channel()` carry a token identifying
+    the receiver hosting them, and their notifications are only sent to that
+    receiver. Messages too large to be inlined are fetched by that receiver only.
+
+    Group messages are stored once in a separate table and are not deleted
+    on receive. Only the receivers hosting members are notified, each of them
+    delivers the message to the group members it hosts. They are removed once
+    expired.
     """
 
     def __init__(
@@ -150,7 +166,13 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
 
         # Each consumer gets its own *specific* channel, created with the `new_channel()` method.
         # This dict maps `channel_name` to a queue of messages for that channel.
-        self.channels: dict[str, asyncio.Queue[tuple[str, bytes | None]]] = {}
+        # Queue items are `(message_id, message)`. `message_id` is None when there is
+        # no row left to delete, `message` is None when it has to be fetched.
+        self.channels: dict[str, asyncio.Queue[tuple[str | None, bytes | None]]] = {}
+
+        # Received messages are deleted in batches
+        self._pending_deletes: list[str] = []
+        self._delete_task: asyncio.Task[None] | None = None
 
         self._pool: AsyncConnectionPool | None = None
         self.receiver = PostgresChannelLayerReceiver(self.using, self)
@@ -226,7 +248,7 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
         Returns a new channel name that can be used by something in our
         process as a specific channel.
         """
-        channel = f"{self.prefix}.{prefix}.{uuid4().hex}"
+        channel = f"{self.prefix}.{prefix}.{self.receiver.token}!{uuid4().hex}"
         await self._subscribe_to_channel(channel)
         return channel
 
@@ -243,9 +265,11 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
         try:
             while True:
                 message_id, message = await q.get()
-                async with await self.connection() as conn:
-                    async with conn.cursor() as cursor:
-                        if message is None:
+                if message is None:
+                    # The message was too large to be sent inline, deleting it
+                    # claims it and fetches it in one go
+                    async with await self.connection() as conn:
+                        async with conn.cursor() as cursor:
                             await cursor.execute(
                                 sql.SQL("""
                                     DELETE
@@ -260,21 +284,11 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
                                 (message_id,),
                             )
                             row = await cursor.fetchone()
-                            if row is None:
-                                continue
-                            message = row[0]
-                        else:
-                            await cursor.execute(
-                                sql.SQL("""
-                                    DELETE
-                                    FROM {table}
-                                    WHERE {table}.{id} = %s
-                                """).format(
-                                    table=sql.Identifier(MESSAGE_TABLE),
-                                    id=sql.Identifier("id"),
-                                ),
-                                (message_id,),
-                            )
+                    if row is None:
+                        continue
+                    message = row[0]
+                elif message_id is not None:
+                    self._delete_message(message_id)
                 break
         except asyncio.CancelledError, TimeoutError, GeneratorExit:
             # We assume here that the reason we are cancelled is because the consumer
@@ -331,6 +345,8 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
                         now() + timedelta(seconds=self.group_expiry),
                     ),
                 )
+        if channel in self.channels:
+            self.receiver.group_add(group_key, channel)
 
     async def group_discard(self, group: str, channel: str) -> None:
         """
@@ -358,6 +374,7 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
                     ),
                     (group_key, channel),
                 )
+        self.receiver.group_discard(group_key, channel)
 
     async def group_send(self, group: str, message: dict[str, Any]) -> None:
         """
@@ -367,41 +384,16 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
 
         group_key = self._group_key(group)
 
-        serialized_message = self.channel_layer.serialize(message)
-
         async with await self.connection() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(
-                    sql.SQL("""
-                        SELECT DISTINCT {table}.{channel}
-                        FROM {table}
-                        WHERE {table}.{group_key} = %s
-                        """).format(
-                        table=sql.Identifier(GROUP_CHANNEL_TABLE),
-                        channel=sql.Identifier("channel"),
-                        group_key=sql.Identifier("group_key"),
-                    ),
-                    (group_key,),
-                )
-                channels = [row[0] for row in await cursor.fetchall()]
-            messages = [
-                (uuid4(), channel, serialized_message, now() + timedelta(seconds=self.expiry))
-                for channel in channels
-            ]
-            async with conn.cursor() as cursor:
-                await cursor.executemany(
-                    sql.SQL("""
-                        INSERT INTO {table}
-                        ({id}, {channel}, {message}, {expires})
-                        VALUES (%s, %s, %s, %s)
-                        """).format(
-                        table=sql.Identifier(MESSAGE_TABLE),
-                        id=sql.Identifier("id"),
-                        channel=sql.Identifier("channel"),
-                        message=sql.Identifier("message"),
-                        expires=sql.Identifier("expires"),
+                    self._group_send_query(),
+                    (
+                        uuid4(),
+                        group_key,
+                        self.channel_layer.serialize(message),
+                        now() + timedelta(seconds=self.expiry),
                     ),
-                    messages,
                 )
 
     def group_send_blocking(self, group: str, message: dict[str, Any]) -> None:
@@ -412,48 +404,63 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
 
         group_key = self._group_key(group)
 
-        serialized_message = self.channel_layer.serialize(message)
-
         with connections[self.using].cursor() as cursor:
             cursor.execute(
-                sql.SQL("""
-                    SELECT DISTINCT {table}.{channel}
-                    FROM {table}
-                    WHERE {table}.{group_key} = %s
-                    """).format(
-                    table=sql.Identifier(GROUP_CHANNEL_TABLE),
-                    channel=sql.Identifier("channel"),
-                    group_key=sql.Identifier("group_key"),
-                ),
-                (group_key,),
-            )
-            channels = [row[0] for row in cursor.fetchall()]
-        messages = [
-            (uuid4(), channel, serialized_message, now() + timedelta(seconds=self.expiry))
-            for channel in channels
-        ]
-        with connections[self.using].cursor() as cursor:
-            cursor.executemany(
-                sql.SQL("""
-                    INSERT INTO {table}
-                    ({id}, {channel}, {message}, {expires})
-                    VALUES (%s, %s, %s, %s)
-                    """).format(
-                    table=sql.Identifier(MESSAGE_TABLE),
-                    id=sql.Identifier("id"),
-                    channel=sql.Identifier("channel"),
-                    message=sql.Identifier("message"),
-                    expires=sql.Identifier("expires"),
+                self._group_send_query(),
+                (
+                    uuid4(),
+                    group_key,
+                    self.channel_layer.serialize(message),
+                    now() + timedelta(seconds=self.expiry),
                 ),
-                messages,
             )
 
+    def _group_send_query(self) -> sql.Composed:
+        return sql.SQL("""
+            INSERT INTO {table}
+            ({id}, {group_key}, {message}, {expires})
+            VALUES (%s, %s, %s, %s)
+            """).format(
+            table=sql.Identifier(GROUP_MESSAGE_TABLE),
+            id=sql.Identifier("id"),
+            group_key=sql.Identifier("group_key"),
+            message=sql.Identifier("message"),
+            expires=sql.Identifier("expires"),
+        )
+
     def _group_key(self, group: str) -> str:
         """
         Common function to make the storage key for the group.
         """
         return f"{self.prefix}.group.{group}"
 
+    def _delete_message(self, message_id: str) -> None:
+        """
+        Queue a received message for deletion. Deletes are flushed in batches.
+        """
+        self._pending_deletes.append(message_id)
+        if self._delete_task is None or self._delete_task.done():
+            self._delete_task = asyncio.ensure_future(self._flush_deletes())
+
+    async def _flush_deletes(self) -> None:
+        while self._pending_deletes:
+            message_ids, self._pending_deletes = self._pending_deletes, []
+            try:
+                async with await self.connection() as conn:
+                    await conn.execute(
+                        sql.SQL("""
+                            DELETE
+                            FROM {table}
+                            WHERE {table}.{id} = ANY(%s::uuid[])
+                        """).format(
+                            table=sql.Identifier(MESSAGE_TABLE),
+                            id=sql.Identifier("id"),
+                        ),
+                        (message_ids,),
+                    )
+            except PsycopgError as exc:
+                LOGGER.warning("Failed to delete received messages", exc=exc)
+
     ### Flush extension ###
 
     async def flush(self) -> None:
@@ -461,6 +468,9 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
         Deletes all messages and groups.
         """
         self.channels = {}
+        if self._delete_task is not None:
+            await self._delete_task
+            self._delete_task = None
         await self.receiver.flush()
 
 
@@ -469,6 +479,15 @@ class PostgresChannelLayerReceiver:
         self.using = using
         self.channel_layer = channel_layer
         self._subscribed_to: set[str] = set()
+        # Identifies this receiver in the names of the channels it hosts
+        self.token = uuid4().hex[:12]
+        self.notify_channel = notify_channel_for_token(self.token)
+        # Maps group keys to the subscribed channels of this process that are members
+        self._groups: dict[str, set[str]] = {}
+        # Group messages already delivered, with their expiry, to avoid delivering
+        # them twice when catching up after a reconnect
+        self._delivered_group_messages: dict[str, datetime] = {}
+        self._disconnected_at: datetime | None = None
         self._lock = asyncio.Lock()
         self._receive_task: asyncio.Task[None] | None = None
 
@@ -483,6 +502,18 @@ class PostgresChannelLayerReceiver:
             if channel in self._subscribed_to:
                 self._ensure_receiver()
                 self._subscribed_to.remove(channel)
+                for group_key in list(self._groups):
+                    self.group_discard(group_key, channel)
+
+    def group_add(self, group_key: str, channel: str) -> None:
+        self._groups.setdefault(group_key, set()).add(channel)
+
+    def group_discard(self, group_key: str, channel: str) -> None:
+        if (channels := self._groups.get(group_key)) is None:
+            return
+        channels.discard(channel)
+        if not channels:
+            del self._groups[group_key]
 
     async def flush(self) -> None:
         async with self._lock:
@@ -494,6 +525,9 @@ class PostgresChannelLayerReceiver:
                     pass
                 self._receive_task = None
             self._subscribed_to = set()
+            self._groups = {}
+            self._delivered_group_messages = {}
+            self._disconnected_at = None
 
     async def _do_receiving(self) -> None:
         while True:
@@ -502,19 +536,24 @@ class PostgresChannelLayerReceiver:
                     conninfo=self.channel_layer.make_conninfo(),
                     autocommit=True,
                 ) as conn:
+                    for notify_channel in (NOTIFY_CHANNEL, self.notify_channel):
+                        await conn.execute(
+                            sql.SQL("LISTEN {channel}").format(
+                                channel=sql.Identifier(notify_channel)
+                            )
+                        )
                     await self._process_backlog(conn)
-                    await conn.execute(
-                        sql.SQL("LISTEN {channel}").format(channel=sql.Identifier(NOTIFY_CHANNEL))
-                    )
                     while True:
                         async for notify in conn.notifies(timeout=30):
-                            await self._receive_notify(notify)
+                            await self._handle_notify(notify)
             except asyncio.CancelledError, TimeoutError, GeneratorExit:
                 raise
             except PsycopgError as exc:
                 LOGGER.warning("Postgres connection is not healthy", exc=exc)
             except BaseException as exc:  # noqa: BLE001
                 LOGGER.warning("Unexpected exception in receive task", exc=exc, exc_info=True)
+            if self._disconnected_at is None:
+                self._disconnected_at = now()
             await asyncio.sleep(1)
 
     async def _process_backlog(self, conn: AsyncConnection) -> None:
@@ -538,8 +577,66 @@ class PostgresChannelLayerReceiver:
                 (list(self._subscribed_to), now()),
             )
             async for row in cursor:
-                message_id, channel, message = row
-                self._receive_message(channel, message_id, message)
+                _, channel, message = row
+                # Already deleted above
+                self._receive_message(channel, None, message)
+        await self._process_group_backlog(conn)
+
+    async def _process_group_backlog(self, conn: AsyncConnection) -> None:
+        # Group memberships might have been added by other processes
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                sql.SQL("""
+                    SELECT {table}.{group_key}, {table}.{channel}
+                    FROM {table}
+                    WHERE {table}.{channel} = ANY(%s)
+                      AND {table}.{expires} >= %s
+                """).format(
+                    table=sql.Identifier(GROUP_CHANNEL_TABLE),
+                    group_key=sql.Identifier("group_key"),
+                    channel=sql.Identifier("channel"),
+                    expires=sql.Identifier("expires"),
+                ),
+                (list(self._subscribed_to), now()),
+            )
+            async for group_key, channel in cursor:
+                self.group_add(group_key, channel)
+
+        disconnected_at, self._disconnected_at = self._disconnected_at, None
+        if disconnected_at is None or not self._groups:
+            return
+        # Only catch up on group messages sent while we were not listening
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                sql.SQL("""
+                    SELECT {table}.{id}, {table}.{group_key}, {table}.{message}, {table}.{expires}
+                    FROM {table}
+                    WHERE {table}.{group_key} = ANY(%s)
+                      AND {table}.{expires} >= %s
+                    ORDER BY {table}.{expires}
+                """).format(
+                    table=sql.Identifier(GROUP_MESSAGE_TABLE),
+                    id=sql.Identifier("id"),
+                    group_key=sql.Identifier("group_key"),
+                    message=sql.Identifier("message"),
+                    expires=sql.Identifier("expires"),
+                ),
+                (
+                    list(self._groups),
+                    max(
+                        now(),
+                        disconnected_at + timedelta(seconds=self.channel_layer.expiry - 1),
+                    ),
+                ),
+            )
+            async for message_id, group_key, message, expires in cursor:
+                self._receive_group_message(group_key, str(message_id), message, expires)
+
+    async def _handle_notify(self, notify: Notify) -> None:
+        if notify.payload.startswith("g:"):
+            await self._receive_group_notify(notify)
+        else:
+            await self._receive_notify(notify)
 
     async def _receive_notify(self, notify: Notify) -> None:
         payload = notify.payload
@@ -566,7 +663,90 @@ class PostgresChannelLayerReceiver:
                 return
         self._receive_message(channel, message_id, message)
 
-    def _receive_message(self, channel: str, message_id: str, message: bytes | None) -> None:
+    async def _receive_group_notify(self, notify: Notify) -> None:
+        split_payload = notify.payload.removeprefix("g:").split(":")
+        base64_message: str | None = None
+        match len(split_payload):
+            case 4:
+                message_id, group_key, timestamp, base64_message = split_payload
+            case 3:
+                message_id, group_key, timestamp = split_payload
+            case _:
+                return
+        expires = datetime.fromtimestamp(float(timestamp), tz=UTC)
+        if expires < now():
+            return
+        if group_key not in self._groups:
+            if notify.channel != self.notify_channel:
+                return
+            # We were notified because one of our channels is a member, which
+            # has been added from another process
+            await self._load_group(group_key)
+            if group_key not in self._groups:
+                return
+        if base64_message is not None:
+            message = b64decode(base64_message)
+        else:
+            # Too large to be sent inline. Group messages are shared between receivers,
+            # so it is only read here, and removed once expired.
+            async with await self.channel_layer.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        sql.SQL("""
+                            SELECT {table}.{message}
+                            FROM {table}
+                            WHERE {table}.{id} = %s
+                        """).format(
+                            table=sql.Identifier(GROUP_MESSAGE_TABLE),
+                            id=sql.Identifier("id"),
+                            message=sql.Identifier("message"),
+                        ),
+                        (message_id,),
+                    )
+                    row = await cursor.fetchone()
+            if row is None:
+                return
+            message = row[0]
+        self._receive_group_message(group_key, message_id, message, expires)
+
+    async def _load_group(self, group_key: str) -> None:
+        async with await self.channel_layer.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    sql.SQL("""
+                        SELECT {table}.{channel}
+                        FROM {table}
+                        WHERE {table}.{group_key} = %s
+                          AND {table}.{channel} = ANY(%s)
+                          AND {table}.{expires} >= %s
+                    """).format(
+                        table=sql.Identifier(GROUP_CHANNEL_TABLE),
+                        group_key=sql.Identifier("group_key"),
+                        channel=sql.Identifier("channel"),
+                        expires=sql.Identifier("expires"),
+                    ),
+                    (group_key, list(self._subscribed_to), now()),
+                )
+                async for (channel,) in cursor:
+                    self.group_add(group_key, channel)
+
+    def _receive_group_message(
+        self, group_key: str, message_id: str, message: bytes, expires: datetime
+    ) -> None:
+        if message_id in self._delivered_group_messages:
+            return
+        # Entries are inserted in roughly the order they expire
+        _now = now()
+        while self._delivered_group_messages:
+            oldest = next(iter(self._delivered_group_messages))
+            if self._delivered_group_messages[oldest] >= _now:
+                break
+            del self._delivered_group_messages[oldest]
+        self._delivered_group_messages[message_id] = expires
+        for channel in self._groups.get(group_key, ()):
+            self._receive_message(channel, None, message)
+
+    def _receive_message(self, channel: str, message_id: str | None, message: bytes | None) -> None:
         if (q := self.channel_layer.channels.get(channel)) is not None:
             q.put_nowait((message_id, message))
 
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+import django_channels_postgres.models
+import pgtrigger.compiler
+import pgtrigger.migrations
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_channels_postgres", "0002_remove_message_notify_new_channels_message_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GroupMessage",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("group_key", models.TextField()),
+                ("message", models.BinaryField()),
+                (
+                    "expires",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django_channels_postgres.models._default_message_expiry,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Group message",
+                "verbose_name_plural": "Group messages",
+                "indexes": [
+                    models.Index(
+                        fields=["group_key", "expires"], name="django_chan_group_k_bbb65a_idx"
+                    )
+                ],
+            },
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupmessage",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_new_channels_group_message",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    constraint="CONSTRAINT",
+                    declare="DECLARE payload text; encoded_message text; epoch text;",
+                    func="\n                    encoded_message := encode(NEW.message, 'base64');\n                    epoch := extract(epoch from NEW.expires)::text;\n                    IF octet_length(NEW.id::text) + octet_length(NEW.group_key) + octet_length(epoch) + octet_length(encoded_message) + 3 < 8000 THEN\n                        payload := NEW.id::text || ':' || NEW.group_key || ':' || epoch || ':' || encoded_message;\n                    ELSE\n                        payload := NEW.id::text || ':' || NEW.group_key || ':' || epoch;\n                    END IF;\n\n                    PERFORM pg_notify('channels_group_messages', payload);\n                    RETURN NEW;\n                ",
+                    hash="6c72f9f7966f31f5f5090796ce6b63ca1d708000",
+                    operation="INSERT",
+                    pgid="pgtrigger_notify_new_channels_group_message_6fd39",
+                    table="django_channels_postgres_groupmessage",
+                    timing="DEFERRABLE INITIALLY DEFERRED",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_channels_postgres", "0003_groupmessage"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="message",
+            name="notify_new_channels_message",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="message",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_new_channels_message",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    constraint="CONSTRAINT",
+                    declare="DECLARE payload text; encoded_message text; epoch text; target text;",
+                    func="\n                    encoded_message := encode(NEW.message, 'base64');\n                    epoch := extract(epoch from NEW.expires)::text;\n                    IF octet_length(NEW.id::text) + octet_length(NEW.channel) + octet_length(epoch) + octet_length(encoded_message) + 3 < 8000 THEN\n                        payload := NEW.id::text || ':' || NEW.channel || ':' || epoch || ':' || encoded_message;\n                    ELSE\n                        payload := NEW.id::text || ':' || NEW.channel || ':' || epoch;\n                    END IF;\n\n                    target := left(coalesce('channels_messages_' || substring(NEW.channel from '([^.!]+)!'), 'channels_messages'), 63);\n                    PERFORM pg_notify(target, payload);\n                    RETURN NEW;\n                ",
+                    hash="e0ac9c6b0af5b05524dadfa05c4f714dca73da21",
+                    operation="INSERT",
+                    pgid="pgtrigger_notify_new_channels_message_d21ae",
+                    table="django_channels_postgres_message",
+                    timing="DEFERRABLE INITIALLY DEFERRED",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupmessage",
+            name="notify_new_channels_group_message",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupmessage",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_new_channels_group_message",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    constraint="CONSTRAINT",
+                    declare="DECLARE payload text; encoded_message text; epoch text; target text;",
+                    func="\n                    encoded_message := encode(NEW.message, 'base64');\n                    epoch := extract(epoch from NEW.expires)::text;\n                    IF octet_length(NEW.id::text) + octet_length(NEW.group_key) + octet_length(epoch) + octet_length(encoded_message) + 5 < 8000 THEN\n                        payload := 'g:' || NEW.id::text || ':' || NEW.group_key || ':' || epoch || ':' || encoded_message;\n                    ELSE\n                        payload := 'g:' || NEW.id::text || ':' || NEW.group_key || ':' || epoch;\n                    END IF;\n\n                    FOR target IN\n                        SELECT DISTINCT left(coalesce('channels_messages_' || substring(\"group_channel\".\"channel\" from '([^.!]+)!'), 'channels_messages'), 63)\n                        FROM \"django_channels_postgres_groupchannel\" AS \"group_channel\"\n                        WHERE \"group_channel\".\"group_key\" = NEW.group_key\n                          AND \"group_channel\".\"expires\" >= now()\n                    LOOP\n                        PERFORM pg_notify(target, payload);\n                    END LOOP;\n                    RETURN NEW;\n                ",
+                    hash="cef66fce55c1c25969cbc32faae0feb73d5101c9",
+                    operation="INSERT",
+                    pgid="pgtrigger_notify_new_channels_group_message_6fd39",
+                    table="django_channels_postgres_groupmessage",
+                    timing="DEFERRABLE INITIALLY DEFERRED",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
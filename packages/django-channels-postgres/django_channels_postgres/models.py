@@ -16,6 +16,17 @@ def _default_message_expiry() -> datetime:
 
 
 NOTIFY_CHANNEL = "channels_messages"
+# Specific channel names are `{prefix}.{type}.{token}!{id}`. Notifications for them are
+# sent to `{NOTIFY_CHANNEL}_{token}` so that only the receiver hosting them wakes up.
+# Other channel names use the shared `NOTIFY_CHANNEL`.
+NOTIFY_TARGET_SQL = (
+    f"left(coalesce('{NOTIFY_CHANNEL}_' || substring({{channel}} from '([^.!]+)!'), "
+    f"'{NOTIFY_CHANNEL}'), 63)"
+)
+
+
+def notify_channel_for_token(token: str) -> str:
+    return f"{NOTIFY_CHANNEL}_{token}"
 
 
 class GroupChannel(models.Model):
@@ -73,6 +84,7 @@ class Message(models.Model):
                     ("payload", "text"),
                     ("encoded_message", "text"),
                     ("epoch", "text"),
+                    ("target", "text"),
                 ],
                 func=f"""
                     encoded_message := encode(NEW.message, 'base64');
@@ -83,7 +95,8 @@ class Message(models.Model):
                         payload := NEW.id::text || ':' || NEW.channel || ':' || epoch;
                     END IF;
 
-                    PERFORM pg_notify('{NOTIFY_CHANNEL}', payload);
+                    target := {NOTIFY_TARGET_SQL.format(channel="NEW.channel")};
+                    PERFORM pg_notify(target, payload);
                     RETURN NEW;
                 """,  # noqa: E501
             ),
@@ -95,3 +108,63 @@ class Message(models.Model):
     @classmethod
     def delete_expired(cls) -> None:
         cls.objects.filter(expires__lt=now()).delete()
+
+
+class GroupMessage(models.Model):
+    """
+    A model that represents a message sent to a group.
+
+    Group messages are stored once per send instead of once per member channel.
+    Only the receivers hosting member channels are notified, and each of them
+    delivers the message to the member channels it hosts.
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+    group_key = models.TextField()
+    message = models.BinaryField()
+    expires = models.DateTimeField(db_index=True, default=_default_message_expiry)
+
+    class Meta:
+        verbose_name = _("Group message")
+        verbose_name_plural = _("Group messages")
+        indexes = (models.Index(fields=("group_key", "expires")),)
+        triggers = (
+            pgtrigger.Trigger(
+                name="notify_new_channels_group_message",
+                operation=pgtrigger.Insert,
+                when=pgtrigger.After,
+                timing=pgtrigger.Deferred,
+                declare=[
+                    ("payload", "text"),
+                    ("encoded_message", "text"),
+                    ("epoch", "text"),
+                    ("target", "text"),
+                ],
+                func=f"""
+                    encoded_message := encode(NEW.message, 'base64');
+                    epoch := extract(epoch from NEW.expires)::text;
+                    IF octet_length(NEW.id::text) + octet_length(NEW.group_key) + octet_length(epoch) + octet_length(encoded_message) + 5 < 8000 THEN
+                        payload := 'g:' || NEW.id::text || ':' || NEW.group_key || ':' || epoch || ':' || encoded_message;
+                    ELSE
+                        payload := 'g:' || NEW.id::text || ':' || NEW.group_key || ':' || epoch;
+                    END IF;
+
+                    FOR target IN
+                        SELECT DISTINCT {NOTIFY_TARGET_SQL.format(channel='"group_channel"."channel"')}
+                        FROM "{GroupChannel._meta.db_table}" AS "group_channel"
+                        WHERE "group_channel"."group_key" = NEW.group_key
+                          AND "group_channel"."expires" >= now()
+                    LOOP
+                        PERFORM pg_notify(target, payload);
+                    END LOOP;
+                    RETURN NEW;
+                """,  # noqa: E501
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"Group message '{self.pk}' on group '{self.group_key}'"
+
+    @classmethod
+    def delete_expired(cls) -> None:
+        cls.objects.filter(expires__lt=now()).delete()
@@ -1,8 +1,10 @@
 import functools
 import logging
 import time
+from collections import deque
 from collections.abc import Callable, Iterable
 from datetime import UTC, datetime, timedelta
+from threading import Lock
 from typing import Any, ParamSpec, TypeVar, cast
 
 import tenacity
@@ -27,6 +29,7 @@ from dramatiq.errors import ConnectionError, QueueJoinTimeout
 from dramatiq.message import Message
 from dramatiq.middleware import (
     Middleware,
+    MiddlewareError,
 )
 from pglock.core import _cast_lock_id
 from psycopg import sql
@@ -34,7 +37,13 @@ from psycopg.errors import AdminShutdown
 from structlog.stdlib import get_logger
 
 from django_dramatiq_postgres.conf import Conf
-from django_dramatiq_postgres.models import CHANNEL_PREFIX, ChannelIdentifier, TaskBase, TaskState
+from django_dramatiq_postgres.models import (
+    BULK_ENQUEUE_SETTING,
+    CHANNEL_PREFIX,
+    ChannelIdentifier,
+    TaskBase,
+    TaskState,
+)
 
 logger = get_logger(__name__)
 
@@ -42,6 +51,9 @@ P = ParamSpec("P")
 R = TypeVar("R")
 
 
+# Postgres limits NOTIFY payloads to 8000 bytes
+NOTIFY_PAYLOAD_MAX = 7000
+
 DATABASE_ERRORS = (
     AdminShutdown,
     InterfaceError,
@@ -184,6 +196,119 @@ class PostgresBroker(Broker):
             self.emit_after("enqueue", message, delay)  # type: ignore[no-untyped-call]
         return message
 
+    def _emit_enqueue_many(
+        self, when: str, messages: list[Message[Any]], delay: int | None
+    ) -> None:
+        """Call the batched `{when}_enqueue_many` hook of each middleware, falling back to
+        calling `{when}_enqueue` once per message for middlewares which don't implement it."""
+        middlewares = self.middleware if when == "before" else list(reversed(self.middleware))
+        for middleware in middlewares:
+            try:
+                hook = getattr(middleware, f"{when}_enqueue_many", None)
+                if hook is not None:
+                    hook(self, messages, delay)
+                    continue
+                hook = getattr(middleware, f"{when}_enqueue")
+                for message in messages:
+                    hook(self, message, delay)
+            except MiddlewareError:
+                if when == "before":
+                    raise
+                self.logger.critical("Unexpected failure in middleware", signal=when, exc_info=True)
+            except Exception:  # noqa: BLE001
+                self.logger.critical("Unexpected failure in middleware", signal=when, exc_info=True)
+
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(ConnectionError),
+        reraise=True,
+        wait=tenacity.wait_random_exponential(multiplier=1, max=5),
+        stop=tenacity.stop_after_attempt(3),
+        before_sleep=tenacity.before_sleep_log(
+            cast(logging.Logger, logger), logging.INFO, exc_info=True
+        ),
+    )
+    @raise_connection_error
+    def enqueue_many(
+        self, messages: Iterable[Message[Any]], *, delay: int | None = None
+    ) -> list[Message[Any]]:
+        """Enqueue multiple messages at once.
+
+        New tasks are inserted with a single statement and a single notification is sent per
+        queue. Middlewares receive the whole batch via `before_enqueue_many` and
+        `after_enqueue_many` if they implement them. Messages which already have a task (for
+        example retries) go through `enqueue` individually."""
+        messages = list(messages)
+        if not messages:
+            return []
+        existing = {
+            str(message_id)
+            for message_id in self.model._default_manager.using(self.db_alias)
+            .filter(message_id__in=[message.message_id for message in messages])
+            .values_list("message_id", flat=True)
+        }
+        new_messages = []
+        for message in messages:
+            if message.message_id in existing:
+                self.enqueue(message, delay=delay)
+                continue
+            new_messages.append(message)
+        if not new_messages:
+            return messages
+
+        for message in new_messages:
+            if delay:
+                message.options["eta"] = current_millis() + delay  # type: ignore[no-untyped-call]
+            self.declare_queue(q_name(message.queue_name))  # type: ignore[no-untyped-call]
+            message.options["model_defaults"] = self.model_defaults(message)
+            message.options["model_create_defaults"] = {}
+        self.logger.debug("Enqueueing messages", messages=len(new_messages))
+        self._emit_enqueue_many("before", new_messages, delay)
+
+        tasks = []
+        notify: dict[str, list[str]] = {}
+        for message in new_messages:
+            defaults = message.options.pop("model_defaults")
+            create_defaults = message.options.pop("model_create_defaults")
+            defaults["message"] = message.encode()
+            tasks.append(
+                self.model(
+                    message_id=message.message_id,
+                    **defaults,
+                    **create_defaults,
+                )
+            )
+            if defaults["eta"] is None:
+                notify.setdefault(message.queue_name, []).append(message.message_id)
+
+        with transaction.atomic(using=self.db_alias):
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT set_config(%s, 'on', true)", (BULK_ENQUEUE_SETTING,))
+                self.model._default_manager.using(self.db_alias).bulk_create(tasks)
+                cursor.execute("SELECT set_config(%s, 'off', true)", (BULK_ENQUEUE_SETTING,))
+                for queue_name, message_ids in notify.items():
+                    for payload in self._notify_payloads(message_ids):
+                        cursor.execute(
+                            "SELECT pg_notify(%s, %s)",
+                            (channel_name(queue_name, ChannelIdentifier.ENQUEUE), payload),
+                        )
+            for message, task in zip(new_messages, tasks, strict=True):
+                message.options["task"] = task
+                message.options["task_created"] = True
+            self._emit_enqueue_many("after", new_messages, delay)
+        return messages
+
+    def _notify_payloads(self, message_ids: list[str]) -> Iterable[str]:
+        payload: list[str] = []
+        length = 0
+        for message_id in message_ids:
+            if payload and length + len(message_id) + 1 > NOTIFY_PAYLOAD_MAX:
+                yield ",".join(payload)
+                payload, length = [], 0
+            payload.append(message_id)
+            length += len(message_id) + 1
+        if payload:
+            yield ",".join(payload)
+
     def get_declared_queues(self) -> set[str]:
         return self.queues.copy()
 
@@ -238,6 +363,12 @@ class _PostgresConsumer(Consumer):
         self.timeout = timeout // 1000
         self.to_unlock: set[str] = set()
         self.in_processing: set[str] = set()
+        # Messages claimed in a batch but not yet handed to the worker
+        self.claimed: deque[Message[Any]] = deque()
+        # Acks and nacks waiting to be written, see `_flush_post_process`
+        self.to_post_process: list[tuple[Message[Any], TaskState]] = []
+        self._post_process_lock = Lock()
+        self._post_process_flush_lock = Lock()
         self.prefetch = prefetch
         self.misses = 0
         # We have two different connections here. One for locks and one for listening to
@@ -321,28 +452,54 @@ class _PostgresConsumer(Consumer):
                 notifies=len(notifies),
                 channel=self.postgres_channel,
             )
-            return {str(notify.payload) for notify in notifies}
+            # Bulk enqueues send multiple message IDs per notification
+            return {
+                message_id for notify in notifies for message_id in str(notify.payload).split(",")
+            }
 
-    def _consume_one(self, message_id: str) -> Message[Any] | None:
-        if message_id in self.in_processing:
-            self.logger.debug("Message already consumed by self", message_id=message_id)
-            return None
+    def _consume_many(self, message_ids: list[str]) -> list[Message[Any]]:
+        """Claim up to all of `message_ids` in a single statement.
+
+        Rows locked by another consumer's claim are skipped instead of waited on. Each claimed
+        message is additionally guarded by a session-level advisory lock, which is released
+        automatically should this consumer die, so that another consumer can pick it up."""
+        message_ids = [
+            message_id for message_id in message_ids if message_id not in self.in_processing
+        ]
+        if not message_ids:
+            return []
 
         with self.locks_connection.cursor() as cursor:
             cursor.execute(
                 sql.SQL("""
+                    WITH {candidates} AS (
+                        SELECT {table}.{message_id}, {requested}.{lock_id}
+                        FROM {table}
+                        JOIN unnest(%(message_ids)s::uuid[], %(lock_ids)s::bigint[])
+                            AS {requested}({message_id}, {lock_id})
+                            ON {table}.{message_id} = {requested}.{message_id}
+                        WHERE
+                            {table}.{queue_name} = %(queue_name)s
+                            AND
+                            {table}.{state} != ALL(%(excluded_states)s)
+                            AND
+                            ({table}.{eta} < %(maximum_eta)s OR {table}.{eta} IS NULL)
+                        FOR UPDATE OF {table} SKIP LOCKED
+                    )
                     UPDATE {table}
                     SET {state} = %(state)s, {mtime} = %(mtime)s
+                    FROM {candidates}
                     WHERE
-                        {table}.{message_id} = %(message_id)s
-                        AND
-                        {table}.{state} != ALL(%(excluded_states)s)
+                        {table}.{message_id} = {candidates}.{message_id}
                         AND
-                        ({table}.{eta} < %(maximum_eta)s OR {table}.{eta} IS NULL)
-                        AND
-                        pg_try_advisory_lock(%(lock_id)s)
+                        pg_try_advisory_lock({candidates}.{lock_id})
+                    RETURNING {table}.{message_id}
                     """).format(
                     table=sql.Identifier(self.query_set.model._meta.db_table),
+                    candidates=sql.Identifier("candidates"),
+                    requested=sql.Identifier("requested"),
+                    lock_id=sql.Identifier("lock_id"),
+                    queue_name=sql.Identifier("queue_name"),
                     state=sql.Identifier("state"),
                     mtime=sql.Identifier("mtime"),
                     message_id=sql.Identifier("message_id"),
@@ -351,25 +508,29 @@ class _PostgresConsumer(Consumer):
                 {
                     "state": TaskState.CONSUMED.value,
                     "mtime": timezone.now(),
-                    "message_id": message_id,
+                    "message_ids": message_ids,
+                    "lock_ids": [
+                        self._get_message_lock_id(message_id) for message_id in message_ids
+                    ],
+                    "queue_name": self.queue_name,
                     "excluded_states": [TaskState.DONE.value, TaskState.REJECTED.value],
                     "maximum_eta": timezone.now() + timedelta(seconds=self.timeout),
-                    "lock_id": self._get_message_lock_id(message_id),
                 },
             )
-            if cursor.rowcount != 1:
-                self._unlock_message(message_id)
-                return None
+            claimed = {str(row[0]) for row in cursor.fetchall()}
+        if not claimed:
+            return []
 
-        task: TaskBase | None = (
-            self.query_set.defer(None).defer("result").filter(message_id=message_id).first()
-        )
-        if task is None:
-            return None
-        message = Message.decode(cast(bytes, task.message))
-        message.options["task"] = task
-        self.in_processing.add(str(message_id))
-        return message
+        messages = []
+        for task in self.query_set.defer(None).defer("result").filter(message_id__in=claimed):
+            message = Message.decode(cast(bytes, task.message))
+            message.options["task"] = task
+            messages.append(message)
+            self.in_processing.add(str(task.message_id))
+            claimed.discard(str(task.message_id))
+        # Claimed, but excluded by the broker's query set, let another consumer retry later
+        self.to_unlock.update(claimed)
+        return messages
 
     @raise_connection_error
     def __next__(self) -> MessageProxy | None:
@@ -377,8 +538,13 @@ class _PostgresConsumer(Consumer):
 
         # Run required processes first
         self._scheduler()
+        self._flush_post_process()
         self._purge_locks()
 
+        # Hand out messages claimed by a previous batch first
+        if self.claimed:
+            return MessageProxy(self.claimed.popleft())  # type: ignore[no-untyped-call]
+
         # If we don't have a connection yet, fetch missed notifications from the table directly
         if self._listen_connection is None and not self.pending:
             # We might miss a notification between the initial query and the first time we wait for
@@ -408,18 +574,14 @@ class _PostgresConsumer(Consumer):
         if not self.pending:
             self.pending = self._fetch_pending_messages()
 
-        # If we have some messages pending, loop to find one to process
-        while True:
-            try:
-                message_id = self.pending.pop()
-            except KeyError:
-                break
-            message = self._consume_one(str(message_id))
-            if message is not None:
-                return MessageProxy(message)  # type: ignore[no-untyped-call]
-            else:
-                self.logger.debug("Message already consumed. Skipping.", message_id=message_id)
-                continue
+        # If we have some messages pending, claim enough of them to fill the prefetch window
+        while self.pending:
+            window = max(self.prefetch - len(self.in_processing), 1)
+            message_ids = [str(self.pending.pop()) for _ in range(min(window, len(self.pending)))]
+            self.claimed.extend(self._consume_many(message_ids))
+            if self.claimed:
+                return MessageProxy(self.claimed.popleft())  # type: ignore[no-untyped-call]
+            self.logger.debug("Messages already consumed. Skipping.", message_ids=message_ids)
 
         # No message to process, we can do some cleaning
         self._auto_purge()
@@ -427,40 +589,84 @@ class _PostgresConsumer(Consumer):
         self.misses = 0
         return None
 
-    def _unlock_message(self, message_id: str) -> bool:
-        self.logger.debug("Unlocking message", message_id=message_id)
+    def _unlock_messages(self, message_ids: list[str]) -> bool:
+        self.logger.debug("Unlocking messages", message_ids=message_ids)
         try:
             with self.locks_connection.cursor() as cursor:
                 cursor.execute(
-                    "SELECT pg_advisory_unlock(%s)",
-                    (self._get_message_lock_id(message_id),),
+                    "SELECT pg_advisory_unlock(lock_id) FROM unnest(%s::bigint[]) AS lock_id",
+                    ([self._get_message_lock_id(message_id) for message_id in message_ids],),
                 )
             return True
         except DATABASE_ERRORS:
-            self.to_unlock.add(str(message_id))
+            self.to_unlock.update(message_ids)
             return False
 
+    def _post_process_messages(self, batch: list[tuple[Message[Any], TaskState]]) -> None:
+        self.logger.debug("Post-processing messages", messages=len(batch))
+        tasks = {}
+        done: dict[str, list[str]] = {}
+        for message, state in batch:
+            tasks[message.message_id] = message.options.pop("task", None)
+            if state == TaskState.DONE:
+                done.setdefault(message.queue_name, []).append(message.message_id)
+                continue
+            self.query_set.filter(
+                message_id=message.message_id,
+                queue_name=message.queue_name,
+            ).exclude(
+                state=TaskState.QUEUED,
+            ).update(
+                state=state,
+                message=message.encode(),
+                mtime=timezone.now(),
+                eta=None,
+            )
+        for queue_name, message_ids in done.items():
+            self.query_set.filter(
+                message_id__in=message_ids,
+                queue_name=queue_name,
+            ).exclude(
+                state=TaskState.QUEUED,
+            ).update(
+                state=TaskState.DONE,
+                message=b"",
+                mtime=timezone.now(),
+                eta=None,
+            )
+        for message, _ in batch:
+            message.options["task"] = tasks[message.message_id]
+            self.in_processing.discard(str(message.message_id))
+            self.to_unlock.add(str(message.message_id))
+
+    def _flush_post_process(self) -> None:
+        """Write all pending acks and nacks.
+
+        Worker threads finishing at the same time are group-committed: whichever thread gets
+        the flush lock writes everything queued so far in one batch, the others return."""
+        while True:
+            if not self._post_process_flush_lock.acquire(blocking=False):
+                return
+            try:
+                with self._post_process_lock:
+                    batch, self.to_post_process = self.to_post_process, []
+                if batch:
+                    try:
+                        self._post_process_messages(batch)
+                    except DATABASE_ERRORS:
+                        with self._post_process_lock:
+                            self.to_post_process = batch + self.to_post_process
+                        raise
+            finally:
+                self._post_process_flush_lock.release()
+            with self._post_process_lock:
+                if not self.to_post_process:
+                    return
+
     def _post_process_message(self, message: Message[Any], state: TaskState) -> None:
-        self.logger.debug("Post-processing message", message=message.message_id, state=state)
-        try:
-            self.in_processing.remove(str(message.message_id))
-        except KeyError:
-            pass
-        self.to_unlock.add(str(message.message_id))
-        task = message.options.pop("task", None)
-        m = b"" if state == TaskState.DONE else message.encode()
-        self.query_set.filter(
-            message_id=message.message_id,
-            queue_name=message.queue_name,
-        ).exclude(
-            state=TaskState.QUEUED,
-        ).update(
-            state=state,
-            message=m,
-            mtime=timezone.now(),
-            eta=None,
-        )
-        message.options["task"] = task
+        with self._post_process_lock:
+            self.to_post_process.append((message, state))
+        self._flush_post_process()
 
     @raise_connection_error
     def ack(self, message: Message[Any]) -> None:
@@ -490,13 +696,11 @@ class _PostgresConsumer(Consumer):
         self.schedule_last_run = timezone.now()
 
     def _purge_locks(self) -> None:
-        while True:
-            try:
-                message_id = self.to_unlock.pop()
-            except KeyError:
-                break
-            if not self._unlock_message(str(message_id)):
-                return
+        if not self.to_unlock:
+            return
+        message_ids = list(self.to_unlock)
+        self.to_unlock.difference_update(message_ids)
+        self._unlock_messages(message_ids)
 
     def _auto_purge(self) -> None:
         if timezone.now() - self.task_purge_last_run < self.task_purge_interval:
@@ -513,6 +717,11 @@ class _PostgresConsumer(Consumer):
     @raise_connection_error
     def close(self) -> None:
         try:
+            # Messages claimed but never handed to the worker go back to the queue
+            if self.claimed:
+                self.requeue(list(self.claimed))
+                self.claimed.clear()
+            self._flush_post_process()
             self._purge_locks()
         finally:
             if self._locks_connection is not None:
@@ -0,0 +1,21 @@
+from dramatiq.composition import group as BaseGroup
+from dramatiq.message import Message
+
+
+class group(BaseGroup):
+    """Group which enqueues all of its messages at once with `PostgresBroker.enqueue_many`.
+
+    Falls back to enqueueing messages one by one when the group has completion callbacks,
+    contains nested groups or pipelines, or the broker doesn't support bulk enqueueing."""
+
+    def run(self, *, delay: int | None = None) -> group:
+        enqueue_many = getattr(self.broker, "enqueue_many", None)
+        if (
+            self.completion_callbacks
+            or enqueue_many is None
+            or not all(isinstance(child, Message) for child in self.children)
+        ):
+            super().run(delay=delay)
+            return self
+        enqueue_many(self.children, delay=delay)
+        return self
@@ -19,6 +19,9 @@ from dramatiq.message import Message
 from django_dramatiq_postgres.conf import Conf
 
 CHANNEL_PREFIX = f"{Conf().channel_prefix}.tasks"
+# When set to "on" in a transaction, enqueueing doesn't send a notification per task,
+# the broker sends a single one per queue instead
+BULK_ENQUEUE_SETTING = "django_dramatiq_postgres.bulk_enqueue"
 
 
 class ChannelIdentifier(StrEnum):
@@ -73,7 +76,10 @@ class TaskBase(models.Model):
                 name="notify_enqueueing",
                 operation=pgtrigger.Insert | pgtrigger.Update,
                 when=pgtrigger.After,
-                condition=pgtrigger.Q(new__state=TaskState.QUEUED, new__eta=None),
+                condition=pgtrigger.Condition(
+                    f'NEW."eta" IS NULL AND NEW."state" = \'{TaskState.QUEUED.value}\' '
+                    f"AND current_setting('{BULK_ENQUEUE_SETTING}', true) IS DISTINCT FROM 'on'"
+                ),
                 timing=pgtrigger.Deferred,
                 func=f"""
                     PERFORM pg_notify(
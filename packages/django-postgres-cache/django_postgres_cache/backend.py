@@ -1,37 +1,203 @@
-import base64
 import pickle  # nosec
+from collections.abc import Iterable
 from datetime import UTC, datetime
+from os import getpid
+from threading import Event, Lock, Thread
+from time import sleep
 from typing import Any
 
 from django.conf import settings
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.backends.db import DatabaseCache as BaseDatabaseCache
-from django.db import DatabaseError
+from django.db import DatabaseError, connections, router
 from django.db.utils import ProgrammingError
 from django.utils.module_loading import import_string
 from django.utils.timezone import now
 from psqlextra.types import ConflictAction
+from psycopg import Connection, sql
+from psycopg.conninfo import make_conninfo
+from psycopg.errors import Error as PsycopgError
+from structlog.stdlib import get_logger
 
+from django_postgres_cache.local import _MISSING, LocalCache
 from django_postgres_cache.models import CacheEntry
 
+try:
+    from compression import zstd
+except ImportError:  # pragma: no cover
+    zstd = None
+
+LOGGER = get_logger()
+# Pickles (protocol 2 and up) start with 0x80, so this never conflicts with uncompressed values
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+INVALIDATE_CHANNEL = "django_postgres_cache_invalidate"
+# Payload sent to invalidate all keys, used by `clear()`
+INVALIDATE_ALL = "*"
+# Postgres limits NOTIFY payloads to 8000 bytes
+NOTIFY_PAYLOAD_MAX = 7000
+
+
+class LocalCacheListener:
+    """Background thread listening for invalidations sent by other processes"""
+
+    def __init__(self, cache: DatabaseCache) -> None:
+        self.cache = cache
+        self.ready = Event()
+        self.pid = getpid()
+        self._thread = Thread(target=self._run, name="django-postgres-cache-l1", daemon=True)
+        self._thread.start()
+
+    def make_conninfo(self) -> str:
+        db_params = connections[router.db_for_read(CacheEntry)].get_connection_params()
+        # Prevent psycopg from using the custom synchronous cursor factory from django
+        db_params.pop("cursor_factory", None)
+        db_params.pop("context", None)
+        return make_conninfo(conninfo="", **db_params, connect_timeout=10)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with Connection.connect(self.make_conninfo(), autocommit=True) as conn:
+                    conn.execute(
+                        sql.SQL("LISTEN {channel}").format(
+                            channel=sql.Identifier(INVALIDATE_CHANNEL)
+                        )
+                    )
+                    self.ready.set()
+                    while True:
+                        for notify in conn.notifies(timeout=30):
+                            self._receive(notify.payload)
+            except PsycopgError as exc:
+                LOGGER.warning("Postgres connection is not healthy", exc=exc)
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.warning("Unexpected exception in cache listener", exc=exc, exc_info=True)
+            # Invalidations may have been missed while disconnected
+            self.ready.clear()
+            self.cache.local.clear()
+            sleep(1)
+
+    def _receive(self, payload: str) -> None:
+        if payload == INVALIDATE_ALL:
+            self.cache.local.clear()
+            return
+        for key in payload.split("\n"):
+            self.cache.local.delete(key)
+
 
 class DatabaseCache(BaseDatabaseCache):
+    """Postgres cache backend, optionally with an in-process L1 tier.
+
+    The L1 tier is configured with the `L1_PREFIXES`, `L1_MAX_ENTRIES` and `L1_TIMEOUT` options.
+    Only keys starting with one of `L1_PREFIXES` are cached in-process.
+
+    Values larger than the `COMPRESS_MIN_LENGTH` option (in bytes) are compressed with zstd
+    when available, at level `COMPRESS_LEVEL`."""
+
     def __init__(self, table: str, params: dict[str, Any]) -> None:
         super().__init__(table, params)
         self.reverse_key_func = import_string(params["REVERSE_KEY_FUNCTION"])
         self._table = CacheEntry._meta.db_table
         self.cache_model_class = CacheEntry
+        options = params.get("OPTIONS", {})
+        self.local_prefixes = tuple(options.get("L1_PREFIXES", []))
+        self.local = LocalCache(
+            max_entries=int(options.get("L1_MAX_ENTRIES", 1000)),
+            timeout=float(options.get("L1_TIMEOUT", 30)),
+        )
+        self._listener: LocalCacheListener | None = None
+        self._listener_lock = Lock()
+        self.compress_min_length = options.get("COMPRESS_MIN_LENGTH")
+        self.compress_level = int(options.get("COMPRESS_LEVEL", 3))
 
     def _cull(self, *args: Any, **kwargs: Any) -> None:
         """Stubbed out cull method as we cull in a background task"""
         pass
 
+    def _local_enabled(self, key: str) -> bool:
+        """Check if `key` (as passed by the caller, before `make_key`) should be cached in L1"""
+        return bool(self.local_prefixes) and key.startswith(self.local_prefixes)
+
+    def _local_ready(self) -> bool:
+        """Check if the invalidation listener of this process is connected, starting it
+        if required. The L1 tier is bypassed until invalidations can be received."""
+        listener = self._listener
+        if listener is None or listener.pid != getpid():
+            with self._listener_lock:
+                listener = self._listener
+                if listener is None or listener.pid != getpid():
+                    # Don't re-use state inherited from a parent process
+                    self.local = LocalCache(self.local.max_entries, self.local.timeout)
+                    listener = self._listener = LocalCacheListener(self)
+        return listener.ready.is_set()
+
+    def _notify_invalidate(self, keys: list[str]) -> None:
+        """Tell all processes (including this one) to drop `keys` from their L1 tier.
+        The notification is only delivered once the current transaction commits."""
+        for key in keys:
+            self.local.delete(key)
+        payloads = [""]
+        for key in keys:
+            if payloads[-1] and len(payloads[-1]) + len(key) >= NOTIFY_PAYLOAD_MAX:
+                payloads.append("")
+            payloads[-1] = f"{payloads[-1]}\n{key}" if payloads[-1] else key
+        connection = connections[router.db_for_write(CacheEntry)]
+        with connection.cursor() as cursor:
+            for payload in payloads:
+                cursor.execute("SELECT pg_notify(%s, %s)", [INVALIDATE_CHANNEL, payload])
+
+    def _local_overlaps(self, prefix: str) -> bool:
+        """Check if any key starting with `prefix` might be cached in L1"""
+        return any(
+            prefix.startswith(local) or local.startswith(prefix) for local in self.local_prefixes
+        )
+
+    def _local_keys(self, keys: list[str]) -> list[str]:
+        """Filter database keys down to those eligible for L1 caching"""
+        if not self.local_prefixes:
+            return []
+        return [key for key in keys if self._local_enabled(self.reverse_key_func(key))]
+
     def get(self, key: str, default: Any | None = None, version: int | None = None) -> Any:
         try:
+            if self._local_enabled(key) and self._local_ready():
+                return self._get_local(key, default=default, version=version)
             return super().get(key, default=default, version=version)
         except ProgrammingError:
             return default
 
+    def _get_local(self, key: str, default: Any | None = None, version: int | None = None) -> Any:
+        key = self.make_and_validate_key(key, version=version)
+        # The encoded value is cached, so every caller gets its own copy it may modify
+        raw = self.local.get(key)
+        if raw is not _MISSING:
+            return self._decode(raw)
+        generation = self.local.generation(key)
+        entry = (
+            CacheEntry.objects.filter(cache_key=key, expires__gte=now())
+            .values_list("value", "expires")
+            .first()
+        )
+        if not entry:
+            return default
+        raw, expires = entry
+        raw = bytes(raw)
+        self.local.set(key, raw, ttl=(expires - now()).total_seconds(), generation=generation)
+        return self._decode(raw)
+
+    def get_many(self, keys: Iterable[str], version: int | None = None) -> dict[str, Any]:
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        connection = connections[router.db_for_read(CacheEntry)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT cache_key, value FROM {connection.ops.quote_name(self._table)} "
+                "WHERE cache_key = ANY(%s) AND expires >= %s",
+                [list(key_map), now()],
+            )
+            rows = cursor.fetchall()
+        return {key_map[key]: self._decode(value) for key, value in rows}
+
     def keys(self, keys_pattern: str, version: int | None = None) -> list[str]:
         try:
             return self._keys(keys_pattern, version=version)
@@ -39,14 +205,20 @@ class DatabaseCache(BaseDatabaseCache):
             return []
 
     def _keys(self, keys_pattern: str, version: int | None = None) -> list[str]:
-        keys_pattern = self.make_key(keys_pattern.replace("*", ".*"), version=version)
-
-        return [
-            self.reverse_key_func(key)
-            for key in CacheEntry.objects.filter(cache_key__regex=keys_pattern).values_list(
-                "cache_key", flat=True
+        connection = connections[router.db_for_read(CacheEntry)]
+        # Translate the glob into a LIKE pattern, the constant part before the first `*`
+        # is matched with a range scan over the `text_pattern_ops` index
+        keys_pattern = "%".join(
+            connection.ops.prep_for_like_query(part)
+            for part in self.make_key(keys_pattern, version=version).split("*")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT cache_key FROM {connection.ops.quote_name(self._table)} "
+                "WHERE cache_key LIKE %s",
+                [keys_pattern],
             )
-        ]
+            return [self.reverse_key_func(row[0]) for row in cursor.fetchall()]
 
     def ttl(self, key: str, version: int | None = None) -> int | None:
         """Get TTL left for a given key and version"""
@@ -66,20 +238,69 @@ class DatabaseCache(BaseDatabaseCache):
         exp.replace(microsecond=0)
         return exp
 
+    def _encode(self, value: Any) -> bytes:
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        if (
+            zstd is not None
+            and self.compress_min_length is not None
+            and len(pickled) >= self.compress_min_length
+        ):
+            return zstd.compress(pickled, level=self.compress_level)
+        return pickled
+
+    def _decode(self, value: bytes | memoryview) -> Any:
+        value = bytes(value)
+        if value.startswith(ZSTD_MAGIC):
+            value = zstd.decompress(value)
+        return pickle.loads(value)  # nosec
+
     def _base_set_data(
         self,
         key: Any,
         value: Any,
         timeout: float | None,
         version: int | None = None,
-    ) -> tuple[str, str, datetime]:
+    ) -> tuple[str, bytes, datetime]:
         key = self.make_and_validate_key(key, version=version)
-        pickled = pickle.dumps(value, self.pickle_protocol)
-        # The DB column is expecting a string, so make sure the value is a
-        # string, not bytes. Refs #19274.
-        b64encoded = base64.b64encode(pickled).decode("latin1")
+        return (key, self._encode(value), self._base_set_expiry(timeout))
 
-        return (key, b64encoded, self._base_set_expiry(timeout))
+    def _base_delete_many(self, keys: list[str]) -> bool:
+        if not keys:
+            return False
+        local_keys = self._local_keys(keys)
+        if local_keys:
+            self._notify_invalidate(local_keys)
+        connection = connections[router.db_for_write(CacheEntry)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(self._table)} WHERE cache_key = ANY(%s)",
+                [list(keys)],
+            )
+            return bool(cursor.rowcount)
+
+    def delete_prefix(self, prefix: str, version: int | None = None) -> int:
+        """Delete all keys starting with `prefix` and return the number of deleted keys"""
+        try:
+            return self._delete_prefix(prefix, version=version)
+        except ProgrammingError:
+            return 0
+
+    def _delete_prefix(self, prefix: str, version: int | None = None) -> int:
+        connection = connections[router.db_for_write(CacheEntry)]
+        pattern = connection.ops.prep_for_like_query(self.make_key(prefix, version=version)) + "%"
+        returning = self._local_overlaps(prefix)
+        query = f"DELETE FROM {connection.ops.quote_name(self._table)} WHERE cache_key LIKE %s"
+        if returning:
+            query += " RETURNING cache_key"
+        with connection.cursor() as cursor:
+            cursor.execute(query, [pattern])
+            if not returning:
+                return cursor.rowcount
+            keys = [row[0] for row in cursor.fetchall()]
+        local_keys = self._local_keys(keys)
+        if local_keys:
+            self._notify_invalidate(local_keys)
+        return len(keys)
 
     def touch(
         self,
@@ -87,10 +308,13 @@ class DatabaseCache(BaseDatabaseCache):
         timeout: float | None = DEFAULT_TIMEOUT,
         version: int | None = None,
     ) -> bool:
+        local = self._local_enabled(key)
         key = self.make_and_validate_key(key, version=version)
         expiry = self._base_set_expiry(timeout)
         try:
             count = CacheEntry.objects.filter(cache_key=key).update(expires=expiry)
+            if local:
+                self._notify_invalidate([key])
             return bool(count != 0)
         except DatabaseError:
             return False
@@ -102,8 +326,11 @@ class DatabaseCache(BaseDatabaseCache):
         timeout: float | None = DEFAULT_TIMEOUT,
         version: int | None = None,
     ) -> bool:
+        local = self._local_enabled(key)
         key, value, expiry = self._base_set_data(key, value, timeout, version)
         try:
+            if local:
+                self._notify_invalidate([key])
             CacheEntry.objects.on_conflict(
                 ["cache_key"],
                 ConflictAction.UPDATE,
@@ -127,7 +354,10 @@ class DatabaseCache(BaseDatabaseCache):
         timeout: float | None = DEFAULT_TIMEOUT,
         version: int | None = None,
     ) -> None:
+        local = self._local_enabled(key)
         key, value, expiry = self._base_set_data(key, value, timeout, version)
+        if local:
+            self._notify_invalidate([key])
         CacheEntry.objects.on_conflict(
             ["cache_key"],
             ConflictAction.UPDATE,
@@ -137,5 +367,32 @@ class DatabaseCache(BaseDatabaseCache):
             expires=expiry,
         )
 
+    def set_many(
+        self,
+        data: dict[Any, Any],
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> list[Any]:
+        if not data:
+            return []
+        expiry = self._base_set_expiry(timeout)
+        rows = []
+        local_keys = []
+        for key, value in data.items():
+            db_key = self.make_and_validate_key(key, version=version)
+            if self._local_enabled(key):
+                local_keys.append(db_key)
+            rows.append(dict(cache_key=db_key, value=self._encode(value), expires=expiry))
+        if local_keys:
+            self._notify_invalidate(local_keys)
+        CacheEntry.objects.on_conflict(
+            ["cache_key"],
+            ConflictAction.UPDATE,
+        ).bulk_insert(rows)
+        return []
+
     def clear(self) -> None:
         CacheEntry.objects.truncate()
+        if self.local_prefixes:
+            self.local.clear()
+            self._notify_invalidate([INVALIDATE_ALL])
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+_MISSING = object()
+# Number of invalidation counters, keys share a counter when their hashes collide
+GENERATION_SLOTS = 1024
+
+
+@dataclass(slots=True)
+class LocalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with a per-key TTL.
+
+    Used as the L1 tier in front of the database cache. Entries expire at the
+    earlier of the database entry's expiry and the configured L1 timeout, and
+    are invalidated across processes via Postgres NOTIFY.
+
+    Each invalidation bumps a counter for the key. Values loaded from the database are only
+    stored when the counter didn't change since before they were loaded, so that a value read
+    before an invalidation arrived isn't cached after it."""
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.stats = LocalCacheStats()
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generations = [0] * GENERATION_SLOTS
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """Get a value, returns `_MISSING` if the key is absent or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return _MISSING
+            expires, value = entry
+            if expires <= monotonic():
+                del self._data[key]
+                self.stats.misses += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def generation(self, key: str) -> int:
+        """Get the invalidation counter of `key`, to be passed to `set()`"""
+        return self._generations[hash(key) % GENERATION_SLOTS]
+
+    def set(
+        self, key: str, value: Any, ttl: float | None = None, generation: int | None = None
+    ) -> None:
+        """Store a value, `ttl` is capped by the configured L1 timeout. When `generation` is
+        given, the value is dropped if `key` was invalidated since."""
+        ttl = self.timeout if ttl is None else min(ttl, self.timeout)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation(key):
+                return
+            self._data[key] = (monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._generations[hash(key) % GENERATION_SLOTS] += 1
+            if self._data.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generations = [generation + 1 for generation in self._generations]
+            self.stats.invalidations += len(self._data)
+            self._data.clear()
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_postgres_cache", "0002_alter_cacheentry_managers"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "ALTER TABLE django_postgres_cache_cacheentry "
+                "ALTER COLUMN value TYPE bytea USING decode(value, 'base64');"
+            ),
+            reverse_sql=(
+                "ALTER TABLE django_postgres_cache_cacheentry "
+                "ALTER COLUMN value TYPE text USING encode(value, 'base64');"
+            ),
+            state_operations=[
+                migrations.AlterField(
+                    model_name="cacheentry",
+                    name="value",
+                    field=models.BinaryField(),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:30
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The cache table can be large and is written on every request, so the index is built
+    # without locking out writes
+    atomic = False
+
+    dependencies = [
+        ("django_postgres_cache", "0003_alter_cacheentry_value"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="cacheentry",
+            index=models.Index(
+                fields=["cache_key"],
+                name="cacheentry_key_pattern_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+        ),
+    ]
@@ -4,13 +4,22 @@ from psqlextra.manager import PostgresManager
 
 class CacheEntry(models.Model):
     cache_key = models.TextField(primary_key=True)
-    value = models.TextField()
+    value = models.BinaryField()
     expires = models.DateTimeField(db_index=True)
 
     objects = PostgresManager()  # type: ignore[no-untyped-call]
 
     class Meta:
         default_permissions = []
+        indexes = [
+            # Allows prefix lookups (`LIKE 'prefix%'`) to use an index range scan
+            # regardless of the database collation
+            models.Index(
+                fields=["cache_key"],
+                name="cacheentry_key_pattern_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Cache entry '{self.cache_key}'"
@@ -1,11 +1,10 @@
 from django.utils.timezone import now
 
-from authentik.lib.utils.db import chunked_queryset
+from authentik.lib.utils.db import raw_delete_batched
 from django_postgres_cache.models import CacheEntry
 
 
-def clear_expired_cache() -> None:
+def clear_expired_cache() -> int:
     # FIXME: this is currently imported from the main project,
     # do we copy it here to make it independent?
-    for obj in chunked_queryset(CacheEntry.objects.filter(expires__lt=now())):
-        obj.delete()
+    return raw_delete_batched(CacheEntry.objects.filter(expires__lt=now()))
@@ -253,6 +253,15 @@ export class MicrosoftEntraProviderFormPage extends BaseProviderForm<MicrosoftEn
                             <ak-utils-time-delta-help></ak-utils-time-delta-help>`}
                     >
                     </ak-text-input>
+                    <ak-number-input
+                        label=${msg("Concurrency")}
+                        required
+                        name="syncPageConcurrency"
+                        value="${this.instance?.syncPageConcurrency ?? 1}"
+                        help=${msg(
+                            "Controls the number of objects of a page which are synced in parallel. Requests are throttled further when the remote system asks to slow down.",
+                        )}
+                    ></ak-number-input>
                 </div>
             </ak-form-group>`;
     }
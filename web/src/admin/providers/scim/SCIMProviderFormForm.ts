@@ -311,6 +311,15 @@ export function renderForm({ provider = {}, errors = {}, update }: SCIMProviderF
                         <ak-utils-time-delta-help></ak-utils-time-delta-help>`}
                 >
                 </ak-text-input>
+                <ak-number-input
+                    label=${msg("Concurrency")}
+                    required
+                    name="syncPageConcurrency"
+                    value="${provider.syncPageConcurrency ?? 1}"
+                    help=${msg(
+                        "Controls the number of objects of a page which are synced in parallel. Requests are throttled further when the remote system asks to slow down.",
+                    )}
+                ></ak-number-input>
             </div>
         </ak-form-group>
     `;